@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+import pytest
+
+
+def test_suite_benchmarks_run():
+    from xotl.tools.benchmark import get_benchmarks
+
+    benchmarks = get_benchmarks()
+    assert {bench.name.split(".")[0] for bench in benchmarks} >= {
+        "collections",
+        "context",
+        "coercers",
+        "datetime",
+        "dim",
+        "fs",
+    }
+    for bench in benchmarks:
+        bench.setup()()
+    assert [bench.name for bench in get_benchmarks(["dim"])] == [
+        "dim.add",
+        "dim.compare",
+        "dim.divide",
+    ]
+    assert get_benchmarks(["*.new", "string"]) == [
+        bench
+        for bench in benchmarks
+        if bench.name.endswith(".new") or bench.name.startswith("string.")
+    ]
+
+
+def test_measure_and_compare(tmp_path):
+    from xotl.tools.benchmark import Benchmark, Result, compare, dump, load, measure
+
+    res = measure(Benchmark("sum", lambda: lambda: sum(range(10)), ""), repeat=5)
+    assert res.number >= 1 and len(res.samples) == 5
+    assert res.min <= res.median <= max(res.samples) and res.iqr >= 0
+
+    path = tmp_path / "results.json"
+    with open(path, "w") as f:
+        dump([res], f)
+    with open(path) as f:
+        environment, results = load(f)
+    assert results == {"sum": res} and environment["python"]
+
+    slower = Result.from_samples("sum", 1, [2 * t for t in res.samples])
+    assert list(compare(results, {"sum": slower})) == [
+        ("sum", res, slower, pytest.approx(2))
+    ]
+    assert Result.from_samples("x", 1, [4, 1, 3, 2]).median == 2.5
+
+
+def test_cli(tmp_path, capsys):
+    from xotl.tools.benchmark.__main__ import main
+
+    path = str(tmp_path / "results.json")
+    assert main(["run", "dim.add", "--repeat", "3", "--json", path]) == 0
+    assert main(["compare", path, path]) == 0
+    out = capsys.readouterr().out
+    assert "dim.add" in out and "+0.0%" in out
+    assert main(["run", "nothing"]) == 1
+
+
+def test_regressions():
+    from random import Random
+    from xotl.tools.benchmark import Result, mann_whitney, regressions
+
+    rnd = Random(42)
+    base = [1 + rnd.random() / 10 for _ in range(20)]
+    same = [1 + rnd.random() / 10 for _ in range(20)]
+    slow = [1.2 + rnd.random() / 10 for _ in range(20)]
+    assert mann_whitney(base, slow) < 0.001
+    assert mann_whitney(slow, base) > 0.99
+    assert mann_whitney(base, same) > 0.01
+    assert mann_whitney([1] * 10, [1] * 10) == 0.5
+
+    def results(**samples):
+        return {name: Result.from_samples(name, 1, s) for name, s in samples.items()}
+
+    old, new = results(a=base, b=base), results(a=same, b=slow)
+    assert [name for name, *_ in regressions(old, new)] == ["b"]
+    assert not list(regressions(old, new, threshold=0.5))
+    # A single outlier doesn't make a regression
+    assert not list(regressions(old, results(a=same[:-1] + [100])))
+
+
+def test_cli_check(tmp_path, capsys):
+    import json
+    from xotl.tools.benchmark import baseline_name
+    from xotl.tools.benchmark.__main__ import main
+
+    baselines = str(tmp_path / "baselines")
+    args = ["check", "dim.add", "--repeat", "10", "--baseline-dir", baselines]
+    assert main(args) == 0
+    path = tmp_path / "baselines" / baseline_name()
+    assert "Saved the baseline" in capsys.readouterr().out and path.exists()
+
+    # Make the baseline much faster, so the current run is a regression
+    with open(path) as f:
+        data = json.load(f)
+    result = data["benchmarks"]["dim.add"]
+    result["samples"] = [t / 10 for t in result["samples"]]
+    result["median"] /= 10
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert main(args) == 1
+    assert "Regressions" in capsys.readouterr().out
+    assert main(args + ["--update"]) == 0
+    assert main(args + ["--threshold", "10"]) == 0
+
+    # Other benchmarks are added to the baseline, and kept when updating
+    other = ["check", "dim.compare", "--repeat", "10", "--baseline-dir", baselines]
+    capsys.readouterr()
+    assert main(other) == 0
+    assert "Added to the baseline: dim.compare" in capsys.readouterr().out
+    with open(path) as f:
+        assert set(json.load(f)["benchmarks"]) == {"dim.add", "dim.compare"}
+    assert main(args + ["--update"]) == 0
+    with open(path) as f:
+        assert set(json.load(f)["benchmarks"]) == {"dim.add", "dim.compare"}
+    main(other + ["--threshold", "10"])
+    assert "Added" not in capsys.readouterr().out
+
+
+def test_mp_sweep():
+    from xotl.tools.benchmark.mp import sweep
+
+    rows = list(sweep(["imap", "executor"], [2, 1], [8], size=200))
+    assert [row[:3] for row in rows] == [
+        ("imap", 8, 1),
+        ("imap", 8, 2),
+        ("executor", 8, 1),
+        ("executor", 8, 2),
+    ]
+    assert all(row[3] > 0 for row in rows)
+    assert rows[0][4] == rows[2][4] == 1
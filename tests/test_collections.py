@@ -83,6 +83,46 @@ def test_stacked_dict():
         assert False, "Level 0 cannot be poped. " "It should have raised a TypeError"
 
 
+def test_stacked_dict_flattened_view():
+    from xotl.tools.future.collections import StackedDict
+
+    sd = StackedDict(a=1, b=2)
+    sd.push_level(c=3, a=10)
+    sd.push_level(d=4)
+    sd["b"] = 20
+    assert list(sd) == list(sd.inner) == ["a", "b", "c", "d"]
+    assert dict(sd) == dict(sd.inner) == dict(a=10, b=20, c=3, d=4)
+    del sd["b"]
+    assert sd["b"] == 2 and len(sd) == 4
+    for key in sd:
+        sd["x" + key] = key  # iteration is not affected by changes
+    assert len(sd) == 8
+    sd.pop_level()
+    assert dict(sd) == dict(sd.inner) == dict(a=10, b=2, c=3)
+    assert list(sd) == list(sd.inner)
+    sd.pop_level()
+    assert dict(sd) == dict(a=1, b=2) and "c" not in sd
+
+
+def test_stacked_dict_snapshot_iteration():
+    from xotl.tools.future.collections import StackedDict
+
+    sd = StackedDict(a=1, b=2, c=3)
+    flat = sd._flat
+    assert list(sd) == ["a", "b", "c"]
+    sd["d"] = 4  # no live iterators, nothing is copied
+    assert sd._flat is flat
+    it = iter(sd)
+    assert next(it) == "a"
+    del sd["b"]
+    sd["e"] = 5
+    assert list(it) == ["b", "c", "d"]  # the snapshot is not changed
+    assert sd._flat is not flat and list(sd) == ["a", "c", "d", "e"]
+    flat = sd._flat
+    sd.push_level(f=6)
+    assert sd._flat is flat
+
+
 # Backported from Python 3.3.0 standard library
 from xotl.tools.future.collections import ChainMap, Counter
 from xotl.tools.future.collections import OrderedDict, RankedDict
@@ -1004,6 +1044,21 @@ class TestRankedDict(unittest.TestCase):
         with self.assertRaises(KeyError):
             od.move_to_end("x")
 
+    def test_ranks(self):
+        od = RankedDict.fromkeys("abcdef")
+        od.rank("e", "b")
+        self.assertEqual(list(od), list("ebacdf"))
+        od.swap_ranks(("e", "f"), ("a", "c"))
+        self.assertEqual(list(od), list("fbcade"))
+        with self.assertRaises(KeyError):
+            od.swap_ranks(("a", "x"))
+        od["b"] = 1
+        self.assertEqual(list(reversed(od)), list("bedacf"))
+        self.assertEqual(od.popitem(2), ("a", None))
+        self.assertEqual(od.popitem(0), ("f", None))
+        self.assertEqual(od.popitem(), ("b", 1))
+        self.assertEqual(list(od), list("cde"))
+
     @unittest.skipIf("PyPy" in sys.version, "sys.getsizeof not supported")
     def test_sizeof(self):
         # Wimpy test: Just verify the reported size is larger than a regular
@@ -1112,6 +1167,149 @@ class TestPascalSet(unittest.TestCase):
                 state = "safe-not-less"
         self.assertEqual(state, "ok")
 
+    def test_intervals_merge(self):
+        from random import randint
+        from xotl.tools.future.collections import PascalSet
+
+        s1 = PascalSet[-5:1]
+        self.assertEqual(list(s1), list(range(-5, 1)))
+        s1.update(randint(-50, 50) for i in range(100))
+        ss1 = set(range(-5, 1))
+        ss1.update(s1)
+        self.assertEqual(s1, ss1)
+        items = s1._items
+        self.assertEqual(items, sorted(items))
+        # Adjacent intervals are always merged
+        self.assertTrue(
+            all(items[i] + 1 < items[i + 1] for i in range(1, len(items) - 1, 2))
+        )
+
+    def test_array_storage(self):
+        from array import array
+        from random import randint
+        from xotl.tools.future.collections import PascalSet, ArrayPascalSet
+
+        for test in range(5):
+            values = [randint(-100, 100) for i in range(80)]
+            s1 = ArrayPascalSet(values)
+            s2 = PascalSet(values)
+            self.assertIsInstance(s1._items, array)
+            self.assertEqual(s1, s2)
+            self.assertEqual(s1, set(values))
+            s1 -= PascalSet[-20:20]
+            s2 -= PascalSet[-20:20]
+            self.assertEqual(list(s1), list(s2))
+            self.assertIsInstance(s1._items, array)
+        with self.assertRaises(OverflowError):
+            ArrayPascalSet(2 ** 64)
+
+    def test_difference_of_many_intervals(self):
+        from random import randint
+        from xotl.tools.future.collections import PascalSet, ArrayPascalSet
+
+        for cls in (PascalSet, ArrayPascalSet):
+            for test in range(20):
+                values = {randint(-300, 300) for i in range(200)}
+                others = {randint(-300, 300) for i in range(200)}
+                s1 = cls(values)
+                s1 -= PascalSet(others)
+                self.assertEqual(s1, values - others)
+                self.assertIsInstance(s1._items, type(cls()._items))
+                s1 = cls(values)
+                s1.difference_update(others)
+                self.assertEqual(list(s1), sorted(values - others))
+
+    def test_bulk_operations(self):
+        from array import array
+        from random import sample
+        from unittest.mock import patch
+        from xotl.tools.future.collections import PascalSet
+
+        values = sorted(sample(range(-500, 500), 300))
+        ids = sample(range(-600, 600), 1200)
+        expected = [i in values for i in ids]
+        with patch("xotl.tools.future.collections._get_numpy", lambda: None):
+            s1 = PascalSet(sample(range(-500, 500), 20))
+            members = set(s1) | set(values)
+            s1.update_sorted(array("q", values))
+            self.assertEqual(s1, members)
+            self.assertEqual(s1.to_array(), array("q", sorted(members)))
+            self.assertEqual(list(PascalSet(values).contains_many(ids)), expected)
+            with self.assertRaises(ValueError):
+                s1.update_sorted([3, 2])
+            with self.assertRaises(TypeError):
+                s1.contains_many([1, 3.0])
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            s2 = PascalSet()
+            s2.update_sorted(np.array(values))
+            self.assertEqual(s2.to_array().tolist(), values)
+            self.assertEqual(s2.contains_many(np.array(ids)).tolist(), expected)
+            with self.assertRaises(TypeError):
+                PascalSet[1:11].contains_many(np.array([3.5, 0.5, 10.7]))
+            top = 2 ** 63 - 1
+            s5 = PascalSet([top - 1, top])
+            found = s5.contains_many(np.array([top - 2, top, 2 ** 64 - 1], np.uint64))
+            self.assertEqual(found.tolist(), [False, True, False])
+            found = PascalSet[1:11].contains_many(np.array([0, 3], np.uint32))
+            self.assertEqual(found.tolist(), [False, True])
+            np_ids = [np.int64(i) for i in ids]
+            self.assertEqual(list(s2.contains_many(np_ids)), expected)
+            s4 = PascalSet()
+            s4.update_sorted([np.int64(i) for i in values])
+            self.assertEqual(s4, s2)
+            for dtype in (np.int64, np.uint64, np.uint8):
+                with self.assertRaises(ValueError):
+                    s2.update_sorted(np.array([100, 50, 0], dtype=dtype))
+            self.assertEqual(s2.to_array().tolist(), values)
+            s3 = PascalSet()
+            s3.update_sorted(np.array([0, 1, 2, 5, 2 ** 62], dtype=np.uint64))
+            self.assertEqual(list(s3), [0, 1, 2, 5, 2 ** 62])
+
+    def test_binary_format(self):
+        import os
+        import tempfile
+        from random import randint
+        from xotl.tools.future.collections import PascalSet, BitPascalSet
+
+        s1 = PascalSet(randint(-1000, 1000) for i in range(300))
+        data = s1.dumps()
+        s2 = PascalSet.loads(data)
+        self.assertEqual(s1, s2)
+        self.assertIsInstance(s2._items, memoryview)
+        s2.add(5000)  # copied on the first modification
+        self.assertIsInstance(s2._items, list)
+        self.assertEqual(s1 | {5000}, s2)
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "set.bin")
+            s1.dump(filename)
+            self.assertEqual(PascalSet.load(filename), s1)
+            with open(filename, "rb") as f:
+                self.assertEqual(PascalSet.load(f), s1)
+        with self.assertRaises(ValueError):
+            BitPascalSet.loads(data)
+        with self.assertRaises(ValueError):
+            PascalSet.loads(data[:-8])
+        with self.assertRaises(ValueError):
+            # An odd number of boundaries.
+            PascalSet.loads(data[:8] + b"\x03" + bytes(7) + data[16:40])
+
+    def test_pickle_loaded(self):
+        import copy
+        import pickle
+        from xotl.tools.future.collections import PascalSet, ArrayPascalSet
+
+        for cls in (PascalSet, ArrayPascalSet):
+            s1 = cls[1:10, 20, 30:40]
+            s2 = cls.loads(s1.dumps())
+            self.assertIsInstance(s2._items, memoryview)
+            for s3 in (pickle.loads(pickle.dumps(s2)), copy.deepcopy(s2)):
+                self.assertEqual(s3, s1)
+                self.assertIsInstance(s3._items, type(s1._items))
+
 
 class TestBitPascalSet(unittest.TestCase):
     def test_consistency(self):
@@ -1154,6 +1352,68 @@ class TestBitPascalSet(unittest.TestCase):
         self.assertEqual(str(s1 ^ s2), "{1, 2, 4..8, 10..14}")
         self.assertEqual(list(BitPascalSet[3:18]), list(range(3, 18)))
 
+    def test_cardinality(self):
+        from random import randint
+        from xotl.tools.future.collections import BitPascalSet
+
+        values = {randint(-500, 500) for i in range(200)}
+        s1 = BitPascalSet(values)
+        self.assertEqual(len(s1), len(values))
+        self.assertEqual(list(s1), sorted(values))
+        others = {randint(-500, 500) for i in range(200)}
+        s1 ^= others
+        values ^= others
+        self.assertEqual(len(s1), len(values))
+        s1 &= BitPascalSet[-100:100]
+        values &= set(range(-100, 100))
+        self.assertEqual(len(s1), len(values))
+        self.assertEqual(list(s1), sorted(values))
+        while s1:
+            values.remove(s1.pop())
+            self.assertEqual(len(s1), len(values))
+        self.assertFalse(values)
+
+    def test_pickle(self):
+        import copyreg
+        import pickle
+        from xotl.tools.future.collections import BitPascalSet
+
+        s1 = BitPascalSet[1:100, 500]
+        s2 = pickle.loads(pickle.dumps(s1))
+        self.assertEqual(s1, s2)
+        self.assertEqual(len(s2), 100)
+
+        class Old:
+            # What pickled a BitPascalSet without the cardinality.
+            def __reduce__(self):
+                args = (BitPascalSet, object, None)
+                state = (None, {"_items": dict(s1._items)})
+                return copyreg._reconstructor, args, state
+
+        s3 = pickle.loads(pickle.dumps(Old()))
+        self.assertEqual(len(s3), 100)
+        self.assertEqual(list(s3), list(s1))
+        s3.add(1000)
+        self.assertEqual(len(s3), 101)
+
+    def test_binary_format(self):
+        import io
+        from random import randint
+        from xotl.tools.future.collections import BitPascalSet
+
+        s1 = BitPascalSet(randint(-1000, 1000) for i in range(300))
+        s2 = BitPascalSet.loads(s1.dumps())
+        self.assertEqual(s1, s2)
+        self.assertEqual(len(s1), len(s2))
+        buffer = io.BytesIO()
+        s1.dump(buffer)
+        buffer.seek(0)
+        self.assertEqual(BitPascalSet.load(buffer), s1)
+        data = s1.dumps()
+        with self.assertRaises(ValueError):
+            # A seed without its bit-wise value.
+            BitPascalSet.loads(data[:8] + b"\x03" + bytes(7) + data[16:40])
+
     def test_operators(self):
         from xotl.tools.future.collections import BitPascalSet
 
@@ -1213,6 +1473,91 @@ class TestBitPascalSet(unittest.TestCase):
         self.assertEqual(state, "ok")
 
 
+class TestRoaringPascalSet(unittest.TestCase):
+    def test_consistency(self):
+        from random import randint
+        from xotl.tools.future.collections import RoaringPascalSet
+
+        count = 5
+        for test in range(count):
+            size = randint(20, 60)
+            ranges = (range(i, randint(i, i + 3)) for i in range(1, size))
+            s1 = RoaringPascalSet(*ranges)
+            ranges = (range(i, randint(i, i + 3)) for i in range(1, size))
+            s2 = RoaringPascalSet(*ranges)
+            ss1 = set(s1)
+            ss2 = set(s2)
+            self.assertEqual(s1, ss1)
+            self.assertEqual(s1 - s2, ss1 - ss2)
+            self.assertEqual(s2 - s1, ss2 - ss1)
+            self.assertEqual(s1 & s2, ss1 & ss2)
+            self.assertEqual(s1 | s2, ss1 | ss2)
+            self.assertEqual(s1 ^ s2, ss1 ^ ss2)
+            self.assertLess(s1 - s2, s1)
+            self.assertLessEqual(s1 - s2, ss1)
+            self.assertGreater(s1, s1 - s2)
+            self.assertGreaterEqual(s1, ss1 - ss2)
+
+    def test_syntax_sugar(self):
+        from xotl.tools.future.collections import RoaringPascalSet
+
+        s1 = RoaringPascalSet[1:4, 9, 15:18]
+        s2 = RoaringPascalSet[3:18]
+        self.assertEqual(str(s1), "{1..3, 9, 15..17}")
+        self.assertEqual(str(s1 ^ s2), "{1, 2, 4..8, 10..14}")
+        self.assertEqual(list(RoaringPascalSet[3:18]), list(range(3, 18)))
+
+    def test_containers(self):
+        from random import sample
+        from xotl.tools.future.collections import RoaringPascalSet
+        from xotl.tools.future._roaring import (
+            ArrayContainer,
+            BitmapContainer,
+            RunContainer,
+        )
+
+        chunk = 1 << 16
+        sparse = sample(range(chunk), 100)
+        dense = sample(range(chunk, 2 * chunk), 40000)
+        s1 = RoaringPascalSet(sparse, dense, range(-chunk, 0))
+        containers = [type(s1._items[k]) for k in (-1, 0, 1)]
+        self.assertEqual(containers, [RunContainer, ArrayContainer, BitmapContainer])
+        self.assertEqual(len(s1), 100 + 40000 + chunk)
+        self.assertEqual(set(s1), set(sparse) | set(dense) | set(range(-chunk, 0)))
+        s2 = RoaringPascalSet[-10 : 2 * chunk]
+        self.assertEqual(s1 & s2, set(s1) & set(s2))
+        self.assertEqual(s2 - s1, set(s2) - set(s1))
+        self.assertEqual(len(RoaringPascalSet[0 : 10 ** 8]), 10 ** 8)
+
+    def test_mutated_containers(self):
+        from xotl.tools.future.collections import RoaringPascalSet
+        from xotl.tools.future._roaring import RunContainer
+
+        def runs(count):
+            return [5 * i + j for i in range(count) for j in range(3)]
+
+        # Adding and removing members picks the same containers as building,
+        # and run containers are updated in place while they're kept.
+        for count in (1500, 2047, 2048):
+            added = RoaringPascalSet(runs(count - 1))
+            container = added._items[0]
+            for value in runs(count)[-3:]:
+                added.add(value)
+            built = RoaringPascalSet(runs(count))
+            self.assertEqual(added, built)
+            self.assertIs(type(added._items[0]), type(built._items[0]))
+            if type(built._items[0]) is RunContainer:
+                self.assertIs(added._items[0], container)
+            removed = RoaringPascalSet(runs(count - 1))
+            container = removed._items[0]
+            removed.discard(1)  # splits the first run
+            built = RoaringPascalSet(set(runs(count - 1)) - {1})
+            self.assertEqual(removed, built)
+            self.assertIs(type(removed._items[0]), type(built._items[0]))
+            if type(built._items[0]) is RunContainer:
+                self.assertIs(removed._items[0], container)
+
+
 class TestCodeDict(unittest.TestCase):
     def test_formatter(self):
         from xotl.tools.future.collections import codedict
@@ -1232,6 +1577,90 @@ class TestCodeDict(unittest.TestCase):
         )
 
 
+class TestCacheDict(unittest.TestCase):
+    def test_lru(self):
+        from xotl.tools.future.collections import CacheDict
+
+        cache = CacheDict({"a": 1}, [("b", 2)], maxsize=3)
+        cache["c"] = 3
+        self.assertEqual(cache["a"], 1)
+        cache["d"] = 4
+        self.assertEqual(list(cache), ["a", "c", "d"])
+        self.assertIsNone(cache.get("b"))
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions), (1, 1, 1))
+        self.assertEqual(dict(cache.search("^[ab]")), {"a": 1})
+
+    def test_lfu(self):
+        from xotl.tools.future.collections import CacheDict
+
+        cache = CacheDict(maxsize=3, policy="lfu")
+        cache.update(a=1, b=2, c=3)
+        for key in "aabbc":
+            cache[key]
+        cache["d"] = 4  # "c" is the least frequently used
+        cache["e"] = 5  # "d" is the least frequently used
+        self.assertEqual(sorted(cache), ["a", "b", "e"])
+        del cache["a"]
+        cache["f"] = 6
+        self.assertEqual(sorted(cache), ["b", "e", "f"])
+
+    def test_ttl(self):
+        from xotl.tools.future.collections import CacheDict
+
+        now = [0]
+        cache = CacheDict(maxsize=2, policy="ttl", ttl=10, timer=lambda: now[0])
+        cache["a"] = 1
+        now[0] = 5
+        cache["b"] = 2
+        cache["a"]  # doesn't change the eviction order
+        now[0] = 8
+        cache["c"] = 3
+        self.assertEqual(list(cache), ["b", "c"])
+        now[0] = 15
+        self.assertNotIn("b", cache)
+        self.assertEqual(list(cache), ["c"])
+        now[0] = 20
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.cache_info().expirations, 2)
+        with self.assertRaises(ValueError):
+            CacheDict(policy="ttl")
+
+    def test_maxmemory(self):
+        from sys import getsizeof
+        from xotl.tools.future.collections import CacheDict
+
+        item = getsizeof("k0") + getsizeof("x" * 100)
+        cache = CacheDict(maxmemory=3 * item)
+        for i in range(10):
+            cache["k%d" % i] = "x" * 100
+        self.assertEqual(list(cache), ["k7", "k8", "k9"])
+        self.assertEqual(cache.cache_info().memory, 3 * item)
+        cache["big"] = "x" * 10000  # bigger than the budget
+        self.assertNotIn("big", cache)
+        self.assertEqual(len(cache), 3)
+
+    def test_threads(self):
+        from threading import Thread
+        from xotl.tools.future.collections import CacheDict
+
+        cache = CacheDict(maxsize=50, policy="lfu")
+
+        def worker(n):
+            for i in range(2000):
+                cache[(n * i) % 97] = i
+                cache.get(i % 97)
+
+        threads = [Thread(target=worker, args=(n,)) for n in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.cache_info()
+        self.assertEqual(info.currsize, 50)
+        self.assertEqual(info.hits + info.misses, 8000)
+
+
 def test_abcs():
     from xotl.tools.future.collections import Container  # noqa
     from xotl.tools.future.collections import Iterable  # noqa
@@ -1275,6 +1704,39 @@ def test_opendict():
     assert dict(bar) == {"spam": Bar.spam}
 
 
+def test_opendict_inverted_index():
+    import pytest
+    from xotl.tools.future.collections import opendict, StackedDict
+
+    d = opendict({"es": "spanish", "en-us": "english"})
+    assert d.es == "spanish" and d.en_us == "english"
+    # Replacing a key with another one keeps the same length.
+    del d["es"]
+    d["fr"] = "french"
+    assert d.fr == "french" and ~d == {"fr": "fr", "en_us": "en-us"}
+    with pytest.raises(AttributeError):
+        d.es
+    d.pop("fr")
+    d.update(de="german")
+    assert d.de == "german" and not hasattr(d, "fr")
+    d.clear()
+    d.update({"it": "italian", "pt": "portuguese"})
+    assert d.it == "italian" and ~d == {"it": "it", "pt": "pt"}
+    # Colliding identifiers: the last key wins, the other is exposed when the
+    # winner is deleted.
+    d["x-y"], d["x_y"] = 1, 2
+    assert d.x_y == 2
+    del d["x_y"]
+    assert d.x_y == 1
+
+    sd = StackedDict(a=1)
+    sd.push_level(b=2)
+    assert sd.b == 2
+    sd.pop_level()
+    sd["c"] = 3
+    assert sd.c == 3 and not hasattr(sd, "b")
+
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
     unittest.main(verbosity=2)
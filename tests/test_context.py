@@ -220,3 +220,108 @@ def test_greenlet_contexts():
 
     root = greenlet.greenlet(run=loop_determ)
     root.switch(5)
+
+
+def test_task_context_levels():
+    from xotl.tools.context import task_context, NullContext
+
+    with task_context("A", a=1, b=1) as a1:
+        assert task_context["A"] is a1 and "A" in task_context
+        with task_context("A") as a2:
+            assert a2 is not a1 and a2.parent is a1 and a2.level == 2
+            assert dict(a2) == {"a": 1, "b": 1}
+            with task_context("A", b=2) as a3:
+                assert a3["b"] == 2 and a3.a == 1
+                with pytest.raises(TypeError):
+                    a3["b"] = 3
+            assert task_context["A"] is a2
+            with pytest.raises(RuntimeError):
+                with a2:
+                    pass
+        with task_context.from_defaults("A", a=2, c=3) as a4:
+            assert dict(a4) == {"a": 1, "b": 1, "c": 3}
+        with task_context("FLAG") as flag:
+            assert flag and task_context["FLAG"]
+    assert isinstance(task_context["A"], NullContext)
+    assert "A" not in task_context and len(task_context) == 0
+
+
+def test_task_context_isolation():
+    import threading
+    from xotl.tools.context import task_context
+
+    seen = []
+
+    def worker():
+        seen.append("A" in task_context)
+        with task_context("A", thread=True):
+            seen.append(task_context["A"]["thread"])
+
+    with task_context("A", thread=False):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        assert task_context["A"]["thread"] is False
+    assert seen == [False, True]
+
+
+def test_task_context_asyncio_isolation():
+    import asyncio
+
+    pytest.importorskip("contextvars")
+    from xotl.tools.context import task_context
+
+    async def job(i):
+        with task_context("JOB", i=i) as ctx:
+            assert ctx.parent is outer
+            await asyncio.sleep(0.001 * (i % 3))
+            assert task_context["JOB"]["i"] == i
+            return i
+
+    async def main():
+        nonlocal outer
+        with task_context("JOB", i=None) as outer:
+            res = await asyncio.gather(*(job(i) for i in range(100)))
+            assert task_context["JOB"] is outer
+            return res
+
+    outer = None
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(main()) == list(range(100))
+    finally:
+        loop.close()
+    assert "JOB" not in task_context
+
+
+def test_flag_only_levels():
+    with context("A", a=1) as c:
+        level, data_level = c.level, c._data_level
+        with context("A") as c2:
+            assert c2 is c and c2.level == level + 1
+            assert c2._data_level == data_level  # no data level pushed
+            assert c["a"] == 1
+            c2["a"] = 2  # the data level is pushed now
+            assert c2["a"] == 2 and c2._data_level == data_level + 1
+            with context("A"):
+                assert c["a"] == 2 and c.level == level + 2
+            assert c["a"] == 2
+        assert c["a"] == 1 and c.level == level
+        assert c._data_level == data_level
+        with context("A"):
+            with pytest.raises(RuntimeError):
+                with c:
+                    pass
+        assert c.count == 1
+    assert not context["A"]
+
+
+def test_capture_flag_only_levels():
+    from xotl.tools.context import capture_contexts
+
+    with context("A"), context("A", a=1), context("A"):
+        snapshot = capture_contexts()
+    assert dict(snapshot.contexts)["A"] == ({}, {"a": 1}, {})
+    with snapshot.restore():
+        assert context["A"].count == 3 and context["A"]["a"] == 1
+    assert not context["A"]
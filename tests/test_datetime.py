@@ -296,6 +296,32 @@ def test_timespans_are_pickable(ts):
         assert ts == pickle.loads(pickle.dumps(ts, proto))
 
 
+def test_legacy_timespan_pickles():
+    import pickle
+
+    # Pickled before the bounds were kept in slots.
+    data = (
+        b'ccopy_reg\n_reconstructor\np0\n(cxotl.tools.future.datetime\nTimeSpan\np1'
+        b'\nc__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\nVstart_date\np6\ncdatetime\n'
+        b'date\np7\n(c_codecs\nencode\np8\n(V\x07\xe4\x01\x01\np9\nVlatin1\np10\ntp'
+        b'11\nRp12\ntp13\nRp14\nsVend_date\np15\nNsb.'
+    )
+    assert pickle.loads(data) == TimeSpan("2020-01-01", None)
+    data = (
+        b'\x80\x02cxotl.tools.future.datetime\nDateTimeSpan\nq\x00)\x81q\x01}q\x02('
+        b'X\x0e\x00\x00\x00start_datetimeq\x03cdatetime\ndatetime\nq\x04c_codecs\ne'
+        b'ncode\nq\x05X\x0b\x00\x00\x00\x07\xc3\xa4\x01\x01\x08\x00\x00\x00\x00\x00'
+        b'q\x06X\x06\x00\x00\x00latin1q\x07\x86q\x08Rq\t\x85q\nRq\x0bX\n\x00\x00'
+        b'\x00start_dateq\x0ccdatetime\ndate\nq\rh\x05X\x05\x00\x00\x00\x07\xc3\xa4'
+        b'\x01\x01q\x0eh\x07\x86q\x0fRq\x10\x85q\x11Rq\x12X\x0c\x00\x00\x00end_date'
+        b'timeq\x13h\x04h\x05X\x0b\x00\x00\x00\x07\xc3\xa4\x01\x02\x17;;\x00\x00'
+        b'\x00q\x14h\x07\x86q\x15Rq\x16\x85q\x17Rq\x18X\x08\x00\x00\x00end_dateq'
+        b'\x19h\rh\x05X\x05\x00\x00\x00\x07\xc3\xa4\x01\x02q\x1ah\x07\x86q\x1bRq'
+        b'\x1c\x85q\x1dRq\x1eub.'
+    )
+    assert pickle.loads(data) == DateTimeSpan("2020-01-01 08:00", "2020-01-02")
+
+
 def test_empty_timespan_is_pickable():
     import pickle
 
@@ -303,6 +329,15 @@ def test_empty_timespan_is_pickable():
         assert EmptyTimeSpan is pickle.loads(pickle.dumps(EmptyTimeSpan, proto))
 
 
+@given(timespans() | datetimespans())
+def test_timespans_are_slotted(ts):
+    assert not hasattr(ts, "__dict__")
+    trusted = type(ts).from_trusted(*ts)
+    assert trusted == ts and type(trusted) is type(ts)
+    assert tuple(trusted) == tuple(ts) and trusted[0] == ts[0]
+    assert trusted.start_date == ts.start_date and trusted.end_date == ts.end_date
+
+
 @given(strategies.datetimes(), strategies.datetimes())
 def test_timespan_with_datetimes(d1, d2):
     from datetime import datetime as dt, date as d
@@ -485,3 +520,177 @@ def add_dtspans(x, y):
         return DateTimeSpan(x.start_datetime, y.end_datetime)
     else:
         raise ValueError
+
+
+# A small calendar so the sets of dates can be enumerated.
+_FIRST, _LAST = date(2000, 1, 1), date(2000, 3, 31)
+_small_dates = dates(min_value=_FIRST, max_value=_LAST)
+_small_timespans = strategies.builds(
+    TimeSpan, _small_dates | strategies.none(), _small_dates | strategies.none()
+)
+_spansets = strategies.lists(_small_timespans, max_size=6)
+
+
+def _dates_of(spans):
+    return {day for day in daterange(_FIRST, _LAST + timedelta(1)) if day in spans}
+
+
+@given(_spansets, _spansets)
+def test_timespanset_algebra(one, two):
+    from xotl.tools.future.datetime import TimeSpanSet
+
+    a, b = TimeSpanSet(one), TimeSpanSet(two)
+    dates_a, dates_b = _dates_of(a), _dates_of(b)
+    assert dates_a == {
+        day
+        for day in daterange(_FIRST, _LAST + timedelta(1))
+        if any(day in span for span in one if span.valid)
+    }
+    assert _dates_of(a | b) == dates_a | dates_b
+    assert _dates_of(a & b) == dates_a & dates_b
+    assert _dates_of(a - b) == dates_a - dates_b
+    assert _dates_of(a ^ b) == dates_a ^ dates_b
+    assert _dates_of(~a) == _dates_of(TimeSpanSet([TimeSpan()])) - dates_a
+    assert ~~a == a and a | ~a == TimeSpanSet([TimeSpan()])
+    assert (a <= b) == (not (a - b))
+    assert a.isdisjoint(b) == (not (a & b))
+    # The spans are sorted, disjoint and not adjacent
+    spans = list(a)
+    for prev, span in zip(spans, spans[1:]):
+        assert prev.end_date + timedelta(1) < span.start_date
+    assert all(span in a for span in spans) and all(span in a for span in one)
+
+
+@given(_spansets)
+def test_timespanset_misc(spans):
+    import pickle
+    from xotl.tools.future.datetime import TimeSpanSet
+
+    a = TimeSpanSet(spans)
+    assert pickle.loads(pickle.dumps(a)) == a and hash(TimeSpanSet(a)) == hash(a)
+    for span in a:
+        assert a.span_at(span.start_date or _FIRST) == span
+    assert a.span_at(date(1999, 1, 1)) in [EmptyTimeSpan] + list(a)[:1]
+
+
+def test_timespanset_examples():
+    from xotl.tools.future.datetime import TimeSpanSet, DateTimeSpanSet
+
+    spans = TimeSpanSet(
+        [("2020-01-10", "2020-01-20"), ("2020-01-21", "2020-01-25"), date(2020, 3, 1)]
+    )
+    assert list(spans) == [
+        TimeSpan("2020-01-10", "2020-01-25"),
+        TimeSpan("2020-03-01", "2020-03-01"),
+    ]
+    assert datetime(2020, 1, 12, 10) in spans and date(2020, 2, 1) not in spans
+    assert TimeSpan("2020-01-11", "2020-01-24") in spans
+    assert TimeSpan("2020-01-11", "2020-03-01") not in spans
+    assert list(~spans)[0] == TimeSpan(None, "2020-01-09")
+    assert TimeSpan("2020-01-01", "2020-01-15") & spans == TimeSpanSet(
+        [TimeSpan("2020-01-10", "2020-01-15")]
+    )
+    assert list(TimeSpan("2020-01-01", "2020-01-31") - spans) == [
+        TimeSpan("2020-01-01", "2020-01-09"),
+        TimeSpan("2020-01-26", "2020-01-31"),
+    ]
+    assert TimeSpanSet([EmptyTimeSpan, TimeSpan("2020-02-01", "2020-01-01")]) == (
+        TimeSpanSet()
+    )
+    assert TimeSpanSet([TimeSpan(), date(2020, 1, 1)]) == TimeSpanSet([TimeSpan()])
+    assert TimeSpanSet([("2020-02-01", "2020-01-01"), ("2020-01-01", None)]) == (
+        TimeSpanSet([TimeSpan("2020-01-01")])
+    )
+    assert not DateTimeSpanSet([("2020-01-01 10:00", "2020-01-01 09:00")])
+    # Equal objects have the same hash
+    single = TimeSpanSet([TimeSpan("2020-01-01", "2020-01-31")])
+    assert single != TimeSpan("2020-01-01", "2020-01-31")
+    assert single != DateTimeSpanSet(single)
+    assert {single: 1}.get(TimeSpan("2020-01-01", "2020-01-31")) is None
+    assert single == TimeSpanSet(list(single))
+    assert DateTimeSpanSet(single) == DateTimeSpanSet(single)
+    assert TimeSpanSet([TimeSpan("9999-12-30", None)]).complement() == TimeSpanSet(
+        [TimeSpan(None, "9999-12-29")]
+    )
+    assert ~TimeSpanSet([TimeSpan(None, "0001-01-01")]) == TimeSpanSet(
+        [TimeSpan("0001-01-02")]
+    )
+    # The first and last dates are taken as unbound
+    assert TimeSpanSet([TimeSpan("2020-01-01", date.max)]) == TimeSpanSet(
+        [TimeSpan("2020-01-01")]
+    )
+    bounded = TimeSpanSet([TimeSpan(date.min, "2020-01-01")])
+    assert list(bounded) == [TimeSpan(None, "2020-01-01")] and ~~bounded == bounded
+    bounded = DateTimeSpanSet([DateTimeSpan("2020-01-01", datetime.max)])
+    assert list(bounded) == [DateTimeSpan("2020-01-01")] and ~~bounded == bounded
+    assert ~DateTimeSpanSet([DateTimeSpan(datetime.min)]) == DateTimeSpanSet()
+
+    # Date time spans are adjacent if there's a second between them
+    hours = DateTimeSpanSet(
+        [
+            DateTimeSpan("2020-01-01 08:00", "2020-01-01 11:59:59"),
+            DateTimeSpan("2020-01-01 12:00", "2020-01-01 17:00"),
+        ]
+    )
+    assert list(hours) == [DateTimeSpan("2020-01-01 08:00", "2020-01-01 17:00")]
+    assert datetime(2020, 1, 1, 12) in hours and datetime(2020, 1, 1, 18) not in hours
+    # Bounds are truncated to the second
+    split = DateTimeSpanSet(
+        [
+            DateTimeSpan("2020-01-01 10:00:00", "2020-01-01 10:00:00.5"),
+            DateTimeSpan("2020-01-01 10:00:02.2", "2020-01-01 11:00"),
+        ]
+    )
+    assert list(split) == [
+        DateTimeSpan("2020-01-01 10:00:00", "2020-01-01 10:00:00"),
+        DateTimeSpan("2020-01-01 10:00:02", "2020-01-01 11:00"),
+    ]
+    assert datetime(2020, 1, 1, 10, 0, 0, 700000) in split
+    assert datetime(2020, 1, 1, 10, 0, 1, 700000) not in split
+    # Mixing sets converts the dates
+    mixed = hours | TimeSpanSet([TimeSpan("2020-01-02", "2020-01-02")])
+    assert type(mixed) is DateTimeSpanSet
+    assert list(mixed)[-1] == DateTimeSpan("2020-01-02 00:00", "2020-01-02 23:59:59")
+    assert DateTimeSpan("2020-01-01 09:00", "2020-01-01 10:00") in TimeSpanSet(
+        [TimeSpan("2020-01-01", "2020-01-01")]
+    )
+    assert DateTimeSpan("2020-01-01 09:00", "2020-01-02 10:00") not in TimeSpanSet(
+        [TimeSpan("2020-01-01", "2020-01-01")]
+    )
+    assert TimeSpan("2020-01-01", "2020-01-01") not in hours
+    assert DateTimeSpan("2020-01-01 09:00", "2020-01-01 12:00") in hours
+    assert EmptyTimeSpan in TimeSpanSet() and TimeSpan() in TimeSpanSet([TimeSpan()])
+
+    # Proper subsets and supersets of time spans and other kinds of sets
+    span = TimeSpan("2020-01-01", "2020-01-31")
+    assert not single < span and not single > span
+    assert single <= span and single >= span
+    assert single < TimeSpan("2020-01-01", "2020-02-01")
+    assert single > TimeSpan("2020-01-02", "2020-01-31")
+    assert not TimeSpan("2020-01-02", "2020-01-31") > single
+    daytimes = DateTimeSpanSet(single)
+    assert not single < daytimes and not single > daytimes
+    assert not daytimes < single and not daytimes > single
+    assert single > DateTimeSpanSet([DateTimeSpan("2020-01-01 10:00", "2020-01-31")])
+    assert daytimes < DateTimeSpan("2020-01-01", "2020-02-01 01:00")
+
+    # Time spans compared with sets defer to the set, in both orders
+    days = TimeSpanSet([TimeSpan("2020-01-01", "2020-01-10")])
+    inner = TimeSpan("2020-01-02", "2020-01-05")
+    assert inner <= days and inner < days and inner.issubset(days)
+    assert days >= inner and days > inner and days.issuperset(inner)
+    assert not inner >= days and not inner > days and not inner.issuperset(days)
+    assert not days <= inner and not days < inner and not days.issubset(inner)
+    outer = TimeSpan("2019-12-01", "2020-02-01")
+    assert outer >= days and outer > days and outer.covers(days)
+    assert days <= outer and days < outer
+    whole = TimeSpan("2020-01-01", "2020-01-10")
+    assert whole <= days and whole >= days and not whole < days and not whole > days
+    moments = DateTimeSpanSet(days)
+    inner = DateTimeSpan("2020-01-02 10:00", "2020-01-05 12:00")
+    assert inner <= moments and inner < moments and inner.issubset(moments)
+    assert moments >= inner and moments > inner
+    assert not inner >= moments and not moments <= inner
+    assert DateTimeSpan("2019-12-31 23:00", "2020-01-02") > moments.intersection(
+        DateTimeSpan("2020-01-01", "2020-01-01 12:00")
+    )
@@ -40,3 +40,97 @@ def test_safe():
         aux[i] = aux.get(i, 0) + 1
     aux[one] = aux[two] = True
     assert data == aux
+
+
+def test_rw_safe_readers_share():
+    from threading import Barrier, Thread
+    from xotl.tools.tasking.safe import RWSafeData
+
+    rw = RWSafeData({"value": 1}, timeout=5.0)
+    readers = 4
+    barrier = Barrier(readers, timeout=5.0)
+    seen = []
+
+    def read():
+        with rw.read() as d:
+            # All readers must be inside at the same time to pass the barrier
+            barrier.wait()
+            seen.append(d["value"])
+
+    threads = [Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert seen == [1] * readers
+    with rw as d:
+        d["value"] = 2
+    with rw.read() as d:
+        assert d["value"] == 2
+    metrics = rw.metrics()
+    assert metrics["read"].count == readers + 1
+    assert metrics["write"].count == 1 and metrics["write"].contended == 0
+
+
+def test_rw_safe_writers():
+    import pytest
+    from threading import Event, Thread
+    from time import sleep
+    from xotl.tools.tasking.safe import RWSafeData
+
+    rw = RWSafeData([], timeout=0.1, prefer_writers=True)
+    inside, done = Event(), Event()
+
+    def read():
+        with rw.read():
+            inside.set()
+            done.wait(5)
+
+    thread = Thread(target=read)
+    thread.start()
+    inside.wait(5)
+    with pytest.raises(TimeoutError):
+        with rw.write():
+            pass
+    done.set()
+    thread.join()
+
+    # A waiting writer blocks new readers
+    rw.timeout = 5.0
+    inside.clear()
+    done.clear()
+    thread = Thread(target=read)
+    thread.start()
+    inside.wait(5)
+
+    def write():
+        with rw.write() as d:
+            d.append("write")
+
+    writer = Thread(target=write)
+    writer.start()
+    while not rw._waiting_writers:
+        sleep(0.001)
+    rw.timeout = 0.05
+    with pytest.raises(TimeoutError):
+        with rw.read():
+            pass
+    done.set()
+    thread.join()
+    writer.join()
+    assert rw.data == ["write"]
+    metrics = rw.metrics()
+    assert metrics["write"].contended == 1 and metrics["write"].wait > 0
+    assert metrics["read"].max_hold > 0
+
+
+def test_rw_safe_hold_as_context():
+    from time import sleep
+    from xotl.tools.tasking.safe import RWSafeData
+
+    rw = RWSafeData([])
+    with rw as data:
+        data.append(1)
+        sleep(0.01)
+    stats = rw.metrics()["write"]
+    assert stats.count == 1 and stats.hold >= 0.01 and stats.max_hold == stats.hold
@@ -57,3 +57,491 @@ def test_signature():
         assert retry(fn, (), {}, 5)
     with pytest.raises(TypeError):
         assert retry(fn, (), {}, x=5)
+
+
+def test_backoff_jitter():
+    from xotl.tools.tasking import BackoffWait, MIN_WAIT_INTERVAL
+
+    full = BackoffWait(wait=0.1, jitter="full")
+    waits = [full() for _ in range(100)]
+    assert all(MIN_WAIT_INTERVAL <= w <= 0.1 + 2**i / 1000 for i, w in enumerate(waits))
+    assert len(set(waits)) > 1
+
+    decorrelated = BackoffWait(wait=0.1, jitter="decorrelated", max_wait=1)
+    prev = None
+    for _ in range(100):
+        res = decorrelated(prev)
+        assert 0.1 <= res <= min(1, max(0.1, 3 * (prev or 0)))
+        prev = res
+    with pytest.raises(ValueError):
+        BackoffWait(jitter="partial")
+
+
+def test_backoff_attempts():
+    from xotl.tools.tasking import BackoffWait, get_backoff_wait
+
+    wait = BackoffWait(wait=0.1, backoff=1)
+    waits = [wait(attempt=i) for i in (1, 2, 3, 1, 2000)]
+    assert waits[:4] == pytest.approx([0.101, 0.102, 0.104, 0.101])
+    assert waits[4] > 10 ** 290
+    assert get_backoff_wait(3, wait=0.1) == pytest.approx(0.104)
+
+
+class AsyncFailingMock(FailingMock):
+    async def __call__(self, incr=1):
+        import asyncio
+
+        if self.sleeper:
+            await asyncio.sleep(self.sleeper)
+        self.start += incr
+        if self.start < self.threshold:
+            raise ValueError(self.start)
+        else:
+            return self.start
+
+
+def _run(coroutine):
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_retrier():
+    import asyncio
+    from time import monotonic
+    from xotl.tools.tasking import retrier, BackoffWait
+
+    fn = AsyncFailingMock()
+    decorated = retrier(max_tries=10, wait=0.001).decorate(fn.__call__)
+    assert asyncio.iscoroutinefunction(decorated)
+    assert _run(decorated()) == 5
+
+    fn = AsyncFailingMock()
+    assert _run(retrier(max_tries=3, wait=0.001)(fn.__call__, incr=2)) == 6
+
+    fn = AsyncFailingMock(threshold=1000000)
+    with pytest.raises(ValueError):
+        _run(retry(fn.__call__, max_tries=3, wait=0.001))
+
+    async def many(wait):
+        fns = [AsyncFailingMock().__call__ for _ in range(100)]
+        tasks = (retry(fn, max_tries=5, wait=wait) for fn in fns)
+        return await asyncio.gather(*tasks)
+
+    assert _run(many(BackoffWait(jitter="full", max_wait=0.03))) == [5] * 100
+    # Each call backs off on its own, even if the wait is shared.
+    start = monotonic()
+    assert _run(many(BackoffWait())) == [5] * 100
+    assert monotonic() - start < 5
+
+
+def test_async_retrier_max_time():
+    import asyncio
+    from time import monotonic
+
+    # The running try is cancelled when max_time is reached
+    fn = AsyncFailingMock(threshold=2, sleeper=10)
+    start = monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        _run(retry(fn.__call__, max_time=0.2))
+    assert monotonic() - start < 1
+
+    # Don't wait if max_time would be reached
+    fn = AsyncFailingMock(threshold=1000000)
+    start = monotonic()
+    with pytest.raises(ValueError):
+        _run(retry(fn.__call__, max_time=0.5, wait=10))
+    assert monotonic() - start < 1 and fn.start == 1
+
+
+def test_retry_budget():
+    from xotl.tools.tasking import RetryBudget
+
+    now = [0]
+    budget = RetryBudget(ratio=0.5, min_retries=2, window=10, clock=lambda: now[0])
+    # The initial balance allows 2 retries, then each call earns half a retry
+    fn = FailingMock(threshold=1000000)
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            retry(fn, max_tries=10, wait=0, budget=budget)
+    assert fn.start == 3 + 2 + 1
+    assert (budget.calls, budget.retries, budget.rejected) == (3, 3, 3)
+    now[0] = 5  # half the window gives min_retries / 2
+    assert budget.balance == 1
+
+
+def test_circuit_breaker():
+    from xotl.tools.tasking import CircuitBreaker, CircuitOpenError
+
+    now = [0]
+    breaker = CircuitBreaker(
+        failure_threshold=3, recovery_timeout=10, clock=lambda: now[0]
+    )
+    fn = FailingMock(threshold=1000000)
+    with pytest.raises(ValueError):
+        retry(fn, max_tries=10, wait=0, breaker=breaker)
+    assert fn.start == 3 and breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        retry(fn, max_tries=10, wait=0, breaker=breaker)
+    assert breaker.short_circuited == 1
+    now[0] = 10
+    assert breaker.state == "half-open"
+    # The trial call fails, so the breaker is opened again
+    with pytest.raises(ValueError):
+        retry(fn, max_tries=10, wait=0, breaker=breaker)
+    assert fn.start == 4 and breaker.state == "open"
+    now[0] = 20
+    fn = FailingMock(threshold=1)
+    assert retry(fn, max_tries=10, wait=0, breaker=breaker) == 1
+    assert breaker.state == "closed" and breaker.failures == 4
+
+
+def _get_contexts():
+    from xotl.tools.context import context, task_context
+
+    return dict(context["CTX"]), dict(task_context["TASK"])
+
+
+def test_thread_pool_executor_contexts():
+    from xotl.tools.context import context, task_context
+    from xotl.tools.tasking.executors import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with context("CTX", a=1), context("CTX", b=2), task_context("TASK", c=3):
+            future = executor.submit(_get_contexts)
+        assert future.result() == ({"a": 1, "b": 2}, {"c": 3})
+        # Contexts are exited in the worker after the call
+        assert executor.submit(_get_contexts).result() == ({}, {})
+
+
+def test_process_pool_executor_contexts():
+    from xotl.tools.context import context, task_context
+    from xotl.tools.tasking.executors import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with context("CTX", a=1, fn=lambda: None), context("CTX", b=2):
+            with task_context("TASK", c=3):
+                future = executor.submit(_get_contexts)
+        # Lambdas can't be pickled
+        assert future.result() == ({"a": 1, "b": 2}, {"c": 3})
+        # Contexts are exited in the worker after the call
+        assert executor.submit(_get_contexts).result() == ({}, {})
+
+
+def _cached_snapshots():
+    from xotl.tools.tasking import executors
+
+    return len(executors._snapshots)
+
+
+def test_process_pool_executor_cached_contexts():
+    from xotl.tools.context import context
+    from xotl.tools.tasking.executors import ProcessPoolExecutor
+
+    import os
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with context("CTX", a=1, fn=lambda: None):
+            futures = [executor.submit(_get_contexts) for _ in range(5)]
+            assert executor.submit(_cached_snapshots).result() == 1
+        assert all(f.result() == ({"a": 1}, {}) for f in futures)
+        # The contexts are stored once, not sent with each call
+        path = executor._store_path
+        assert len(os.listdir(path)) == 1
+        with context("CTX", a=2):
+            assert executor.submit(_get_contexts).result() == ({"a": 2}, {})
+            assert executor.submit(_cached_snapshots).result() == 2
+        assert len(os.listdir(path)) == 2
+    assert not os.path.exists(path)
+
+
+class _Mutable:
+    pass
+
+
+def test_process_pool_executor_mutated_contexts():
+    from xotl.tools.context import context
+    from xotl.tools.tasking.executors import ProcessPoolExecutor
+
+    obj = _Mutable()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with context("CTX", a=1, obj=obj):
+            assert set(executor.submit(_get_contexts).result()[0]) == {"a", "obj"}
+            obj.fn = lambda: None  # Now it can't be pickled
+            assert executor.submit(_get_contexts).result() == ({"a": 1}, {})
+
+
+def _keywords(**kwargs):
+    from xotl.tools.context import context
+
+    return kwargs, dict(context["CTX"])
+
+
+def test_executors_keyword_fn():
+    from xotl.tools.context import context
+    from xotl.tools.tasking.executors import ThreadPoolExecutor
+    from xotl.tools.tasking.executors import ProcessPoolExecutor
+
+    for cls in (ThreadPoolExecutor, ProcessPoolExecutor):
+        with cls(max_workers=1) as executor:
+            with context("CTX", a=1):
+                future = executor.submit(_keywords, fn=1, self=2)
+            assert future.result() == ({"fn": 1, "self": 2}, {"a": 1})
+
+
+def test_work_queue():
+    from xotl.tools.tasking import retrier
+    from xotl.tools.tasking.workqueue import WorkQueue, QueueClosedError
+
+    errors = []
+    mocks = {i: FailingMock(threshold=3) for i in range(20)}
+    queue = WorkQueue(
+        lambda i: mocks[i](),
+        workers=4,
+        maxsize=5,
+        retrier=retrier(max_tries=5, wait=0),
+        onerror=lambda item, error: errors.append(item),
+    )
+    with queue:
+        futures = [queue.put(i) for i in range(20)]
+        failing = queue.put(100)  # KeyError, not retried
+    assert [future.result() for future in futures] == [3] * 20
+    assert isinstance(failing.exception(), KeyError) and errors == [100]
+    assert queue.closed
+    with pytest.raises(QueueClosedError):
+        queue.put(1)
+
+
+def test_work_queue_backpressure():
+    from queue import Full
+    from threading import Event
+    from xotl.tools.tasking.workqueue import WorkQueue
+
+    release = Event()
+    queue = WorkQueue(lambda item: release.wait(5), maxsize=2, block=False)
+    running = queue.put(0)
+    while not running.running():
+        pass
+    pending = [queue.put(1), queue.put(2)]
+    assert queue.full()
+    with pytest.raises(Full):
+        queue.put(3)
+    with pytest.raises(Full):
+        queue.put(3, block=True, timeout=0.05)
+    queue.shutdown(wait=False, cancel_pending=True)
+    release.set()
+    queue.join(5)
+    assert running.result() is True
+    assert all(future.cancelled() for future in pending)
+
+
+def test_work_queue_failing_onerror(caplog):
+    from xotl.tools.tasking.workqueue import WorkQueue
+
+    def onerror(item, error):
+        raise RuntimeError(item)
+
+    with WorkQueue(lambda i: 1 // i, onerror=onerror) as queue:
+        futures = [queue.put(i) for i in (0, 0, 1, 2)]
+    assert all(isinstance(f.exception(), ZeroDivisionError) for f in futures[:2])
+    assert [future.result() for future in futures[2:]] == [1, 0]
+    assert caplog.text.count("Error handler failed") == 2
+
+
+def _hold_lock(lock, started, path):
+    # Used by test_process_locks, write while holding the lock
+    import time
+
+    with lock.enter():
+        started.set()
+        with open(path, "a") as f:
+            f.write("child-in\n")
+        time.sleep(0.3)
+        with open(path, "a") as f:
+            f.write("child-out\n")
+
+
+def test_thread_lock():
+    from threading import Thread
+    from time import sleep
+    from xotl.tools.tasking import lock as module
+    from xotl.tools.tasking.lock import ThreadLock
+
+    lock = ThreadLock()
+    events = []
+
+    def run(name):
+        with lock.enter():
+            assert lock.locked
+            with lock.enter():  # reentrant in the same thread
+                events.append(name)
+                sleep(0.01)
+                events.append(name)
+
+    threads = [Thread(target=run, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(events[i] == events[i + 1] for i in range(0, 10, 2))
+    assert not lock.locked
+    assert module.thread_lock is not module.thread_lock
+
+
+@pytest.mark.parametrize("kind", ["thread", "file"])
+def test_locks_in_executors(kind, tmp_path):
+    from threading import Lock
+    from time import sleep
+    from xotl.tools.tasking.executors import ThreadPoolExecutor
+    from xotl.tools.tasking.lock import ThreadLock, FileLock
+
+    lock = ThreadLock() if kind == "thread" else FileLock(str(tmp_path / "lock"))
+    inside, maximum = [0], [0]
+    counter = Lock()
+
+    def critical():
+        # The contexts of the caller (holding the lock) are propagated.
+        locked = lock.locked
+        with lock.enter(timeout=30):
+            with counter:
+                inside[0] += 1
+                maximum[0] = max(maximum[0], inside[0])
+            sleep(0.01)
+            with counter:
+                inside[0] -= 1
+        return locked
+
+    def try_enter():
+        with lock.enter(timeout=0.01):
+            pass
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        with lock.enter():
+            with pytest.raises(TimeoutError):
+                executor.submit(try_enter).result()
+            futures = [executor.submit(critical) for _ in range(8)]
+            sleep(0.05)
+            assert not inside[0]
+        assert not any(future.result() for future in futures)
+    assert maximum[0] == 1 and not lock.locked
+
+
+@pytest.mark.parametrize("kind", ["process", "file"])
+def test_process_locks(kind, tmp_path):
+    import multiprocessing
+    from xotl.tools.tasking.lock import ProcessLock, FileLock
+
+    mp = multiprocessing.get_context("spawn")
+    path = str(tmp_path / "log")
+    if kind == "process":
+        lock = ProcessLock(mp)
+    else:
+        lock = FileLock(str(tmp_path / "lock"))
+    started = mp.Event()
+    child = mp.Process(target=_hold_lock, args=(lock, started, path))
+    child.start()
+    assert started.wait(30)
+    with pytest.raises(TimeoutError):
+        with lock.enter(timeout=0.01):
+            pass
+    with lock.enter(timeout=30):
+        with open(path, "a") as f:
+            f.write("parent\n")
+    child.join(30)
+    with open(path) as f:
+        assert f.read() == "child-in\nchild-out\nparent\n"
+
+
+def test_context_local():
+    pytest.importorskip("contextvars")
+    import asyncio
+    from threading import Thread
+    from xotl.tools.tasking import ContextLocal
+
+    class Local(ContextLocal):
+        def __init__(self, value):
+            self.value = value
+            self.inits = getattr(self, "inits", 0) + 1
+
+        @property
+        def double(self):
+            return 2 * self.value
+
+    data = Local(1)
+    data.value = 2
+    assert data.double == 4 and data.inits == 1
+    seen = []
+
+    def thread():
+        seen.append((data.value, data.inits))
+        data.value = 3
+
+    worker = Thread(target=thread)
+    worker.start()
+    worker.join()
+    assert seen == [(1, 1)] and data.value == 2
+    with pytest.raises(AttributeError):
+        data.double = 1
+    del data.inits
+    with pytest.raises(AttributeError):
+        data.inits
+
+    async def task(i):
+        # Tasks see the values of their creator but don't change them
+        assert data.value == 2
+        data.value = i
+        await asyncio.sleep(0)
+        return data.value
+
+    async def main():
+        return await asyncio.gather(*(task(i) for i in range(10)))
+
+    assert _run(main()) == list(range(10))
+    assert data.value == 2
+
+
+def test_context_local_collected():
+    pytest.importorskip("contextvars")
+    import gc
+    import weakref
+    from xotl.tools.tasking import ContextLocal
+
+    class Data:
+        pass
+
+    data, other = ContextLocal(), ContextLocal()
+    data.value = value = Data()
+    other.value = 1
+    value = weakref.ref(value)
+    del data
+    gc.collect()
+    assert value() is None
+    assert other.value == 1
+    other.value = 2  # drops the instances collected
+    assert other.value == 2
+
+
+def test_context_local_greenlets():
+    pytest.importorskip("contextvars")
+    greenlet = pytest.importorskip("greenlet").greenlet
+    from xotl.tools.tasking import ContextLocal
+
+    data = ContextLocal()
+    data.value = "main"
+
+    def run(name):
+        assert not hasattr(data, "value")
+        data.value = name
+        main.switch()
+        return data.value
+
+    main = greenlet.getcurrent()
+    one, two = greenlet(run), greenlet(run)
+    one.switch("one")
+    two.switch("two")
+    assert data.value == "main"
+    assert one.switch() == "one" and two.switch() == "two"
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+import os
+import pytest
+
+
+def test_async_call():
+    from xotl.tools.future.threading import async_call
+
+    results, errors = [], []
+    future = async_call(
+        sum, args=[(1, 2, 3)], callback=results.append, onerror=errors.append
+    )
+    assert future.wait(5) and future.is_set()
+    assert future.result() == 6 and results == [6] and not errors
+
+    future = async_call(int, args=["x"], onerror=errors.append)
+    with pytest.raises(ValueError):
+        future.result(5)
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_sync_call_fan_out():
+    import threading
+    from time import sleep, monotonic
+    from xotl.tools.future.threading import sync_call
+
+    def call(i):
+        def f():
+            sleep(0.01)
+            return i
+
+        return f
+
+    threads = threading.active_count()
+    results = []
+    start = monotonic()
+    sync_call([call(i) for i in range(200)], results.append)
+    assert sorted(results) == list(range(200))
+    assert monotonic() - start < 5
+    # The pool is bounded
+    assert threading.active_count() - threads <= 64
+
+
+def test_sync_call_timeout_cancels():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Event
+    from xotl.tools.future.threading import sync_call, completed_calls
+
+    release = Event()
+    called = []
+
+    def blocked():
+        called.append(1)
+        release.wait(5)
+        return "late"
+
+    results = []
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        sync_call(
+            [lambda: "soon", blocked, blocked, blocked],
+            results.append,
+            timeout=0.2,
+            executor=executor,
+        )
+        release.set()
+    assert results == ["soon"]
+    assert len(called) == 1  # the others were cancelled
+
+    calls = completed_calls([lambda: 1, lambda: 2])
+    assert sorted(future.result() for future in calls) == [1, 2]
+
+
+def test_async_call_base_exceptions():
+    from asyncio import CancelledError  # a BaseException since Python 3.8
+    from xotl.tools.future.threading import async_call
+
+    errors = []
+
+    def cancelled():
+        raise CancelledError()
+
+    def exit():
+        raise SystemExit(1)
+
+    for func in (cancelled, exit):
+        future = async_call(func, onerror=errors.append)
+        assert future.wait(5) and future.done()
+    assert isinstance(future.exception(), SystemExit)
+    assert not errors  # only called for exceptions
+
+    def fail(error):
+        raise RuntimeError()
+
+    future = async_call(int, args=["x"], onerror=fail)
+    assert future.wait(5) and isinstance(future.exception(), ValueError)
+
+
+def test_nested_sync_calls():
+    from xotl.tools.future.threading import sync_call, _get_executor
+
+    def call(funcs):
+        results = []
+        sync_call(funcs, results.append, timeout=10)
+        return results
+
+    def leaf():
+        return 1
+
+    def inner():
+        return sum(call([leaf] * 10))
+
+    def middle():
+        return sum(call([inner] * 3))
+
+    # More outer calls than workers in the pool, all waiting for their
+    # nested calls, which wait for theirs.
+    outer = _get_executor()._max_workers * 2
+    assert call([middle] * outer) == [30] * outer
+
+
+def test_async_call_doesnt_block_exit():
+    import subprocess
+    import sys
+
+    code = (
+        "import time\n"
+        "from xotl.tools.future.threading import async_call\n"
+        "async_call(time.sleep, args=(60,))\n"
+        "async_call(lambda: async_call(time.sleep, args=(60,)))\n"
+        "time.sleep(0.1)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork()")
+def test_async_call_after_fork():
+    from xotl.tools.future.threading import async_call
+
+    assert async_call(lambda: 1).wait(5)
+    pid = os.fork()
+    if not pid:
+        future = async_call(lambda: 42)
+        os._exit(0 if future.wait(5) and future.result() == 42 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert status == 0
+
+
+def test_nested_calls_dont_add_threads():
+    from time import sleep
+    from threading import active_count
+    from xotl.tools.future.threading import sync_call, _get_executor
+
+    counts = []
+
+    def leaf():
+        counts.append(active_count())
+        sleep(0.001)
+        return 1
+
+    def inner():
+        results = []
+        sync_call([leaf] * 50, results.append)
+        return sum(results)
+
+    results = []
+    before = active_count()
+    sync_call([inner] * 50, results.append)
+    assert results == [50] * 50
+    assert max(counts) <= before + _get_executor()._max_workers
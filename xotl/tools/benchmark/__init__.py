@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Benchmarks of the hot paths of xotl.tools.
+
+Benchmarks are registered with the `benchmark`:func: decorator.  The ones of
+the library itself are in the module ``xotl.tools.benchmark.suite``.  Run
+them with::
+
+  python -m xotl.tools.benchmark run --json results.json
+
+and compare two results (e.g. before and after an upgrade) with::
+
+  python -m xotl.tools.benchmark compare before.json after.json
+
+To guard against performance regressions, ``check`` runs the benchmarks and
+compares them with a baseline stored for the machine and Python version
+(benchmarks not in the baseline are added to it, ``--update`` replaces the
+results of the selected ones); it exits with status 1 if a benchmark is
+significantly slower::
+
+  python -m xotl.tools.benchmark check --threshold 0.1
+
+Use ``--help`` for the rest of the options.
+
+The scripts ``context.py``, ``local.py`` and ``mp.py`` in this package can be
+run by themselves.
+
+.. versionadded:: 2.1.11
+
+"""
+
+from collections import namedtuple
+from typing import Dict
+
+
+__all__ = (
+    "benchmark",
+    "Benchmark",
+    "get_benchmarks",
+    "measure",
+    "Result",
+    "dump",
+    "load",
+    "compare",
+    "mann_whitney",
+    "regressions",
+    "baseline_name",
+)
+
+
+#: A registered benchmark: its name, the function that prepares it and its
+#: documentation.
+Benchmark = namedtuple("Benchmark", "name setup doc")
+
+#: The registered benchmarks, by name.
+_registry: Dict[str, Benchmark] = {}
+
+
+def benchmark(name):
+    """Register a benchmark with the given (dotted) name.
+
+    Decorates a function without arguments that prepares the benchmark and
+    returns the callable (without arguments) to time::
+
+      @benchmark('string.slugify')
+      def _slugify():
+          from xotl.tools.string import slugify
+          return lambda: slugify('Hello, world')
+
+    The first component of the name is the group of the benchmark.
+
+    """
+
+    def decorator(setup):
+        if name in _registry:
+            raise ValueError("Duplicated benchmark %r" % name)
+        _registry[name] = Benchmark(name, setup, (setup.__doc__ or "").strip())
+        return setup
+
+    return decorator
+
+
+def get_benchmarks(patterns=None):
+    """Return the registered benchmarks sorted by name.
+
+    If `patterns` is given, return only those whose name matches any of the
+    shell patterns (or starts with any of them followed by a dot).
+
+    """
+    from fnmatch import fnmatchcase
+
+    from . import suite  # noqa: register the benchmarks of the library
+
+    def selected(name):
+        return any(
+            fnmatchcase(name, pattern) or name.startswith(pattern + ".")
+            for pattern in patterns
+        )
+
+    return [
+        bench
+        for name, bench in sorted(_registry.items())
+        if not patterns or selected(name)
+    ]
+
+
+_Result = namedtuple("_Result", "name number samples median iqr min mean")
+
+
+class Result(_Result):
+    """The times (in seconds per call) of a benchmark.
+
+    `samples` has the average time of a call in each repetition, of `number`
+    calls each.
+
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_samples(cls, name, number, samples):
+        from statistics import mean
+
+        data = sorted(samples)
+        iqr = _quantile(data, 0.75) - _quantile(data, 0.25)
+        median = _quantile(data, 0.5)
+        return cls(name, number, list(samples), median, iqr, data[0], mean(data))
+
+
+def _quantile(data, q):
+    """Return the `q` quantile of the sorted `data`, by linear interpolation."""
+    pos = (len(data) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(data) - 1)
+    return data[low] + (data[high] - data[low]) * (pos - low)
+
+
+def measure(bench, repeat=20, number=None, warmup=2, min_time=0.01):
+    """Time a `benchmark`:func: and return its `Result`:class:.
+
+    The timed callable is called `number` times in each of the `repeat`
+    samples.  If `number` is None, it's calibrated so a sample takes at least
+    `min_time` seconds.  The first `warmup` samples are discarded.
+
+    """
+    from timeit import Timer
+
+    timer = Timer(bench.setup())
+    timer.timeit(1)  # don't calibrate with the costs of the first call
+    if number is None:
+        number = 1
+        while timer.timeit(number) < min_time and number < 10 ** 8:
+            number *= 10
+    samples = [timer.timeit(number) / number for _ in range(warmup + repeat)]
+    return Result.from_samples(bench.name, number, samples[warmup:])
+
+
+def _environment():
+    import platform
+    import sys
+    from datetime import datetime
+    from xotl.tools import __version__
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.node(),
+        "platform": platform.platform(),
+        "executable": sys.executable,
+        "version": __version__,
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def dump(results, file):
+    """Save a list of results as JSON in an open `file`."""
+    import json
+
+    data = {
+        "environment": _environment(),
+        "benchmarks": {res.name: res._asdict() for res in results},
+    }
+    json.dump(data, file, indent=2)
+
+
+def load(file):
+    """Load the results saved by `dump`:func:.
+
+    Return a tuple with the environment and the dictionary from names to
+    results.
+
+    """
+    import json
+
+    data = json.load(file)
+    results = {name: Result(**res) for name, res in data["benchmarks"].items()}
+    return data["environment"], results
+
+
+def compare(old, new):
+    """Compare two dictionaries of results (see `load`:func:).
+
+    Yield, for each benchmark in both, a tuple with its name, the old and new
+    results, and the ratio of the new median to the old median.
+
+    """
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name], new[name]
+        yield name, before, after, after.median / before.median
+
+
+def mann_whitney(before, after):
+    """Return the p-value of the Mann-Whitney U test that the samples in
+    `after` tend to be greater than those in `before`.
+
+    Uses the normal approximation (with correction for ties and continuity),
+    which is good enough from about 8 samples in each group.  The test doesn't
+    assume that times follow a normal distribution (they don't), and it's
+    robust to outliers.
+
+    """
+    from math import erfc, sqrt
+
+    n1, n2 = len(before), len(after)
+    n = n1 + n2
+    values = sorted([(x, 0) for x in before] + [(x, 1) for x in after])
+    rank_sum = ties = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and values[j + 1][0] == values[i][0]:
+            j += 1
+        count = j - i + 1
+        rank = (i + j) / 2 + 1  # the average of the ranks of tied values
+        rank_sum += rank * sum(group for _, group in values[i : j + 1])
+        ties += count ** 3 - count
+        i = j + 1
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 0.5  # all the samples are equal
+    z = (u - mean - 0.5) / sqrt(variance)
+    return erfc(z / sqrt(2)) / 2
+
+
+def regressions(old, new, threshold=0.05, alpha=0.01):
+    """Yield the comparisons (see `compare`:func:) of the benchmarks that
+    regressed.
+
+    A benchmark regressed if its median increased more than `threshold` (a
+    fraction of the old median) and its samples are greater than the old ones
+    with a significance level of `alpha` (see `mann_whitney`:func:).
+
+    """
+    for name, before, after, ratio in compare(old, new):
+        if ratio > 1 + threshold:
+            if mann_whitney(before.samples, after.samples) < alpha:
+                yield name, before, after, ratio
+
+
+def baseline_name():
+    """Return the file name of the baseline of this machine and Python."""
+    import platform
+    import re
+
+    version = ".".join(platform.python_version_tuple()[:2])
+    parts = (platform.node() or "unknown", platform.python_implementation(), version)
+    return re.sub(r"[^\w.-]", "_", "-".join(parts)) + ".json"
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Run the benchmarks of xotl.tools and compare their results."""
+
+import sys
+
+from xotl.tools.benchmark import (
+    baseline_name,
+    compare,
+    dump,
+    get_benchmarks,
+    load,
+    mann_whitney,
+    measure,
+    regressions,
+)
+
+
+def format_time(seconds):
+    """Return a short representation of a time in seconds."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return "%.3f %s" % (seconds / scale, unit)
+    return "%.1f ns" % (seconds / 1e-9)
+
+
+def list_(args):
+    for bench in get_benchmarks(args.patterns):
+        print("%-36s %s" % (bench.name, bench.doc.split("\n")[0]))
+
+
+def measure_all(args):
+    """Run the selected benchmarks, print and return their results."""
+    header = ("benchmark", "median", "IQR", "min", "loops")
+    print("%-36s %12s %12s %12s %10s" % header)
+    results = []
+    for bench in get_benchmarks(args.patterns):
+        res = measure(
+            bench,
+            repeat=args.repeat,
+            number=args.number,
+            warmup=args.warmup,
+            min_time=args.min_time,
+        )
+        results.append(res)
+        times = (format_time(t) for t in (res.median, res.iqr, res.min))
+        print("%-36s %12s %12s %12s %10d" % (res.name, *times, res.number))
+    return results
+
+
+def run(args):
+    if not get_benchmarks(args.patterns):
+        print("No benchmarks selected", file=sys.stderr)
+        return 1
+    results = measure_all(args)
+    if args.json:
+        with open(args.json, "w") as f:
+            dump(results, f)
+    return 0
+
+
+def print_comparison(comparison, alpha):
+    header = ("benchmark", "old", "new", "change")
+    print("%-36s %12s %12s %9s" % header)
+    for name, before, after, ratio in comparison:
+        if mann_whitney(before.samples, after.samples) < alpha:
+            mark = " slower"
+        elif mann_whitney(after.samples, before.samples) < alpha:
+            mark = " faster"
+        else:
+            mark = ""  # not significant
+        times = (format_time(before.median), format_time(after.median))
+        change = (ratio - 1) * 100
+        print("%-36s %12s %12s %+8.1f%%%s" % (name, *times, change, mark))
+
+
+def compare_(args):
+    with open(args.old) as f:
+        _, old = load(f)
+    with open(args.new) as f:
+        _, new = load(f)
+    print_comparison(compare(old, new), args.alpha)
+    for name in sorted(set(old) ^ set(new)):
+        where = args.old if name in old else args.new
+        print("%-36s only in %s" % (name, where))
+    return 0
+
+
+def check(args):
+    import os
+
+    if not get_benchmarks(args.patterns):
+        print("No benchmarks selected", file=sys.stderr)
+        return 1
+    path = args.baseline or os.path.join(args.baseline_dir, baseline_name())
+    if os.path.exists(path):
+        with open(path) as f:
+            _, baseline = load(f)
+    else:
+        baseline = None
+
+    def save(results):
+        # Keep the results of the benchmarks not selected.
+        merged = dict(baseline or {})
+        merged.update((res.name, res) for res in results)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            dump(list(merged.values()), f)
+
+    results = measure_all(args)
+    if baseline is None or args.update:
+        save(results)
+        print("\nSaved the baseline in %s" % path)
+        return 0
+    new = {res.name: res for res in results}
+    missing = sorted(set(new) - set(baseline))
+    print("\nCompared with the baseline in %s" % path)
+    print_comparison(compare(baseline, new), args.alpha)
+    if missing:
+        save(new[name] for name in missing)
+        print("Added to the baseline: %s" % ", ".join(missing))
+    failed = list(regressions(baseline, new, args.threshold, args.alpha))
+    if failed:
+        print("\nRegressions (more than %d%% slower):" % (args.threshold * 100))
+        for name, before, after, ratio in failed:
+            print("  %s: %+.1f%%" % (name, (ratio - 1) * 100))
+        return 1
+    return 0
+
+
+def add_run_arguments(cmd):
+    cmd.add_argument(
+        "patterns",
+        nargs="*",
+        help="Run only the benchmarks matching these shell patterns or groups "
+        "(e.g. 'context' or '*.new').",
+    )
+    cmd.add_argument(
+        "--repeat", type=int, default=20, help="Number of samples, defaults to 20."
+    )
+    cmd.add_argument(
+        "--number",
+        type=int,
+        default=None,
+        help="Calls in each sample, calibrated by default (see --min-time).",
+    )
+    cmd.add_argument(
+        "--warmup",
+        type=int,
+        default=2,
+        help="Number of samples to discard before measuring, defaults to 2.",
+    )
+    cmd.add_argument(
+        "--min-time",
+        type=float,
+        default=0.01,
+        help="Minimum time of a sample when calibrating, defaults to 0.01 seconds.",
+    )
+
+
+def add_alpha_argument(cmd):
+    cmd.add_argument(
+        "--alpha",
+        type=float,
+        default=0.01,
+        help="Significance level of the changes (Mann-Whitney U test), "
+        "defaults to 0.01.",
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m xotl.tools.benchmark", description=__doc__
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    cmd = commands.add_parser("list", help="List the benchmarks.")
+    cmd.add_argument("patterns", nargs="*", help="Shell patterns or groups.")
+    cmd.set_defaults(func=list_)
+
+    cmd = commands.add_parser("run", help="Run the benchmarks.")
+    add_run_arguments(cmd)
+    cmd.add_argument("--json", metavar="FILE", help="Save the results in FILE.")
+    cmd.set_defaults(func=run)
+
+    cmd = commands.add_parser("compare", help="Compare two results files.")
+    cmd.add_argument("old", help="The reference results (JSON).")
+    cmd.add_argument("new", help="The results to compare (JSON).")
+    add_alpha_argument(cmd)
+    cmd.set_defaults(func=compare_)
+
+    cmd = commands.add_parser(
+        "check",
+        help="Run the benchmarks and fail if they regressed from the baseline.",
+    )
+    add_run_arguments(cmd)
+    cmd.add_argument(
+        "--baseline-dir",
+        default=".benchmarks",
+        help="Directory of the baselines, defaults to '.benchmarks'.  The "
+        "baseline file is named after the machine and the Python version.",
+    )
+    cmd.add_argument(
+        "--baseline", metavar="FILE", help="Use FILE instead of --baseline-dir."
+    )
+    cmd.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="Fraction of the baseline median a benchmark may slow down, "
+        "defaults to 0.05.",
+    )
+    cmd.add_argument(
+        "--update",
+        action="store_true",
+        help="Save the results in the baseline instead of checking.  The "
+        "results of the benchmarks not selected are kept.",
+    )
+    add_alpha_argument(cmd)
+    cmd.set_defaults(func=check)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
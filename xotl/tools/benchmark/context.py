@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Measure the cost of entering and looking up execution contexts.
+
+Compares `xotl.tools.context.context`:class: and
+`xotl.tools.context.task_context`:class: with the minimum cost of a plain
+`contextvars.ContextVar`:class:.
+
+"""
+
+from contextvars import ContextVar
+from timeit import Timer
+
+from xotl.tools.context import context, task_context
+
+
+FLAG = "BENCHMARK-FLAG"
+_flag = ContextVar("flag", default=False)
+
+
+def contextvar_enter():
+    token = _flag.set(True)
+    _flag.reset(token)
+
+
+def contextvar_lookup():
+    _flag.get()
+
+
+def context_enter():
+    with context(FLAG):
+        pass
+
+
+def context_enter_data():
+    with context(FLAG, value=1):
+        pass
+
+
+def context_lookup():
+    context[FLAG]
+
+
+def task_context_enter():
+    with task_context(FLAG):
+        pass
+
+
+def task_context_enter_data():
+    with task_context(FLAG, value=1):
+        pass
+
+
+def task_context_lookup():
+    task_context[FLAG]
+
+
+def measure(fn, number):
+    """Return the best time (in microseconds) of a call to `fn`."""
+    timer = Timer(fn)
+    return min(timer.repeat(repeat=5, number=number)) / number * 10 ** 6
+
+
+def run(number=10000):
+    """Print the cost of each operation, outside and inside the context."""
+    benchmarks = [
+        ("enter/exit", contextvar_enter, context_enter, task_context_enter),
+        ("enter/exit (data)", None, context_enter_data, task_context_enter_data),
+        ("lookup", contextvar_lookup, context_lookup, task_context_lookup),
+    ]
+    header = ("µs per call", "contextvars", "context", "task_context")
+    print("%-26s %12s %12s %12s" % header)
+    for nested in (False, True):
+        for name, *fns in benchmarks:
+            if nested:
+                name += " (nested)"
+                with context(FLAG), task_context(FLAG):
+                    times = [measure(fn, number) if fn else None for fn in fns]
+            else:
+                times = [measure(fn, number) if fn else None for fn in fns]
+            cells = ("%12.3f" % t if t is not None else "%12s" % "-" for t in times)
+            print("%-26s %s" % (name, " ".join(cells)))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--number",
+        help="Number of calls of each timing, defaults to 10000.",
+        type=int,
+        default=10000,
+    )
+    args = parser.parse_args()
+    run(args.number)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Measure the cost of attribute access in local data.
+
+Compares `xotl.tools.tasking.ContextLocal`:class: with
+`threading.local`:class: and the greenlet local used when greenlets are
+loaded (``xotl.tools.tasking._greenlet_local.local``).
+
+"""
+
+from threading import local as thread_local
+from timeit import Timer
+
+from xotl.tools.tasking import ContextLocal
+from xotl.tools.tasking._greenlet_local import local as greenlet_local
+
+
+IMPLEMENTATIONS = [
+    ("threading", thread_local),
+    ("greenlet", greenlet_local),
+    ("contextvars", ContextLocal),
+]
+
+
+def benchmarks(cls):
+    """Return the functions to measure with an instance of `cls`."""
+    data = cls()
+    data.value = 1
+
+    def get():
+        data.value
+
+    def set():
+        data.value = 1
+
+    def method():
+        data.__class__
+
+    return [("get attribute", get), ("set attribute", set), ("get class", method)]
+
+
+def measure(fn, number):
+    """Return the best time (in microseconds) of a call to `fn`."""
+    timer = Timer(fn)
+    return min(timer.repeat(repeat=5, number=number)) / number * 10 ** 6
+
+
+def run(number=100000):
+    """Print the cost of each operation with each implementation."""
+    names = [name for name, _ in IMPLEMENTATIONS]
+    rows = {}
+    for _, cls in IMPLEMENTATIONS:
+        for name, fn in benchmarks(cls):
+            rows.setdefault(name, []).append(measure(fn, number))
+    print("%-16s %s" % ("µs per call", " ".join("%12s" % name for name in names)))
+    for name, times in rows.items():
+        print("%-16s %s" % (name, " ".join("%12.3f" % t for t in times)))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--number",
+        help="Number of calls of each timing, defaults to 100000.",
+        type=int,
+        default=100000,
+    )
+    args = parser.parse_args()
+    run(args.number)
@@ -3,13 +3,21 @@
 # Copyright (c) 2013-2017 Merchise Autrement [~º/~] and Contributors
 # Copyright (c) 2012 Manuel Vazquez
 
-from multiprocessing import Pool, cpu_count
-from itertools import count, islice, repeat
+"""Measure the throughput of process pools with a CPU-bound job.
+
+Each task computes the GCD of two large numbers.  The benchmark sweeps the
+number of workers and the chunk sizes, and compares `multiprocessing.Pool`
+(``imap`` and ``imap_unordered``) with
+`concurrent.futures.ProcessPoolExecutor`.  For each combination it reports
+the tasks per second and the scaling efficiency: the speedup over one worker
+divided by the number of workers (1.0 is perfect scaling).
 
-try:
-    from itertools import izip as zip
-except ImportError:
-    pass
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count, islice
+from multiprocessing import Pool, cpu_count
+from time import perf_counter
 
 
 def gcd(a, b):
@@ -18,67 +26,126 @@ def gcd(a, b):
     return b
 
 
-def job(args):
-    which, show = args
-    try:
-        result = gcd(which, which + 2 ** 37 - 73)
-        if show and result != 1:
-            print(which, result)
-    except KeyboardInterrupt:
-        pass
+def job(which):
+    return gcd(which, which + 2 ** 37 - 73)
 
 
-if __name__ == "__main__":
-    from datetime import datetime
+def tasks(size):
+    return islice(count(2 ** 1028 + 1), size)
+
+
+def run_pool(method, workers, size, chunksize):
+    with Pool(processes=workers) as pool:
+        imap = getattr(pool, method)
+        # The results must be consumed, otherwise nothing is awaited.
+        return sum(1 for _ in imap(job, tasks(size), chunksize=chunksize))
+
+
+def run_imap(workers, size, chunksize):
+    return run_pool("imap", workers, size, chunksize)
+
+
+def run_imap_unordered(workers, size, chunksize):
+    return run_pool("imap_unordered", workers, size, chunksize)
+
+
+def run_executor(workers, size, chunksize):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(1 for _ in executor.map(job, tasks(size), chunksize=chunksize))
+
+
+METHODS = {
+    "imap": run_imap,
+    "imap_unordered": run_imap_unordered,
+    "executor": run_executor,
+}
+
+
+def measure(method, workers, size, chunksize, repeat=1):
+    """Return the best throughput (tasks per second) of a method."""
+    run = METHODS[method]
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        done = run(workers, size, chunksize)
+        elapsed = perf_counter() - start
+        assert done == size
+        best = elapsed if best is None else min(best, elapsed)
+    return size / best
+
+
+def sweep(methods, workers, chunksizes, size, repeat=1):
+    """Measure every combination.
+
+    Yield tuples ``(method, chunksize, workers, throughput, efficiency)``.
+    The efficiency is relative to the throughput with the smallest number of
+    workers of the same method and chunk size.
+
+    """
+    workers = sorted(workers)
+    for method in methods:
+        for chunksize in chunksizes:
+            base = None
+            for n in workers:
+                throughput = measure(method, n, size, chunksize, repeat)
+                if base is None:
+                    base = throughput / workers[0]
+                yield method, chunksize, n, throughput, throughput / n / base
+
+
+def main(argv=None):
     import argparse
 
-    cpus = max(cpu_count() - 1, 1)
-    parser = argparse.ArgumentParser(
-        "Run several workers calculating GCD "
-        "for large numbers. Uses multiprocessing "
-        "to test several CPUs."
+    cpus = cpu_count()
+    default_workers = sorted({1, 2, max(cpus // 2, 1), cpus})
+
+    def int_list(value):
+        return [int(item) for item in value.split(",")]
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--workers",
+        type=int_list,
+        default=default_workers,
+        help="Comma-separated numbers of workers, defaults to %s (there are "
+        "%d CPUs)." % (",".join(map(str, default_workers)), cpus),
     )
     parser.add_argument(
-        "--show",
-        help="Whether to print or not the gcds",
-        action="store_true",
-        dest="show",
-        default=False,
+        "--chunksize",
+        type=int_list,
+        default=[1, 64, 1024],
+        help="Comma-separated chunk sizes, defaults to 1,64,1024.",
     )
     parser.add_argument(
-        "--workers",
-        help="Number of workers. Defaults to %d." % cpus,
-        type=int,
-        action="store",
-        dest="workers",
-        default=cpus,
+        "--method",
+        choices=sorted(METHODS),
+        action="append",
+        help="The methods to compare (may be repeated), defaults to all.",
     )
     parser.add_argument(
         "--size",
-        help="The magnitude of the test. Represents how many "
-        "cycles are processed, exactly 10**MAGNITUDE; "
-        "so be nice!",
         type=int,
-        action="store",
-        dest="magnitude",
-        default=6,
+        default=10 ** 5,
+        help="Number of tasks of each measure, defaults to 100000.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Repeat each measure and keep the best, defaults to 1.",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    pool = Pool(processes=args.workers)
-    start = datetime.now()
+    header = ("method", "chunksize", "workers", "tasks/s", "efficiency")
+    print("%-16s %10s %8s %12s %11s" % header)
+    methods = args.method or sorted(METHODS)
+    results = sweep(methods, args.workers, args.chunksize, args.size, args.repeat)
     try:
-        print("Working...")
-        pool.imap(
-            job,
-            zip(islice(count(2 ** 1028 + 1), 10 ** args.magnitude), repeat(args.show)),
-            chunksize=1024,
-        )
-        pool.close()
-        pool.join()
+        for row in results:
+            print("%-16s %10d %8d %12.0f %11.2f" % row)
     except KeyboardInterrupt:
-        pool.terminate()
-        pool.join()
-    end = datetime.now()
-    total_seconds = (end - start).total_seconds()
-    print("All workers (%d) finished in %f seconds" % (args.workers, total_seconds))
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""The benchmarks of xotl.tools.
+
+Each function prepares the data of a benchmark and returns the callable to
+time.  See `xotl.tools.benchmark.benchmark`:func:.
+
+"""
+
+from xotl.tools.benchmark import benchmark
+
+
+# collections
+
+
+@benchmark("collections.opendict.getattr")
+def _opendict_getattr():
+    """Get a key as an attribute of an opendict with 1000 keys."""
+    from xotl.tools.future.collections import opendict
+
+    data = opendict({"key%d" % i: i for i in range(1000)})
+    return lambda: data.key500
+
+
+@benchmark("collections.stackeddict.levels")
+def _stackeddict_levels():
+    """Push a level, set a key and pop the level of a StackedDict."""
+    from xotl.tools.future.collections import StackedDict
+
+    data = StackedDict({"key%d" % i: i for i in range(100)})
+
+    def run():
+        data.push_level(key=1)
+        data["other"] = 2
+        data.pop_level()
+
+    return run
+
+
+@benchmark("collections.cachedict.lru")
+def _cachedict_lru():
+    """Get and set keys of a full LRU CacheDict."""
+    from xotl.tools.future.collections import CacheDict
+
+    cache = CacheDict(maxsize=100)
+    keys = list(range(150))
+
+    def run():
+        for key in keys:
+            if cache.get(key) is None:
+                cache[key] = key
+
+    return run
+
+
+@benchmark("collections.pascalset.union")
+def _pascalset_union():
+    """Union of two PascalSets of sparse ranges."""
+    from xotl.tools.future.collections import PascalSet
+
+    one, two = PascalSet(range(0, 10000, 3)), PascalSet(range(0, 10000, 5))
+    return lambda: one | two
+
+
+@benchmark("collections.pascalset.contains")
+def _pascalset_contains():
+    """Membership in a PascalSet."""
+    from xotl.tools.future.collections import PascalSet
+
+    data = PascalSet(range(0, 10000, 3))
+    return lambda: 5001 in data
+
+
+# context
+
+
+@benchmark("context.enter")
+def _context_enter():
+    """Enter and exit a context without data."""
+    from xotl.tools.context import context
+
+    def run():
+        with context("BENCHMARK"):
+            pass
+
+    return run
+
+
+@benchmark("context.enter_data")
+def _context_enter_data():
+    """Enter and exit a context with data."""
+    from xotl.tools.context import context
+
+    def run():
+        with context("BENCHMARK", value=1):
+            pass
+
+    return run
+
+
+@benchmark("context.lookup")
+def _context_lookup():
+    """Look up a context that is not active."""
+    from xotl.tools.context import context
+
+    return lambda: context["BENCHMARK"]
+
+
+@benchmark("context.task_context.enter")
+def _task_context_enter():
+    """Enter and exit a task context with data."""
+    from xotl.tools.context import task_context
+
+    def run():
+        with task_context("BENCHMARK", value=1):
+            pass
+
+    return run
+
+
+# coercers
+
+
+@benchmark("coercers.int")
+def _coercers_int():
+    """Coerce a string to an integer."""
+    from xotl.tools.values import int_coerce
+
+    return lambda: int_coerce("1024")
+
+
+@benchmark("coercers.iterable")
+def _coercers_iterable():
+    """Coerce a list of 100 strings to integers."""
+    from xotl.tools.values import int_coerce, iterable
+
+    coerce = iterable(int_coerce)
+    data = [str(i) for i in range(100)]
+    return lambda: coerce(data)
+
+
+@benchmark("coercers.compose")
+def _coercers_compose():
+    """A composed coercer."""
+    from xotl.tools.values import compose, identifier_coerce, istype
+
+    coerce = compose(istype(str), identifier_coerce)
+    return lambda: coerce("some_identifier")
+
+
+# datetime spans
+
+
+@benchmark("datetime.timespan.new")
+def _timespan_new():
+    """Create a TimeSpan from dates."""
+    from datetime import date
+    from xotl.tools.future.datetime import TimeSpan
+
+    start, end = date(2020, 1, 1), date(2020, 12, 31)
+    return lambda: TimeSpan(start, end)
+
+
+@benchmark("datetime.timespan.trusted")
+def _timespan_trusted():
+    """Create a TimeSpan from dates, without checking them."""
+    from datetime import date
+    from xotl.tools.future.datetime import TimeSpan
+
+    start, end = date(2020, 1, 1), date(2020, 12, 31)
+    return lambda: TimeSpan.from_trusted(start, end)
+
+
+@benchmark("datetime.timespan.parse")
+def _timespan_parse():
+    """Create a TimeSpan from strings."""
+    from xotl.tools.future.datetime import TimeSpan
+
+    return lambda: TimeSpan("2020-01-01", "2020-12-31")
+
+
+@benchmark("datetime.timespan.intersection")
+def _timespan_intersection():
+    """Intersect two TimeSpans."""
+    from xotl.tools.future.datetime import TimeSpan
+
+    one = TimeSpan("2020-01-01", "2020-06-30")
+    two = TimeSpan("2020-03-01", "2020-12-31")
+    return lambda: one & two
+
+
+@benchmark("datetime.timespanset.union")
+def _timespanset_union():
+    """Union of two TimeSpanSets of 1000 spans each."""
+    from datetime import date, timedelta
+    from xotl.tools.future.datetime import TimeSpan, TimeSpanSet
+
+    day = date(2000, 1, 1)
+
+    def spans(step, length):
+        for i in range(0, 1000 * step, step):
+            yield TimeSpan(day + timedelta(i), day + timedelta(i + length))
+
+    one, two = TimeSpanSet(spans(3, 1)), TimeSpanSet(spans(5, 2))
+    return lambda: one | two
+
+
+@benchmark("datetime.timespanset.contains")
+def _timespanset_contains():
+    """Membership of a date in a TimeSpanSet of 1000 spans."""
+    from datetime import date, timedelta
+    from xotl.tools.future.datetime import TimeSpan, TimeSpanSet
+
+    day = date(2000, 1, 1)
+    data = TimeSpanSet(
+        TimeSpan(day + timedelta(i), day + timedelta(i + 1))
+        for i in range(0, 3000, 3)
+    )
+    target = day + timedelta(1501)
+    return lambda: target in data
+
+
+@benchmark("datetime.datetimespan.new")
+def _datetimespan_new():
+    """Create a DateTimeSpan from datetimes."""
+    from datetime import datetime
+    from xotl.tools.future.datetime import DateTimeSpan
+
+    start, end = datetime(2020, 1, 1, 8), datetime(2020, 1, 1, 17)
+    return lambda: DateTimeSpan(start, end)
+
+
+# dim
+
+
+@benchmark("dim.add")
+def _dim_add():
+    """Add quantities of the same dimension."""
+    from xotl.tools.dim.base import m
+
+    one, two = 3 * m, 2 * m
+    return lambda: one + two
+
+
+@benchmark("dim.divide")
+def _dim_divide():
+    """Divide quantities of different dimensions."""
+    from xotl.tools.dim.base import m, s
+
+    distance, time = 100 * m, 9.58 * s
+    return lambda: distance / time
+
+
+@benchmark("dim.compare")
+def _dim_compare():
+    """Compare quantities."""
+    from xotl.tools.dim.base import m
+
+    one, two = 3 * m, 2 * m
+    return lambda: one < two
+
+
+# fs
+
+
+@benchmark("fs.iter_files")
+def _fs_iter_files():
+    """Walk a tree of 10 directories with 20 files each."""
+    import os
+    from tempfile import TemporaryDirectory
+    from xotl.tools.fs import iter_files
+
+    tmp = TemporaryDirectory(prefix="xotl-benchmark-")
+    for i in range(10):
+        path = os.path.join(tmp.name, "dir%d" % i)
+        os.mkdir(path)
+        for j in range(20):
+            open(os.path.join(path, "file%d.txt" % j), "w").close()
+
+    def run():
+        # The closure keeps the directory alive.
+        return sum(1 for _ in iter_files(tmp.name, shell_pattern="*.txt"))
+
+    return run
+
+
+# string
+
+
+@benchmark("string.slugify")
+def _string_slugify():
+    """Slugify a short text with non-ascii characters."""
+    from xotl.tools.string import slugify
+
+    return lambda: slugify("Café con leche, ¿y tú?")
@@ -12,7 +12,15 @@
 from xotl.tools.tasking import local
 from xotl.tools.future.collections import StackedDict, Mapping
 
-__all__ = ("Context", "context", "NullContext")
+__all__ = (
+    "Context",
+    "context",
+    "NullContext",
+    "TaskContext",
+    "task_context",
+    "ContextSnapshot",
+    "capture_contexts",
+)
 
 
 class LocalData(local):
@@ -94,17 +102,26 @@ class Context(StackedDict, metaclass=MetaContext):
         ...
         RuntimeError: Entering the same context level twice! ...
 
+    Entering a context without data (as a flag) doesn't push a data level
+    until the context is modified, so nested flags are cheap.  `level` still
+    counts every level, with or without data.
+
     """
 
-    __slots__ = ("name", "count")
+    __slots__ = ("name", "count", "_pending", "_owners")
 
     def __new__(cls, name, **data):
         self = cls[name]
         if not self:  # if self is _null_context:
             self = super().__new__(cls)
             super(Context, self).__init__()
-            self.name = name
-            self.count = 0
+            # Internal slots are set directly to avoid the look-up of keys in
+            # `OpenDictMixin.__setattr__`.
+            set_slot = object.__setattr__
+            set_slot(self, "name", name)
+            set_slot(self, "count", 0)  # number of entered levels
+            set_slot(self, "_pending", 0)  # created but not entered levels
+            set_slot(self, "_owners", [])  # entered levels with data
             # TODO: Redefine all event management
         return self(**data)
 
@@ -154,7 +171,10 @@ class Context(StackedDict, metaclass=MetaContext):
 
     def __call__(self, **data):
         """Allow re-enter in a new level to an already assigned context."""
-        self.push_level(**data)
+        object.__setattr__(self, "_pending", self._pending + 1)
+        if data:
+            self._owners.append(self.count + self._pending)
+            self.push_level(**data)
         return self
 
     def __nonzero__(self):
@@ -163,27 +183,349 @@ class Context(StackedDict, metaclass=MetaContext):
     __bool__ = __nonzero__
 
     def __enter__(self):
-        if self.count == 0:
-            _data.contexts[self.name] = self
-        if self.count + 1 == self.level:
-            self.count += 1
+        if self._pending == 1:
+            count = self.count + 1
+            set_slot = object.__setattr__
+            set_slot(self, "_pending", 0)
+            set_slot(self, "count", count)
+            if count == 1:
+                _data.contexts[self.name] = self
             return self
         else:
             msg = "Entering the same context level twice! -- c(%s, %d, %d)"
             raise RuntimeError(msg % (self.name, self.count, self.level))
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.count -= 1
-        if self.count == 0:
+        count = self.count
+        owners = self._owners
+        if owners and owners[-1] == count:
+            owners.pop()
+            self.pop_level()
+        object.__setattr__(self, "count", count - 1)
+        if count == 1:
             del _data.contexts[self.name]
-        self.pop_level()
         return False
 
+    def __setitem__(self, key, value):
+        self._own_level()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._own_level()
+        super().__delitem__(key)
+
+    @property
+    def level(self):
+        """The number of levels of the context, with or without data."""
+        return self.count + self._pending
+
+    @property
+    def _data_level(self):
+        """The number of data levels, at most `level`:attr:."""
+        return len(self.inner.maps) - 1
+
+    def _own_level(self):
+        """Ensure the innermost level has its own data level.
+
+        Levels entered without data don't push a data level until they are
+        modified.
+
+        """
+        owner = self.count + self._pending
+        owners = self._owners
+        if not owners or owners[-1] != owner:
+            self.push_level()
+            owners.append(owner)
+
+    def _levels(self):
+        """Return the data of each entered level (outermost first)."""
+        maps, top = self.inner.maps, self._data_level - 1
+        data = {owner: maps[top - i] for i, owner in enumerate(self._owners)}
+        return tuple(dict(data.get(i, ())) for i in range(1, self.count + 1))
+
 
 # A simple alias for Context
 context = Context
 
 
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+
+    class ContextVar:
+        """A minimal thread-local replacement of `contextvars.ContextVar`."""
+
+        def __init__(self, name, *, default):
+            self.name = name
+            self._default = default
+            self._local = local()
+
+        def get(self):
+            return getattr(self._local, "value", self._default)
+
+        def set(self, value):
+            res = self.get()
+            self._local.value = value
+            return res
+
+        def reset(self, token):
+            self._local.value = token
+
+
+# Mapping from names to the innermost level of each active task context.
+# These mappings are never modified, entering a level sets a new one.
+_task_contexts = ContextVar("xotl.tools.context", default={})
+
+
+class MetaTaskContext(type(Mapping)):  # type: ignore
+    def __len__(self):
+        return len(_task_contexts.get())
+
+    def __iter__(self):
+        return iter(_task_contexts.get())
+
+    def __getitem__(self, name):
+        return _task_contexts.get().get(name, _null_context)
+
+    def __contains__(self, name):
+        """Basic support for the 'A in context' idiom."""
+        return name in _task_contexts.get()
+
+
+class TaskContext(Mapping, metaclass=MetaTaskContext):
+    """An execution context manager isolated in threads and asyncio tasks.
+
+    This is like `Context`:class:, but the active contexts are kept in a
+    `contextvars.ContextVar`:class: instead of a thread-local.  Tasks (and
+    callables run with `contextvars.Context.run`:meth:) see the contexts
+    active when they were created, and contexts they enter are not seen
+    outside them::
+
+        >>> import asyncio
+        >>> async def job(i):
+        ...     with task_context('JOB', i=i):
+        ...         await asyncio.sleep(0)
+        ...         return task_context['JOB']['i']
+
+        >>> async def main():
+        ...     with task_context('JOB', i=None):
+        ...         return await asyncio.gather(*(job(i) for i in range(3)))
+
+        >>> asyncio.run(main())
+        [0, 1, 2]
+
+    Each level is an immutable snapshot: a mapping with the data of the
+    enclosing levels updated with the data given when the level is created.
+    Unlike `Context`:class:, entering the same context again returns a new
+    object::
+
+        >>> with task_context('A', b=1) as a1:
+        ...   with task_context('A', b=2) as a2:
+        ...       print(a1 is a2, a2['b'])
+        ...   print(a1['b'], task_context['A'] is a1)
+        False 2
+        1 True
+
+    Since levels are immutable, they can be shared among tasks or threads
+    without locks.
+
+    Only the enclosing levels active when the new level is created are taken
+    into account; create the level in the same ``with`` statement that enters
+    it.
+
+    Available on Python 3.7+ (which has `contextvars`:mod:).  In older
+    versions contexts are only isolated in threads.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("name", "parent", "_data", "_token")
+
+    def __init__(self, name, **data):
+        self.name = name
+        self.parent = parent = type(self)[name] or None
+        if parent is not None and data:
+            self._data = dict(parent._data, **data)
+        elif parent is not None:
+            self._data = parent._data
+        else:
+            self._data = data
+        self._token = None
+
+    @classmethod
+    def from_dicts(cls, ctx, overrides=None, defaults=None):
+        """Creates a context introducing both defaults and overrides.
+
+        See `Context.from_dicts`:meth:.
+
+        """
+        attrs = dict(defaults or {})
+        attrs.update(cls[ctx])
+        attrs.update(overrides or {})
+        return cls(ctx, **attrs)
+
+    @classmethod
+    def from_defaults(cls, ctx, **defaults):
+        """Creates context `ctx` introducing only new keys given in `defaults`.
+
+        See `Context.from_defaults`:meth:.
+
+        """
+        return cls.from_dicts(ctx, defaults=defaults)
+
+    @property
+    def level(self):
+        """The number of enclosing levels of the same context."""
+        res, parent = 1, self.parent
+        while parent is not None:
+            res, parent = res + 1, parent.parent
+        return res
+
+    def __repr__(self):
+        return "%s(%r, **%r)" % (type(self).__name__, self.name, self._data)
+
+    def __bool__(self):
+        # Active (or just created) levels are true even without data.
+        return True
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __getattr__(self, name):
+        try:
+            return self._data[name]
+        except KeyError:
+            msg = "'%s' object has no attribute '%s'"
+            raise AttributeError(msg % (type(self).__name__, name)) from None
+
+    def __enter__(self):
+        if self._token is None:
+            contexts = dict(_task_contexts.get())
+            contexts[self.name] = self
+            self._token = _task_contexts.set(contexts)
+            return self
+        else:
+            msg = "Entering the same context level twice! -- c(%s, %d)"
+            raise RuntimeError(msg % (self.name, self.level))
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        token, self._token = self._token, None
+        _task_contexts.reset(token)
+        return False
+
+    def __reduce__(self):
+        # The token of an entered level can't be pickled.
+        args = (type(self), self.name, self.parent, self._data)
+        return _rebuild_task_context, args
+
+
+def _rebuild_task_context(cls, name, parent, data):
+    res = object.__new__(cls)
+    res.name, res.parent, res._data, res._token = name, parent, data, None
+    return res
+
+
+# A simple alias for TaskContext
+task_context = TaskContext
+
+
+class ContextSnapshot:
+    """The active contexts of a thread or task; see `capture_contexts`:func:.
+
+    :attr contexts: A tuple of pairs ``(name, levels)`` for each active
+          `context`:class:, where `levels` is a tuple with a copy of the data
+          of each entered level (outermost first).
+
+    :attr task_contexts: The mapping from names to the innermost level of
+          each active `task_context`:class:.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("contexts", "task_contexts")
+
+    def __init__(self, contexts=(), task_contexts=None):
+        self.contexts = contexts
+        self.task_contexts = task_contexts or {}
+
+    def __bool__(self):
+        return bool(self.contexts or self.task_contexts)
+
+    def __reduce__(self):
+        return type(self), (self.contexts, self.task_contexts)
+
+    def restore(self):
+        """Enter the captured contexts in the current thread or task.
+
+        Return an `~contextlib.ExitStack`:class: which exits them, so this can
+        be used in a ``with`` statement::
+
+            >>> with context('A', a=1):
+            ...     snapshot = capture_contexts()
+            >>> with snapshot.restore():
+            ...     print(context['A']['a'])
+            1
+
+        Captured levels of `context`:class: are pushed on top of the current
+        ones.  Captured `task_context`:class: levels replace the current ones.
+
+        """
+        from contextlib import ExitStack
+
+        res = ExitStack()
+        try:
+            for name, levels in self.contexts:
+                for data in levels:
+                    ctx = Context(name)
+                    ctx.update(data)
+                    res.enter_context(ctx)
+            if self.task_contexts:
+                token = _task_contexts.set(self.task_contexts)
+                res.callback(_task_contexts.reset, token)
+        except BaseException:
+            res.close()
+            raise
+        return res
+
+    def run(*args, **kwargs):
+        """Call `fn` with the captured contexts entered.
+
+        Signature: ``run(fn, *args, **kwargs)``.  `fn` is positional-only,
+        so it may be the name of a keyword argument of the callable.
+
+        """
+        if len(args) < 2:
+            raise TypeError("run() missing the callable argument")
+        self, fn, *args = args
+        with self.restore():
+            return fn(*args, **kwargs)
+
+
+def capture_contexts():
+    """Return a `ContextSnapshot`:class: of the active contexts.
+
+    This allows to run code in other threads (or processes, if the data can
+    be pickled) with the same contexts.  See
+    `xotl.tools.tasking.executors`:mod:.
+
+    .. versionadded:: 2.1.11
+
+    """
+    contexts = tuple((name, ctx._levels()) for name, ctx in _data.contexts.items())
+    return ContextSnapshot(contexts, _task_contexts.get())
+
+
 class NullContext(Mapping):
     """Singleton context to be used (returned) as default when no one is
     defined.
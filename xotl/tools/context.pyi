@@ -1,7 +1,16 @@
-from typing import Any, Dict, ContextManager, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from typing_extensions import Protocol
 
 C = TypeVar("C")
+T = TypeVar("T")
 
 class _ContextData(Dict[str, Any]): ...
 
@@ -11,3 +20,19 @@ class _ContextProtocol(Protocol[C]):
 
 context: _ContextProtocol
 Context: _ContextProtocol
+task_context: _ContextProtocol
+TaskContext: _ContextProtocol
+
+class ContextSnapshot:
+    contexts: Tuple[Tuple[Any, Tuple[Dict[str, Any], ...]], ...]
+    task_contexts: Dict[Any, Any]
+    def __init__(
+        self,
+        contexts: Tuple[Tuple[Any, Tuple[Dict[str, Any], ...]], ...] = ...,
+        task_contexts: Optional[Dict[Any, Any]] = ...,
+    ) -> None: ...
+    def __bool__(self) -> bool: ...
+    def restore(self) -> ContextManager[Any]: ...
+    def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T: ...
+
+def capture_contexts() -> ContextSnapshot: ...
@@ -0,0 +1,387 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Containers for a chunk of ``2**16`` integers of a roaring bit-set.
+
+This is an internal module of
+`~xotl.tools.future.collections.RoaringPascalSet`:class:.  Each container
+stores the lower 16 bits of the members in a chunk using one of three
+representations:
+
+- `ArrayContainer`:class: -- a sorted ``array('H')``, for sparse chunks of
+  up to `ARRAY_LIMIT`:data: members.
+
+- `BitmapContainer`:class: -- a bitmap of 8 KiB (stored as a Python integer)
+  for dense chunks.
+
+- `RunContainer`:class: -- a flat sorted ``array('H')`` of run limits
+  (``[start1, end1, start2, end2, ...]``) for chunks with long runs of
+  consecutive members.
+
+Binary operations return a new container (or None if the result is empty)
+using the representation that takes less memory; `add` and `discard` modify
+the container in place and return the container that must be stored from
+then on.
+
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+CHUNK_BITS = 16
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+#: Maximum number of members of an array container.
+ARRAY_LIMIT = 4096
+
+#: Size (in bytes) of a bitmap container.
+BITMAP_SIZE = (1 << CHUNK_BITS) // 8
+
+
+try:
+    _popcount = int.bit_count  # type: ignore  # Python 3.10+
+except AttributeError:
+
+    def _popcount(value):
+        return bin(value).count("1")
+
+
+# Positions of the bits set in each possible byte.
+_BYTE_BITS = tuple(tuple(i for i in range(8) if b >> i & 1) for b in range(256))
+
+
+def positions(bits):
+    """Yield the positions of the bits set in a chunk bitmap."""
+    data = bits.to_bytes(BITMAP_SIZE, "little")
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            for i in _BYTE_BITS[byte]:
+                yield base + i
+
+
+def from_bits(bits):
+    """Return the most compact container for a chunk bitmap.
+
+    Return None if `bits` is empty.
+
+    """
+    if bits:
+        card = _popcount(bits)
+        runs = _popcount(bits & ~(bits << 1))
+        if 4 * runs < min(2 * card, BITMAP_SIZE):
+            starts = positions(bits & ~(bits << 1))
+            ends = positions(bits & ~(bits >> 1))
+            res = array("H")
+            for start, end in zip(starts, ends):
+                res.append(start)
+                res.append(end)
+            return RunContainer(res)
+        elif card <= ARRAY_LIMIT:
+            return ArrayContainer(array("H", positions(bits)))
+        else:
+            return BitmapContainer(bits, card)
+    else:
+        return None
+
+
+def from_values(values):
+    """Return the most compact container for sorted unique `values`.
+
+    Return None if `values` is empty.
+
+    """
+    card = len(values)
+    if card:
+        runs = 1 + sum(1 for i in range(1, card) if values[i] != values[i - 1] + 1)
+        if 4 * runs < min(2 * card, BITMAP_SIZE):
+            res = array("H", (values[0],))
+            for i in range(1, card):
+                if values[i] != values[i - 1] + 1:
+                    res.append(values[i - 1])
+                    res.append(values[i])
+            res.append(values[-1])
+            return RunContainer(res)
+        elif card <= ARRAY_LIMIT:
+            return ArrayContainer(array("H", values))
+        else:
+            return BitmapContainer(_values_to_bits(values), card)
+    else:
+        return None
+
+
+def from_range(start, end):
+    """Return a container with all values from `start` to `end` (included)."""
+    return RunContainer(array("H", (start, end)))
+
+
+def _values_to_bits(values):
+    res = bytearray(BITMAP_SIZE)
+    for value in values:
+        res[value >> 3] |= 1 << (value & 7)
+    return int.from_bytes(res, "little")
+
+
+class Container:
+    """Base class for chunk containers."""
+
+    __slots__ = ()
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        raise NotImplementedError
+
+    def __contains__(self, value):
+        raise NotImplementedError
+
+    def bits(self):
+        """Return the chunk bitmap as an integer."""
+        raise NotImplementedError
+
+    def copy(self):
+        raise NotImplementedError
+
+    def add(self, value):
+        raise NotImplementedError
+
+    def discard(self, value):
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        if type(self) is type(other) and self._data() == other._data():
+            return True
+        else:
+            return len(self) == len(other) and self.bits() == other.bits()
+
+    __hash__ = None  # type: ignore
+
+    def __or__(self, other):
+        return from_bits(self.bits() | other.bits())
+
+    def __and__(self, other):
+        return from_bits(self.bits() & other.bits())
+
+    def __sub__(self, other):
+        return from_bits(self.bits() & ~other.bits())
+
+    def __xor__(self, other):
+        return from_bits(self.bits() ^ other.bits())
+
+    def issubset(self, other):
+        return not self.bits() & ~other.bits()
+
+    def isdisjoint(self, other):
+        return not self.bits() & other.bits()
+
+    def _data(self):
+        raise NotImplementedError
+
+
+class ArrayContainer(Container):
+    """Container with a sorted array of members."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __contains__(self, value):
+        l = self.values
+        idx = bisect_left(l, value)
+        return idx < len(l) and l[idx] == value
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.values.__sizeof__()
+
+    def bits(self):
+        return _values_to_bits(self.values)
+
+    def copy(self):
+        return ArrayContainer(array("H", self.values))
+
+    def add(self, value):
+        if value not in self:
+            l = self.values
+            if len(l) < ARRAY_LIMIT:
+                insort(l, value)
+            else:
+                return BitmapContainer(self.bits() | (1 << value), len(l) + 1)
+        return self
+
+    def discard(self, value):
+        l = self.values
+        idx = bisect_left(l, value)
+        if idx < len(l) and l[idx] == value:
+            del l[idx]
+        return self if l else None
+
+    def __or__(self, other):
+        if isinstance(other, ArrayContainer):
+            return from_values(sorted(set(self.values).union(other.values)))
+        else:
+            return super().__or__(other)
+
+    def __and__(self, other):
+        if isinstance(other, ArrayContainer):
+            aux = set(self.values).intersection(other.values)
+            return from_values(sorted(aux))
+        else:
+            return from_values([i for i in self.values if i in other])
+
+    def __sub__(self, other):
+        if isinstance(other, ArrayContainer):
+            aux = set(self.values).difference(other.values)
+            return from_values(sorted(aux))
+        else:
+            return from_values([i for i in self.values if i not in other])
+
+    def __xor__(self, other):
+        if isinstance(other, ArrayContainer):
+            aux = set(self.values).symmetric_difference(other.values)
+            return from_values(sorted(aux))
+        else:
+            return super().__xor__(other)
+
+    def issubset(self, other):
+        return all(i in other for i in self.values)
+
+    def isdisjoint(self, other):
+        return not any(i in other for i in self.values)
+
+    def _data(self):
+        return self.values
+
+
+class BitmapContainer(Container):
+    """Container with a bitmap of ``2**16`` bits."""
+
+    __slots__ = ("bitmap", "count")
+
+    def __init__(self, bitmap, count=None):
+        self.bitmap = bitmap
+        self.count = _popcount(bitmap) if count is None else count
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return positions(self.bitmap)
+
+    def __contains__(self, value):
+        return bool(self.bitmap >> value & 1)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.bitmap.__sizeof__()
+
+    def bits(self):
+        return self.bitmap
+
+    def copy(self):
+        return BitmapContainer(self.bitmap, self.count)
+
+    def add(self, value):
+        if value not in self:
+            self.bitmap |= 1 << value
+            self.count += 1
+        return self
+
+    def discard(self, value):
+        if value in self:
+            self.bitmap ^= 1 << value
+            self.count -= 1
+            if self.count <= ARRAY_LIMIT:
+                return from_bits(self.bitmap)
+        return self
+
+    def _data(self):
+        return self.bitmap
+
+
+class RunContainer(Container):
+    """Container with the limits of runs of consecutive members."""
+
+    __slots__ = ("runs",)
+
+    def __init__(self, runs):
+        self.runs = runs
+
+    def __len__(self):
+        l = self.runs
+        return sum(l[i + 1] - l[i] for i in range(0, len(l), 2)) + len(l) // 2
+
+    def __iter__(self):
+        l = self.runs
+        for i in range(0, len(l), 2):
+            yield from range(l[i], l[i + 1] + 1)
+
+    def __contains__(self, value):
+        l = self.runs
+        idx = bisect_right(l, value)
+        return bool(idx % 2) or (idx > 0 and l[idx - 1] == value)
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.runs.__sizeof__()
+
+    def bits(self):
+        l = self.runs
+        res = 0
+        for i in range(0, len(l), 2):
+            start, end = l[i], l[i + 1]
+            res |= ((1 << (end - start + 1)) - 1) << start
+        return res
+
+    def copy(self):
+        return RunContainer(array("H", self.runs))
+
+    def add(self, value):
+        # Same algorithm as `PascalSet._insert`.
+        l = self.runs
+        start = end = value
+        lo = bisect_left(l, start - 1)
+        hi = bisect_right(l, end + 1)
+        if lo % 2:
+            lo -= 1
+            start = l[lo]
+        elif lo < hi and l[lo] < start:
+            start = l[lo]
+        if hi % 2:
+            end = l[hi]
+            hi += 1
+        elif lo < hi and l[hi - 1] > end:
+            end = l[hi - 1]
+        l[lo:hi] = array("H", (start, end))
+        if 2 * len(l) >= BITMAP_SIZE:
+            return from_bits(self.bits())
+        else:
+            return self
+
+    def discard(self, value):
+        # Same algorithm as `PascalSet._remove`.
+        l = self.runs
+        lo = bisect_left(l, value)
+        hi = bisect_right(l, value)
+        if lo % 2 or hi % 2:
+            aux = ((value - 1,) if lo % 2 else ()) + ((value + 1,) if hi % 2 else ())
+            l[lo:hi] = array("H", aux)
+            if 2 * len(l) >= BITMAP_SIZE:
+                return from_bits(self.bits())
+        elif lo < hi:
+            del l[lo:hi]
+        return self if l else None
+
+    def _data(self):
+        return self.runs
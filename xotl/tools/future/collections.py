@@ -16,6 +16,7 @@ document all items here.  Refer to `collections`:mod: documentation.
 
 from collections import *  # noqa
 from reprlib import recursive_repr
+from bisect import bisect_left, bisect_right
 
 
 try:
@@ -51,9 +52,23 @@ from collections import (
     _count_elements,
 )
 
+import struct as _struct
+from array import array as _array
+from functools import partial as _partial, lru_cache as _lru_cache
+
 from xotl.tools.deprecation import deprecated  # noqa
 from xotl.tools.symbols import Unset  # noqa
 from xotl.tools.objects import SafeDataItem as safe  # noqa
+from xotl.tools.future import _roaring
+
+
+try:
+    _popcount = int.bit_count  # type: ignore  # Python 3.10+
+except AttributeError:
+
+    def _popcount(value):
+        """Return the number of bits set in a non-negative integer."""
+        return bin(value).count("1")
 
 
 class safe_dict_iter(tuple):
@@ -79,6 +94,10 @@ class safe_dict_iter(tuple):
       >>> [k for k in di]
       [3, 5]
 
+    All keys are copied up front.  Mappings that control their own
+    modifications can avoid the copy, see how `StackedDict`:class: iterates
+    over a copy-on-write snapshot.
+
     """
 
     def __new__(cls, mapping):
@@ -123,6 +142,20 @@ class safe_dict_iter(tuple):
                 yield (key, self._mapping[key])
 
 
+def _snapshot_iter(data, readers):
+    """Iterate over `data` shared with a copy-on-write owner.
+
+    `readers` is a one-item list with the number of live iterators over
+    `data`; while it's not zero the owner must copy `data` before modifying
+    it.
+
+    """
+    try:
+        yield from data
+    finally:
+        readers[0] -= 1
+
+
 class defaultdict(_stdlib.defaultdict):
     """A hack for ``collections.defaultdict`` that passes the key and a copy of
     self as a plain dict (to avoid infinity recursion) to the callable.
@@ -164,6 +197,25 @@ class defaultdict(_stdlib.defaultdict):
             raise KeyError(key)
 
 
+# Keys of the cache of `OpenDictMixin`.
+_INVERTED_MAPPING = "mapping"
+_INVERTED_IDENTIFIERS = "identifiers"
+_INVERTED_COLLISIONS = "collisions"
+
+
+@_lru_cache(maxsize=1024, typed=True)
+def _key2identifier(key):
+    # TODO: Improve this in order to obtain a full-mapping.  For example,
+    # the corresponding attribute names for the keys ``'-x-y'`` and
+    # ``'x-y'`` are the same, in that case only one will be returning.
+    from xotl.tools.keywords import suffix_kwd
+    from xotl.tools.string import slugify
+    from xotl.tools.validators import is_valid_identifier
+
+    res = key if is_valid_identifier(key) else slugify(key, "_")
+    return suffix_kwd(res)
+
+
 class OpenDictMixin:
     """A mixin for mappings implementation that expose keys as attributes.
 
@@ -232,14 +284,16 @@ class OpenDictMixin:
     def __getattr__(self, name):
         from xotl.tools.future.inspect import get_attr_value
 
-        _mark = object()
-        res = get_attr_value(self, name, _mark)
-        if res is not _mark:
-            return res
+        # This is only called after the normal look-up fails, so it's
+        # unlikely that `get_attr_value` finds anything; check keys first.
+        key = (~self).get(name)
+        if key:
+            return self[key]
         else:
-            key = (~self).get(name)
-            if key:
-                return self[key]
+            _mark = object()
+            res = get_attr_value(self, name, _mark)
+            if res is not _mark:
+                return res
             else:
                 msg = "'%s' object has no attribute '%s'"
                 raise AttributeError(msg % (type(self).__name__, name))
@@ -265,6 +319,36 @@ class OpenDictMixin:
         else:
             super().__delattr__(name)
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._inverted_add(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._inverted_discard(key)
+
+    # Methods of `dict` that don't use `__setitem__` or `__delitem__`.  Keys
+    # added by `update` are detected by `__invert__` comparing lengths.
+
+    def setdefault(self, key, default=None):
+        res = super().setdefault(key, default)
+        self._inverted_add(key)
+        return res
+
+    def pop(self, key, *args):
+        res = super().pop(key, *args)
+        self._inverted_discard(key)
+        return res
+
+    def popitem(self):
+        res = key, _value = super().popitem()
+        self._inverted_discard(key)
+        return res
+
+    def clear(self):
+        super().clear()
+        self._inverted_reset()
+
     def __invert__(self):
         """Return an inverted mapping between key and attribute names.
 
@@ -277,35 +361,78 @@ class OpenDictMixin:
         Several keys could have the same identifier, only one will be valid and
         used.
 
+        The mapping is maintained incrementally when keys are set or deleted.
+        It's fully recomputed only when keys are added in bulk (for example,
+        with `update`), reusing the identifiers already computed.
+
         To obtain this mapping you can use as the unary operator "~".
 
         """
-        KEY_LENGTH = "length"
-        KEY_MAPPING = "mapping"
         cache = self._cache
-        cached_length = cache.setdefault(KEY_LENGTH, 0)
-        length = len(self)
-        if cached_length != length:
-            cache[KEY_LENGTH] = length
-            aux = ((self._key2identifier(k), k) for k in self)
-            res = {key: attr for key, attr in aux if key}
-            cache[KEY_MAPPING] = res
-        else:
-            res = cache.get(KEY_MAPPING)
-            if res is None:
-                assert cached_length == 0
-                res = {}
-                cache[KEY_MAPPING] = res
+        res = cache.get(_INVERTED_MAPPING)
+        if res is None or len(cache[_INVERTED_IDENTIFIERS]) != len(self):
+            res = self._inverted_rebuild(cache)
+        return res
+
+    def _inverted_rebuild(self, cache):
+        """Recompute the inverted mapping, stored in `cache`."""
+        memo = cache.get(_INVERTED_IDENTIFIERS) or {}
+        identifiers = {}
+        res = {}
+        collisions = False
+        for key in self:
+            attr = memo.get(key, Unset)
+            if attr is Unset:
+                attr = self._key2identifier(key)
+            identifiers[key] = attr
+            if attr:
+                collisions = collisions or attr in res
+                res[attr] = key
+        cache[_INVERTED_IDENTIFIERS] = identifiers
+        cache[_INVERTED_COLLISIONS] = collisions
+        cache[_INVERTED_MAPPING] = res
         return res
 
+    def _inverted_add(self, key):
+        """Update the inverted mapping after `key` is set."""
+        cache = self._cache
+        res = cache.get(_INVERTED_MAPPING)
+        if res is not None:
+            identifiers = cache[_INVERTED_IDENTIFIERS]
+            if key not in identifiers:
+                attr = identifiers[key] = self._key2identifier(key)
+                if attr:
+                    # New keys are the last ones in iteration order, so they
+                    # win any collision like in a full computation.
+                    if attr in res:
+                        cache[_INVERTED_COLLISIONS] = True
+                    res[attr] = key
+
+    def _inverted_discard(self, key):
+        """Update the inverted mapping after `key` is deleted."""
+        cache = self._cache
+        res = cache.get(_INVERTED_MAPPING)
+        if res is not None:
+            attr = cache[_INVERTED_IDENTIFIERS].pop(key, None)
+            if attr and res.get(attr) == key:
+                if cache[_INVERTED_COLLISIONS]:
+                    # Another key could have the same identifier.
+                    self._inverted_reset()
+                else:
+                    del res[attr]
+
+    def _inverted_reset(self):
+        """Force the inverted mapping to be recomputed."""
+        self._cache.pop(_INVERTED_MAPPING, None)
+
     @property
     def _cache(self):
-        from xotl.tools.future.inspect import get_attr_value
-
+        name = type(self).__cache_name__
         try:
-            return get_attr_value(self, type(self).__cache_name__)
+            return object.__getattribute__(self, name)
         except AttributeError:
-            res = setattr(self, type(self).__cache_name__, dict())
+            res = dict()
+            object.__setattr__(self, name, res)
             return res
 
     @staticmethod
@@ -316,16 +443,11 @@ class OpenDictMixin:
         This function must return a valid identifier or None if the conversion
         is not possible.
 
-        """
-        # TODO: Improve this in order to obtain a full-mapping.  For example,
-        # the corresponding attribute names for the keys ``'-x-y'`` and
-        # ``'x-y'`` are the same, in that case only one will be returning.
-        from xotl.tools.keywords import suffix_kwd
-        from xotl.tools.string import slugify
-        from xotl.tools.validators import is_valid_identifier
+        The default implementation caches the identifiers for the most recently
+        used keys.
 
-        res = key if is_valid_identifier(key) else slugify(key, "_")
-        return suffix_kwd(res)
+        """
+        return _key2identifier(key)
 
 
 class SmartDictMixin:
@@ -525,13 +647,22 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
 
     Setting the value for key, sets it in the current level.
 
+    Besides the levels, a flattened view with the visible value of each key
+    is kept updated by every change, so lookups and `len` don't depend on
+    the number of levels.  Because of this, levels must not be modified
+    directly through the `inner` chain map.
+
     .. versionchanged:: 1.5.2 Based on the newly introduced `ChainMap`:class:.
 
+    .. versionchanged:: 2.1.11 Keep a flattened view of all levels.
+
     """
 
     __slots__ = (
         safe.slot("inner", ChainMap),
         safe.slot(OpenDictMixin.__cache_name__, dict),
+        "_flat",
+        "_readers",
     )
 
     def __init__(*args, **kwargs):
@@ -539,6 +670,11 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         from xotl.tools.params import issue_9137
 
         self, args = issue_9137(args)
+        # Internal slots are set directly, `OpenDictMixin.__setattr__` needs
+        # them to look up keys.
+        set_slot = object.__setattr__
+        set_slot(self, "_flat", {})  # visible value of every key in all levels
+        set_slot(self, "_readers", [0])  # live iterators sharing `_flat`
         self.update(*args, **kwargs)
 
     @property
@@ -607,7 +743,16 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         if self.level > 0:
             stack = self.inner
             res = stack.maps[0]
-            self.inner = stack.parents
+            self.inner = parents = stack.parents
+            flat = self._writable_flat()
+            for key in res:
+                # Keys keep their position in the flattened view, the same
+                # iteration order of the chain map.
+                try:
+                    flat[key] = parents[key]
+                except KeyError:
+                    del flat[key]
+                    self._inverted_discard(key)
             return res
         else:
             raise TypeError("Cannot pop from StackedDict without any levels")
@@ -630,26 +775,50 @@ class StackedDict(OpenDictMixin, SmartDictMixin, MutableMapping):
         return dict(self.inner.maps[0])
 
     def __str__(self):
-        # TODO: Optimize
-        return str(dict(self))
+        return str(dict(self._flat))
 
     def __repr__(self):
         return "%s(%s)" % (type(self).__name__, str(self))
 
     def __len__(self):
-        return len(self.inner)
+        return len(self._flat)
 
     def __iter__(self):
-        return iter(self.inner)
+        # Iterate over a snapshot, so the mapping can be modified meanwhile.
+        # The snapshot shares the flattened view until it's modified.
+        readers = self._readers
+        readers[0] += 1
+        return _snapshot_iter(self._flat, readers)
+
+    def __contains__(self, key):
+        return key in self._flat
 
     def __getitem__(self, key):
-        return self.inner[key]
+        return self._flat[key]
 
     def __setitem__(self, key, value):
         self.inner[key] = value
+        self._writable_flat()[key] = value
+        self._inverted_add(key)
 
     def __delitem__(self, key):
-        del self.inner[key]
+        stack = self.inner
+        del stack[key]
+        flat = self._writable_flat()
+        try:
+            flat[key] = stack.parents[key]
+        except KeyError:
+            del flat[key]
+            self._inverted_discard(key)
+
+    def _writable_flat(self):
+        """Return the flattened view, copying it if iterators share it."""
+        res = self._flat
+        if self._readers[0]:
+            object.__setattr__(self, "_flat", dict(res))
+            object.__setattr__(self, "_readers", [0])
+            res = self._flat
+        return res
 
 
 class RankedDict(SmartDictMixin, dict):
@@ -665,6 +834,12 @@ class RankedDict(SmartDictMixin, dict):
     - Keeps the standard semantics of Python for `popitem`:meth: method
       returning a random pair when called without parameters.
 
+    The precedence order is kept in an `OrderedDict`:class: of keys, so
+    setting, deleting and moving a key don't depend on the size of the
+    mapping.
+
+    .. versionchanged:: 2.1.11 Setting, deleting and moving keys is O(1).
+
     """
 
     def __init__(*args, **kwds):
@@ -684,7 +859,7 @@ class RankedDict(SmartDictMixin, dict):
         try:
             self._ranks
         except AttributeError:
-            self._ranks = []
+            self._ranks = OrderedDict()
         self.update(*args, **kwds)
 
     def rank(self, *keys):
@@ -706,7 +881,7 @@ class RankedDict(SmartDictMixin, dict):
             for key in self:
                 if key not in aux:
                     ranks.append(key)
-            self._ranks = ranks
+            self._ranks = OrderedDict.fromkeys(ranks)
 
     def swap_ranks(self, *args, **kwds):
         """Exchange ranks of given keys.
@@ -742,46 +917,33 @@ class RankedDict(SmartDictMixin, dict):
                   ``self[key] = self[key]``.
 
         """
-        try:
-            ranks = self._ranks
-            if last:
-                if key != ranks[-1]:
-                    ranks.remove(key)
-                    ranks.append(key)
-            else:
-                if key != ranks[0]:
-                    ranks.remove(key)
-                    ranks.insert(0, key)
-        except ValueError:
-            raise KeyError(key)
+        self._ranks.move_to_end(key, last)
 
     def _swap_ranks(self, key1, key2):
         """Protected method to swap a pair of ranks."""
         if key1 in self and key2 in self:
-            ranks = self._ranks
-            idx1, idx2 = ranks.index(key1), ranks.index(key2)
-            if idx1 != idx2:
-                aux = ranks[idx1]
-                ranks[idx1] = ranks[idx2]
-                ranks[idx2] = aux
+            if key1 != key2:
+                # The positions of other keys are kept, so this is linear.
+                ranks = list(self._ranks)
+                idx1, idx2 = ranks.index(key1), ranks.index(key2)
+                ranks[idx1], ranks[idx2] = key2, key1
+                self._ranks = OrderedDict.fromkeys(ranks)
         else:
             raise KeyError("{!r} and/or {!r}".format(key1, key2))
 
     def __setitem__(self, key, value):
         """rd.__setitem__(i, y) <==> rd[i]=y"""
         ranks = self._ranks
-        if key in self:
-            if ranks[-1] != key:
-                ranks.remove(key)
-                ranks.append(key)
+        if key in ranks:
+            ranks.move_to_end(key)
         else:
-            ranks.append(key)
+            ranks[key] = None
         super().__setitem__(key, value)
 
     def __delitem__(self, key):
         """rd.__delitem__(y) <==> del rd[y]"""
         super().__delitem__(key)
-        self._ranks.remove(key)
+        del self._ranks[key]
 
     def __iter__(self):
         """rd.__iter__() <==> iter(rd)"""
@@ -794,7 +956,7 @@ class RankedDict(SmartDictMixin, dict):
     def clear(self):
         """rd.clear() -> None.  Remove all items from rd."""
         super().clear()
-        self._ranks = []
+        self._ranks = OrderedDict()
 
     def popitem(self, index=None):
         """rd.popitem([index]) -> (key, value), return and remove a pair.
@@ -806,9 +968,14 @@ class RankedDict(SmartDictMixin, dict):
 
         """
         if self:
-            if index is None or index is True:
-                index = -1
-            key = self._ranks.pop(index)
+            ranks = self._ranks
+            if index is None or index is True or index == -1:
+                key = ranks.popitem()[0]
+            elif index == 0:
+                key = ranks.popitem(last=False)[0]
+            else:
+                key = list(ranks)[index]
+                del ranks[key]
             return key, super().pop(key)
         else:
             raise KeyError("popitem(): dictionary is empty")
@@ -848,7 +1015,7 @@ class RankedDict(SmartDictMixin, dict):
             if isinstance(other, RankedDict):
                 return self._ranks == other._ranks
             elif isinstance(other, OrderedDict):
-                return self._ranks == list(other)
+                return list(self._ranks) == list(other)
             else:
                 return True
         else:
@@ -877,7 +1044,7 @@ class RankedDict(SmartDictMixin, dict):
             else:
                 raise KeyError(key)
         else:
-            self._ranks.remove(key)
+            del self._ranks[key]
             return res
 
     def setdefault(self, key, default=None):
@@ -942,6 +1109,390 @@ class OrderedSmartDict(SmartDictMixin, OrderedDict):
         self.update(*args, **kwds)
 
 
+CacheInfo = namedtuple(
+    "CacheInfo", "hits misses evictions expirations maxsize currsize memory"
+)
+
+
+class _LRUPolicy:
+    """Evict the least recently used key."""
+
+    __slots__ = ("keys",)
+
+    def __init__(self):
+        self.keys = OrderedDict()
+
+    def add(self, key):
+        self.keys[key] = None
+
+    def touch(self, key):
+        self.keys.move_to_end(key)
+
+    def remove(self, key):
+        del self.keys[key]
+
+    def victim(self):
+        return next(iter(self.keys))
+
+    def clear(self):
+        self.keys.clear()
+
+
+class _FIFOPolicy(_LRUPolicy):
+    """Evict the oldest key, the first to expire."""
+
+    __slots__ = ()
+
+    def touch(self, key):
+        pass
+
+
+class _LFUPolicy:
+    """Evict the least frequently used key.
+
+    Keys with the same frequency are evicted in least recently used order.
+
+    """
+
+    __slots__ = ("freqs", "buckets", "least")
+
+    def __init__(self):
+        self.freqs = {}  # key -> frequency
+        self.buckets = {}  # frequency -> OrderedDict of keys
+        self.least = 0
+
+    def add(self, key):
+        self.freqs[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.least = 1
+
+    def touch(self, key):
+        freq = self.freqs[key]
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if freq == self.least:
+                self.least = freq + 1
+        self.freqs[key] = freq + 1
+        self.buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def remove(self, key):
+        freq = self.freqs.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[freq]
+            if freq == self.least:
+                self.least = min(self.buckets, default=0)
+
+    def victim(self):
+        return next(iter(self.buckets[self.least]))
+
+    def clear(self):
+        self.freqs.clear()
+        self.buckets.clear()
+        self.least = 0
+
+
+_CACHE_POLICIES = {"lru": _LRUPolicy, "lfu": _LFUPolicy, "ttl": _FIFOPolicy}
+
+
+class CacheDict(SmartDictMixin, MutableMapping):  # type: ignore
+    """A thread-safe mapping bounded in size, memory and/or age.
+
+    :param maxsize: The maximum number of items; None for no limit.
+
+    :param policy: Which item to evict when the cache is full: ``'lru'``
+           (the least recently used), ``'lfu'`` (the least frequently used)
+           or ``'ttl'`` (the oldest, i.e, the first to expire).
+
+    :param ttl: Seconds an item lives after being set; None for ever.
+           Expired items are removed lazily.
+
+    :param maxmemory: The maximum total of `sys.getsizeof`:func: of keys and
+           values, in bytes; None for no limit.  This is an approximation
+           since the size of referenced objects is not included.
+
+    :param timer: The function returning the current time in seconds, by
+           default `time.monotonic`:func:.
+
+    Positional arguments are used to initialize the mapping like in
+    `SmartDictMixin.update`:meth:.  Reading an item (``cache[key]`` or
+    ``cache.get(key)``) counts a hit or a miss, and changes the eviction
+    order; membership tests and iteration don't.  See `cache_info`:meth:.
+
+    Example::
+
+       >>> cache = CacheDict(maxsize=2)
+       >>> cache['a'], cache['b'] = 1, 2
+       >>> cache['a']
+       1
+       >>> cache['c'] = 3
+       >>> sorted(cache)
+       ['a', 'c']
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    def __init__(
+        self,
+        *args,
+        maxsize=None,
+        policy="lru",
+        ttl=None,
+        maxmemory=None,
+        timer=None,
+    ):
+        from threading import RLock
+        from time import monotonic
+
+        if policy not in _CACHE_POLICIES:
+            msg = "Invalid cache policy %r, expected one of: %s"
+            raise ValueError(msg % (policy, ", ".join(_CACHE_POLICIES)))
+        if policy == "ttl" and ttl is None:
+            raise ValueError("Cache policy 'ttl' requires a 'ttl' value")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.maxmemory = maxmemory
+        self._timer = timer or monotonic
+        self._lock = RLock()
+        self._data = {}
+        self._policy = _CACHE_POLICIES[policy]()
+        self._deadlines = OrderedDict()  # in insertion order
+        self._sizes = {}
+        self._memory = 0
+        self._hits = self._misses = self._evictions = self._expirations = 0
+        self.update(*args)
+
+    def __repr__(self):
+        with self._lock:
+            return "%s(%r)" % (type(self).__name__, self._data)
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._data)
+
+    def __iter__(self):
+        with self._lock:
+            self._expire()
+            return iter(tuple(self._data))
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data and not self._expired(key)
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._data and not self._expired(key):
+                self._hits += 1
+                self._policy.touch(key)
+                return self._data[key]
+            else:
+                self._misses += 1
+                raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            if self.maxmemory is not None:
+                from sys import getsizeof
+
+                size = getsizeof(key) + getsizeof(value)
+            else:
+                size = 0
+            # Make room before adding, so the new item is never the victim.
+            if self._make_room(size):
+                self._data[key] = value
+                self._policy.add(key)
+                if self.ttl is not None:
+                    self._deadlines[key] = self._timer() + self.ttl
+                if self.maxmemory is not None:
+                    self._sizes[key] = size
+                    self._memory += size
+            else:
+                self._evictions += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            expired = key in self._data and self._expired(key)
+            if expired or key not in self._data:
+                raise KeyError(key)
+            else:
+                self._discard(key)
+
+    def clear(self):
+        """Remove all items; the counters of `cache_info`:meth: are kept."""
+        with self._lock:
+            self._data.clear()
+            self._policy.clear()
+            self._deadlines.clear()
+            self._sizes.clear()
+            self._memory = 0
+
+    def cache_info(self):
+        """Return the statistics of the cache.
+
+        The result is a named tuple with the number of `hits`, `misses`,
+        `evictions` (to honor `maxsize` or `maxmemory`) and `expirations`; the
+        `maxsize`, the current size (`currsize`) and the `memory` used by
+        items (only computed if `maxmemory` is given).
+
+        """
+        with self._lock:
+            self._expire()
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self._expirations,
+                self.maxsize,
+                len(self._data),
+                self._memory,
+            )
+
+    def _expired(self, key):
+        """Check if `key` is expired, removing it in that case."""
+        deadline = self._deadlines.get(key)
+        if deadline is not None and deadline <= self._timer():
+            self._discard(key)
+            self._expirations += 1
+            return True
+        else:
+            return False
+
+    def _expire(self):
+        """Remove expired items."""
+        deadlines = self._deadlines
+        if deadlines:
+            now = self._timer()
+            # All items have the same TTL, so deadlines are sorted.
+            while deadlines:
+                key, deadline = next(iter(deadlines.items()))
+                if deadline > now:
+                    break
+                self._discard(key)
+                self._expirations += 1
+
+    def _make_room(self, size):
+        """Evict items until a new one of `size` bytes fits in the cache.
+
+        Return False if the new item can't fit even in an empty cache.
+
+        """
+        data, maxsize, maxmemory = self._data, self.maxsize, self.maxmemory
+        if maxsize == 0 or (maxmemory is not None and size > maxmemory):
+            return False
+        else:
+            if maxsize is not None and len(data) >= maxsize:
+                self._expire()
+            while (maxsize is not None and len(data) >= maxsize) or (
+                maxmemory is not None and self._memory + size > maxmemory
+            ):
+                self._discard(self._policy.victim())
+                self._evictions += 1
+            return True
+
+    def _discard(self, key):
+        del self._data[key]
+        self._policy.remove(key)
+        self._deadlines.pop(key, None)
+        if self.maxmemory is not None:
+            self._memory -= self._sizes.pop(key)
+
+
+_DUMP_HEADER = _struct.Struct("<4sHHQ")
+_DUMP_MAGIC = b"XPS\x00"
+_DUMP_VERSION = 1
+_INTERVALS_KIND = 1  # PascalSet
+_BITS_KIND = 2  # BitPascalSet
+
+
+def _get_numpy():
+    """Return the `numpy` module, or None if it's not installed."""
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    return numpy
+
+
+def _dumps_words(kind, words):
+    """Return the binary representation of a sequence of integer words."""
+    from sys import byteorder
+
+    data = _array("q", words)
+    if byteorder != "little":
+        data.byteswap()
+    header = _DUMP_HEADER.pack(_DUMP_MAGIC, _DUMP_VERSION, kind, len(data))
+    return header + data.tobytes()
+
+
+def _loads_words(kind, buffer):
+    """Return the integer words of a dumped set of a given kind.
+
+    In little-endian machines the result is a read-only `memoryview` of
+    `buffer`, otherwise it's a copy.
+
+    """
+    from sys import byteorder
+
+    view = memoryview(buffer).cast("B")
+    start = _DUMP_HEADER.size
+    if len(view) < start:
+        raise ValueError("Invalid binary representation of a set")
+    magic, version, found, count = _DUMP_HEADER.unpack_from(view)
+    if magic != _DUMP_MAGIC:
+        raise ValueError("Invalid binary representation of a set")
+    elif version > _DUMP_VERSION:
+        msg = "Unsupported version %s of the binary representation of a set"
+        raise ValueError(msg % version)
+    elif found != kind:
+        raise ValueError("Invalid kind %s of dumped set, expected %s" % (found, kind))
+    end = start + 8 * count
+    if len(view) < end:
+        raise ValueError("Truncated binary representation of a set")
+    res = view[start:end].cast("q")
+    if byteorder == "little":
+        return res
+    else:
+        res = _array("q", res.tobytes())
+        res.byteswap()
+        return res
+
+
+def _dump_words(file, data):
+    """Write `data` to `file` (a path or a binary file object)."""
+    if hasattr(file, "write"):
+        file.write(data)
+    else:
+        with open(file, "wb") as f:
+            f.write(data)
+
+
+def _map_file(file):
+    """Return the contents of a file, memory-mapped if possible.
+
+    `file` can be a path or a binary file object.
+
+    """
+    import mmap
+
+    if hasattr(file, "read"):
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # `io.UnsupportedOperation` is both an OSError and a ValueError.
+            return file.read()
+    else:
+        with open(file, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 class MetaSet(type):
     """Allow syntax sugar creating sets.
 
@@ -964,11 +1515,19 @@ class PascalSet(metaclass=MetaSet):
 
        PascalSet(*others) -> new set object
 
+    Intervals are kept in a flat sorted sequence of boundaries (``[start1,
+    end1, start2, end2, ...]``) that is searched with `bisect`:mod:, so
+    membership tests are logarithmic and each interval insertion or removal
+    is a single slice assignment.
+
     .. versionadded:: 1.7.1
 
+    .. versionchanged:: 2.1.11 Searching is based on `bisect`:mod:.
+
     """
 
     __slots__ = ("_items",)
+    _storage = list  # How the sequence of boundaries is created
 
     def __init__(self, *others):
         """Initialize self.
@@ -977,9 +1536,17 @@ class PascalSet(metaclass=MetaSet):
                will be the set members.
 
         """
-        self._items = []  # a list of list of two elements
+        self._items = self._storage()  # flat sequence of interval limits
         self.update(*others)
 
+    def __getstate__(self):
+        # Sets obtained with `loads` share a memoryview, which can't be
+        # pickled.
+        l = self._items
+        if isinstance(l, memoryview):
+            l = self._storage(l)
+        return None, {"_items": l}
+
     def __str__(self):
         def aux(s, e):
             if s == e:
@@ -1045,7 +1612,11 @@ class PascalSet(metaclass=MetaSet):
             ls, lo = len(self), len(other)
             if ls == lo:
                 if isinstance(other, PascalSet):
-                    return self._items == other._items
+                    l, o = self._items, other._items
+                    if type(l) is type(o):
+                        return l == o
+                    else:
+                        return list(l) == list(o)
                 else:
                     return self.count(other) == ls
             else:
@@ -1203,18 +1774,17 @@ class PascalSet(metaclass=MetaSet):
             if isinstance(other, PascalSet):
                 l = other._items
                 if self._items:
-                    count = len(l)
-                    i = 0
-                    while i < count:
-                        self._insert(l[i], l[i + 1])
-                        i += 2
+                    o = iter(l)
+                    self._insert_intervals(list(zip(o, o)))
                 else:
-                    self._items = l[:]
+                    self._items = self._storage(l)
             elif isinstance(other, int):
                 self._insert(other)
+            elif isinstance(other, range) and other.step == 1:
+                if other:
+                    self._insert(other.start, other.stop - 1)
             elif isinstance(other, Iterable):
-                for i in other:
-                    self._insert(i)
+                self._insert_intervals(self._runs(other))
             elif isinstance(other, slice):
                 start, stop, step = other.start, other.stop, other.step
                 if step is None:
@@ -1242,7 +1812,7 @@ class PascalSet(metaclass=MetaSet):
 
     def intersection_update(self, *others):
         """Update a set with the intersection of itself and another."""
-        l = self._items
+        l = self._writable_items()
         oi, count = 0, len(others)
         while l and oi < count:
             other = others[oi]
@@ -1281,16 +1851,11 @@ class PascalSet(metaclass=MetaSet):
         """Remove all elements of another set from this set."""
         for other in others:
             if isinstance(other, PascalSet):
-                l = other._items
-                count = len(l)
-                i = 0
-                while i < count:
-                    self._remove(l[i], l[i + 1])
-                    i += 2
+                o = iter(other._items)
+                self._remove_intervals(list(zip(o, o)))
             else:
-                for i in other:
-                    if isinstance(i, int):
-                        self._remove(i)
+                ints = (i for i in other if isinstance(i, int))
+                self._remove_intervals(self._runs(ints))
 
     def symmetric_difference(self, other):
         """Return the symmetric difference of two sets as a new set.
@@ -1313,7 +1878,7 @@ class PascalSet(metaclass=MetaSet):
                 self -= other
                 self |= aux
         else:
-            self._items = other._items[:]
+            self._items = self._storage(other._items)
 
     def discard(self, other):
         """Remove an element from a set if it is a member.
@@ -1340,7 +1905,7 @@ class PascalSet(metaclass=MetaSet):
         Raises KeyError if the set is empty.
 
         """
-        l = self._items
+        l = self._writable_items()
         if l:
             res = l[0]
             if l[0] < l[1]:
@@ -1353,7 +1918,7 @@ class PascalSet(metaclass=MetaSet):
 
     def clear(self):
         """Remove all elements from this set."""
-        self._items = []
+        self._items = self._storage()
 
     def copy(self):
         """Return a shallow copy of a set."""
@@ -1442,6 +2007,192 @@ class PascalSet(metaclass=MetaSet):
             aux = next((i for i in other if i not in self), Unset)
             return aux is Unset
 
+    def contains_many(self, ids):
+        """Test the membership of many integers at once.
+
+        :param ids: A NumPy array or any iterable of integers (for example,
+               an `array.array`).  Sorted sequences are searched faster.
+               Items that are not integers raise a TypeError.
+
+        :returns: A NumPy array of booleans if `ids` is a NumPy array,
+                  otherwise an ``array('B')`` with ``1`` for each member and
+                  ``0`` for the others.
+
+        .. versionadded:: 2.1.11
+
+        """
+        from numbers import Integral
+        from operator import index
+
+        np = _get_numpy()
+        l = self._items
+        if np is not None and isinstance(ids, np.ndarray):
+            if ids.dtype.kind not in "iu":
+                raise self._invalid_value(ids)
+            bounds = np.asarray(l, dtype=np.int64)
+            if ids.dtype.kind == "u" and ids.dtype.itemsize >= 8:
+                # Searching unsigned 64 bits integers among signed ones
+                # promotes both to floats.  Integers beyond the signed
+                # range can't be members.
+                limit = np.iinfo(np.int64).max
+                fits = ids <= limit
+                ids = np.minimum(ids, limit).astype(np.int64)
+            else:
+                fits = None
+            left = np.searchsorted(bounds, ids, side="left")
+            right = np.searchsorted(bounds, ids, side="right")
+            # Inside an interval, or equal to one of its boundaries.
+            res = (right % 2 == 1) | (left != right)
+            return res if fits is None else res & fits
+        else:
+            res = _array("B")
+            lo = last = 0
+            for x in ids:
+                if not isinstance(x, int):
+                    if isinstance(x, Integral):
+                        x = index(x)  # NumPy integers, for instance
+                    else:
+                        raise self._invalid_value(x)
+                if x < last:
+                    lo = 0
+                idx = bisect_right(l, x, lo)
+                res.append(idx % 2 or (idx > 0 and l[idx - 1] == x))
+                lo, last = idx, x
+            return res
+
+    def update_sorted(self, ids):
+        """Add many integers given in ascending order.
+
+        Consecutive integers are grouped in intervals in a single pass, and
+        these intervals are merged with the ones in the set.
+
+        :param ids: A NumPy array or any iterable of integers (for example,
+               an `array.array`) sorted in ascending order; repetitions are
+               allowed.  If `ids` is not sorted, a ValueError is raised and
+               the set is not changed.
+
+        .. versionadded:: 2.1.11
+
+        """
+        from numbers import Integral
+        from operator import index
+
+        np = _get_numpy()
+        intervals = []
+        if np is not None and isinstance(ids, np.ndarray):
+            if ids.dtype.kind not in "iu":
+                raise self._invalid_value(ids)
+            elif len(ids):
+                # Compare neighbours, `np.diff` wraps around for unsigned
+                # integers.
+                if (ids[1:] < ids[:-1]).any():
+                    raise ValueError("Integers to add must be sorted")
+                steps = np.diff(ids)
+                breaks = np.flatnonzero(steps > 1)
+                starts = ids[np.concatenate(([0], breaks + 1))].tolist()
+                ends = ids[np.concatenate((breaks, [len(ids) - 1]))].tolist()
+                intervals = list(zip(starts, ends))
+        else:
+            start = end = None
+            for x in ids:
+                if not isinstance(x, int):
+                    if isinstance(x, Integral):
+                        x = index(x)
+                    else:
+                        raise self._invalid_value(x)
+                if end is None:
+                    start = end = x
+                elif x <= end + 1:
+                    if x < end:
+                        raise ValueError("Integers to add must be sorted")
+                    end = x
+                else:
+                    intervals.append((start, end))
+                    start = end = x
+            if end is not None:
+                intervals.append((start, end))
+        self._insert_intervals(intervals)
+
+    def to_array(self):
+        """Return all the members in ascending order.
+
+        The result is a NumPy array of 64 bits integers if NumPy is
+        installed, otherwise an ``array('q')``.
+
+        .. versionadded:: 2.1.11
+
+        """
+        np = _get_numpy()
+        l = self._items
+        if np is not None:
+            bounds = np.asarray(l, dtype=np.int64)
+            starts, ends = bounds[0::2], bounds[1::2]
+            lengths = ends - starts + 1
+            offsets = np.cumsum(lengths) - lengths
+            return np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+        else:
+            res = _array("q")
+            for i in range(0, len(l), 2):
+                res.extend(range(l[i], l[i + 1] + 1))
+            return res
+
+    def dumps(self):
+        """Return the binary representation of this set.
+
+        The result starts with a header of 16 bytes: the magic string
+        ``b"XPS\\x00"``, the format version and the kind of set (both
+        little-endian 16 bits integers), and the number of 64 bits words
+        that follow (a little-endian 64 bits integer).  The words are the
+        boundaries of the intervals (``start1, end1, start2, end2, ...``) as
+        little-endian signed 64 bits integers.
+
+        .. versionadded:: 2.1.11
+
+        """
+        return _dumps_words(_INTERVALS_KIND, self._items)
+
+    def dump(self, file):
+        """Write the binary representation of this set to `file`.
+
+        `file` can be a path or a binary file object.  See `dumps`:meth:.
+
+        .. versionadded:: 2.1.11
+
+        """
+        _dump_words(file, self.dumps())
+
+    @classmethod
+    def loads(cls, buffer):
+        """Return a set from its binary representation.
+
+        `buffer` can be any object supporting the buffer protocol (`bytes`,
+        `mmap.mmap`, ...).  In little-endian machines the boundaries are not
+        copied: the set is a read-only view of `buffer` until it's modified.
+
+        .. versionadded:: 2.1.11
+
+        """
+        words = _loads_words(_INTERVALS_KIND, buffer)
+        if len(words) % 2:
+            raise ValueError("Invalid binary representation of a set")
+        res = cls()
+        res._items = words
+        return res
+
+    @classmethod
+    def load(cls, file):
+        """Return a set from the binary representation in `file`.
+
+        `file` can be a path or a binary file object.  Files are
+        memory-mapped when possible, so the set is read lazily by the
+        operating system and its pages are shared among the processes
+        loading the same file.
+
+        .. versionadded:: 2.1.11
+
+        """
+        return cls.loads(_map_file(file))
+
     def _search(self, other):
         """Search the pair where ``other`` is placed.
 
@@ -1450,87 +2201,136 @@ class PascalSet(metaclass=MetaSet):
         """
         if isinstance(other, int):
             l = self._items
-            start, end = 0, len(l)
-            res, pivot = False, 2 * (end // 4)
-            while not res and start < end:
-                s, e = l[pivot], l[pivot + 1]
-                if other < s:
-                    end = pivot
-                elif other > e:
-                    start = pivot + 2
-                else:
-                    res = True
-                pivot = start + 2 * ((end - start) // 4)
-            return res, pivot
+            idx = bisect_left(l, other)
+            if idx % 2:
+                # ``l[idx - 1] < other <= l[idx]`` and ``l[idx]`` is an end.
+                return True, idx - 1
+            else:
+                return idx < len(l) and l[idx] == other, idx
         else:
             raise self._invalid_value(other)
 
     def _insert(self, start, end=None):
         """Insert an interval of integers."""
-        if not end:
+        if end is None:
             end = start
         assert start <= end
-        l = self._items
-        count = len(l)
-        found, idx = self._search(start)
-        if not found:
-            if idx > 0 and start == l[idx - 1] + 1:
-                found = True
-                idx -= 2
-                l[idx + 1] = start
-                if idx < count - 2 and end == l[idx + 2] - 1:
-                    end = l[idx + 3]
-            elif idx < count and end >= l[idx] - 1:
-                found = True
-                l[idx] = start
-        if found:
-            while end > l[idx + 1]:
-                if idx < count - 2 and end >= l[idx + 2] - 1:
-                    if end <= l[idx + 3]:
-                        l[idx + 1] = l[idx + 3]
-                    del l[idx + 2 : idx + 4]
-                    count -= 2
-                else:
-                    l[idx + 1] = end
+        l = self._writable_items()
+        # Adjacent intervals are merged, so search the limits widened by one.
+        lo = bisect_left(l, start - 1)
+        hi = bisect_right(l, end + 1)
+        if lo % 2:
+            lo -= 1
+            start = l[lo]
+        elif lo < hi and l[lo] < start:
+            start = l[lo]
+        if hi % 2:
+            end = l[hi]
+            hi += 1
+        elif lo < hi and l[hi - 1] > end:
+            end = l[hi - 1]
+        l[lo:hi] = self._storage((start, end))
+
+    def _insert_intervals(self, intervals):
+        """Insert a sorted list of disjoint ``(start, end)`` intervals.
+
+        Few intervals are inserted one by one, otherwise both sequences are
+        merged in a single linear pass.
+
+        """
+        if len(intervals) < 8:
+            for start, end in intervals:
+                self._insert(start, end)
         else:
-            if idx < count:
-                l.insert(idx, start)
-                l.insert(idx + 1, end)
+            l = self._items
+            o = iter(l)
+            res = []
+            for start, end in _heapq.merge(zip(o, o), intervals):
+                if res and start <= res[-1] + 1:
+                    if end > res[-1]:
+                        res[-1] = end
+                else:
+                    res.extend((start, end))
+            self._items = self._storage(res)
+
+    def _writable_items(self):
+        """Return the sequence of boundaries ready to be modified.
+
+        Sets obtained with `loads`:meth: share a read-only buffer until the
+        first modification, when the boundaries are copied.
+
+        """
+        l = self._items
+        if isinstance(l, memoryview):
+            l = self._items = self._storage(l)
+        return l
+
+    def _runs(self, values):
+        """Return the sorted list of ``(start, end)`` runs in `values`."""
+        res = []
+        aux = set()
+        for value in values:
+            if isinstance(value, int):
+                aux.add(value)
             else:
-                l.extend((start, end))
-            count += 2
+                raise self._invalid_value(value)
+        start = end = None
+        for value in sorted(aux):
+            if end is not None and value == end + 1:
+                end = value
+            else:
+                if end is not None:
+                    res.append((start, end))
+                start = end = value
+        if end is not None:
+            res.append((start, end))
+        return res
 
     def _remove(self, start, end=None):
         """Remove an interval of integers."""
-        if not end:
+        if end is None:
             end = start
         assert start <= end
-        l = self._items
-        sfound, sidx = self._search(start)
-        efound, eidx = self._search(end)
-        if sfound and efound and sidx == eidx:
-            first = l[sidx] < start
-            last = l[eidx + 1] > end
-            if first and last:
-                l.insert(eidx + 1, end + 1)
-                l.insert(sidx + 1, start - 1)
-            elif first:
-                l[sidx + 1] = start - 1
-            elif last:
-                l[eidx] = end + 1
-            else:
-                del l[sidx : eidx + 2]
-        else:
-            if sfound and l[sidx] < start:
-                l[sidx + 1] = start - 1
-                sidx += 2
-            if efound:
-                if l[eidx + 1] > end:
-                    l[eidx] = end + 1
-                else:
-                    eidx += 2
-            if sidx < eidx:
-                del l[sidx:eidx]
+        l = self._writable_items()
+        lo = bisect_left(l, start)
+        hi = bisect_right(l, end)
+        if lo % 2 or hi % 2:
+            # Keep the parts of the intervals that are cut at both limits.
+            aux = ((start - 1,) if lo % 2 else ()) + ((end + 1,) if hi % 2 else ())
+            l[lo:hi] = self._storage(aux)
+        elif lo < hi:
+            del l[lo:hi]
+
+    def _remove_intervals(self, intervals):
+        """Remove a sorted list of disjoint ``(start, end)`` intervals.
+
+        Few intervals are removed one by one, otherwise both sequences are
+        merged in a single linear pass.
+
+        """
+        if len(intervals) < 8:
+            for start, end in intervals:
+                self._remove(start, end)
+        elif self._items:
+            l = self._items
+            res = []
+            j, count = 0, len(intervals)
+            for i in range(0, len(l), 2):
+                start, end = l[i], l[i + 1]
+                while j < count and intervals[j][1] < start:
+                    j += 1
+                # The last removed interval may cut the next ones too.
+                while j < count and intervals[j][0] <= end:
+                    s, e = intervals[j]
+                    if start < s:
+                        res.extend((start, s - 1))
+                    start = e + 1
+                    if start > end:
+                        break
+                    j += 1
+                if start <= end:
+                    res.extend((start, end))
+            self._items = self._storage(res)
 
     def _invalid_value(self, value):
         cls_name = type(self).__name__
@@ -1558,18 +2358,41 @@ class PascalSet(metaclass=MetaSet):
 MutableSet.register(PascalSet)
 
 
-class BitPascalSet(metaclass=MetaSet):
-    """Collection of unique integer elements (implemented with bit-wise sets).
+class ArrayPascalSet(PascalSet):
+    """A `PascalSet`:class: storing its intervals in a compact array.
+
+    Boundaries are kept in an ``array('q')`` (see `array`:mod:), so each
+    interval costs exactly 16 bytes instead of two pointers to Python
+    integers.  This is better suited for sets with millions of intervals.
+
+    Members must fit in a signed 64-bits integer, otherwise an
+    `OverflowError` is raised.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ()
+    _storage = _partial(_array, "q")  # type: ignore
+
+
+class BitPascalSet(metaclass=MetaSet):
+    """Collection of unique integer elements (implemented with bit-wise sets).
 
     ::
 
         BitPascalSet(*others) -> new bit-set object
 
+    The number of members is kept updated by every operation, so `len` is
+    constant-time.
+
     .. versionadded:: 1.7.1
 
+    .. versionchanged:: 2.1.11 Keep the cardinality and the sorted seeds.
+
     """
 
-    __slots__ = ("_items",)
+    __slots__ = ("_items", "_count", "_keys")
     _bit_length = 62  # How many values are stored in each item
 
     def __init__(self, *others):
@@ -1584,8 +2407,20 @@ class BitPascalSet(metaclass=MetaSet):
 
         """
         self._items = {}
+        self._count = 0
+        self._keys = None  # sorted seeds, calculated when needed
         self.update(*others)
 
+    def __setstate__(self, state):
+        _, slots = state
+        self._items = slots["_items"]
+        # Pickles made before 2.1.11 don't have the cardinality.
+        count = slots.get("_count")
+        if count is None:
+            count = sum(_popcount(v) for v in self._items.values())
+        self._count = count
+        self._keys = slots.get("_keys")
+
     def __str__(self):
         if self:
             return str(PascalSet(self))
@@ -1601,19 +2436,19 @@ class BitPascalSet(metaclass=MetaSet):
     def __iter__(self):
         bl = self._bit_length
         sm = self._items
-        for k in sorted(sm):
-            v = sm[k]
-            base = k * bl
-            i = 0
-            ref = 1
-            while i < bl:
-                if ref & v:
-                    yield base + i
-                ref <<= 1
-                i += 1
+        keys = self._keys
+        if keys is None:
+            keys = self._keys = sorted(sm)
+        for k in keys:
+            v = sm.get(k, 0)
+            base = k * bl - 1
+            while v:
+                ref = v & -v  # lowest bit set
+                yield base + ref.bit_length()
+                v ^= ref
 
     def __len__(self):
-        return sum((1 for i in self), 0)
+        return self._count
 
     def __nonzero__(self):
         return bool(self._items)
@@ -1798,10 +2633,7 @@ class BitPascalSet(metaclass=MetaSet):
                 sm = self._items
                 om = other._items
                 for k, v in safe_dict_iter(om).items():
-                    if k in sm:
-                        sm[k] |= v
-                    else:
-                        sm[k] = v
+                    self._set_word(k, sm.get(k, 0) | v)
             elif isinstance(other, int):
                 self._insert(other)
             elif isinstance(other, Iterable):
@@ -1834,14 +2666,10 @@ class BitPascalSet(metaclass=MetaSet):
             other = others[oi]
             if not isinstance(other, BitPascalSet):
                 # safe mode for intersection
-                other = PascalSet(i for i in other if isinstance(i, int))
+                other = BitPascalSet(i for i in other if isinstance(i, int))
             om = other._items
             for k, v in safe_dict_iter(sm).items():
-                v &= om.get(k, 0)
-                if v:
-                    sm[k] = v
-                else:
-                    del sm[k]
+                self._set_word(k, v & om.get(k, 0))
             oi += 1
 
     def difference(self, *others):
@@ -1862,11 +2690,7 @@ class BitPascalSet(metaclass=MetaSet):
                 om = other._items
                 for k, v in safe_dict_iter(om).items():
                     if k in sm:
-                        v = sm[k] & ~v
-                        if v:
-                            sm[k] = v
-                        else:
-                            del sm[k]
+                        self._set_word(k, sm[k] & ~v)
             else:
                 for i in other:
                     if isinstance(i, int):
@@ -1893,7 +2717,7 @@ class BitPascalSet(metaclass=MetaSet):
                 self -= other
                 self |= aux
         else:
-            self._items = other._items[:]
+            self.update(other)
 
     def discard(self, other):
         """Remove an element from a bit-set if it is a member.
@@ -1919,31 +2743,19 @@ class BitPascalSet(metaclass=MetaSet):
         """
         sm = self._items
         if sm:
-            bl = self._bit_length
-            k, v = next(sm.items())
+            k, v = next(iter(sm.items()))
             assert v
-            base = k * bl
-            i = 0
-            ref = 1
-            res = None
-            while res is None:
-                if ref & v:
-                    res = base + i
-                else:
-                    ref <<= 1
-                    i += 1
-            v &= ~ref
-            if v:
-                sm[k] = v
-            else:
-                del sm[k]
-            return res
+            ref = v & -v  # lowest bit set
+            self._set_word(k, v ^ ref)
+            return k * self._bit_length + ref.bit_length() - 1
         else:
             raise KeyError("pop from an empty set!")
 
     def clear(self):
         """Remove all elements from this bit-set."""
         self._items = {}
+        self._count = 0
+        self._keys = None
 
     def copy(self):
         """Return a shallow copy of a set."""
@@ -1985,6 +2797,60 @@ class BitPascalSet(metaclass=MetaSet):
         else:
             return not any(i not in self for i in other)
 
+    def dumps(self):
+        """Return the binary representation of this bit-set.
+
+        The header is the same used by `PascalSet.dumps`:meth:.  The words
+        are pairs of seeds and bit-wise values sorted by seed, both as
+        little-endian signed 64 bits integers.
+
+        .. versionadded:: 2.1.11
+
+        """
+        sm = self._items
+        words = (word for k in sorted(sm) for word in (k, sm[k]))
+        return _dumps_words(_BITS_KIND, words)
+
+    def dump(self, file):
+        """Write the binary representation of this bit-set to `file`.
+
+        `file` can be a path or a binary file object.  See `dumps`:meth:.
+
+        .. versionadded:: 2.1.11
+
+        """
+        _dump_words(file, self.dumps())
+
+    @classmethod
+    def loads(cls, buffer):
+        """Return a bit-set from its binary representation.
+
+        `buffer` can be any object supporting the buffer protocol.
+
+        .. versionadded:: 2.1.11
+
+        """
+        words = _loads_words(_BITS_KIND, buffer)
+        if len(words) % 2:
+            raise ValueError("Invalid binary representation of a set")
+        words = iter(words)
+        res = cls()
+        res._items = dict(zip(words, words))
+        res._count = sum(_popcount(v) for v in res._items.values())
+        return res
+
+    @classmethod
+    def load(cls, file):
+        """Return a bit-set from the binary representation in `file`.
+
+        `file` can be a path or a binary file object, see
+        `PascalSet.load`:meth:.
+
+        .. versionadded:: 2.1.11
+
+        """
+        return cls.loads(_map_file(file))
+
     def _search(self, other):
         """Search the bit-wise value where ``other`` could be placed.
 
@@ -2004,7 +2870,7 @@ class BitPascalSet(metaclass=MetaSet):
         aux = self._search(other)
         if aux:
             k, ref, v = aux
-            self._items[k] = v | (1 << ref)
+            self._set_word(k, v | (1 << ref))
         else:
             raise self._invalid_value(other)
 
@@ -2018,14 +2884,24 @@ class BitPascalSet(metaclass=MetaSet):
                 aux = v & ~(1 << ref)
                 if v != aux:
                     ok = True
-                    sm = self._items
-                    if aux:
-                        sm[k] = aux
-                    else:
-                        del sm[k]
+                    self._set_word(k, aux)
         if not ok and fail:
             raise KeyError('"%s" is not a member!' % other)
 
+    def _set_word(self, k, v):
+        """Set the bit-wise value `v` for seed `k` keeping the cardinality."""
+        sm = self._items
+        old = sm.get(k, 0)
+        if v != old:
+            self._count += _popcount(v) - _popcount(old)
+            if v:
+                if not old:
+                    self._keys = None
+                sm[k] = v
+            else:
+                del sm[k]
+                self._keys = None
+
     def _invalid_value(self, value):
         cls_name = type(self).__name__
         vname = type(value).__name__
@@ -2052,6 +2928,521 @@ class BitPascalSet(metaclass=MetaSet):
 MutableSet.register(BitPascalSet)
 
 
+class RoaringPascalSet(metaclass=MetaSet):
+    """Collection of unique integer elements (implemented with compressed
+    bit-wise chunks).
+
+    ::
+
+        RoaringPascalSet(*others) -> new compressed bit-set object
+
+    Members are grouped in chunks of ``2**16`` consecutive integers (like
+    roaring bitmaps).  Each chunk is stored in the most compact of three
+    kinds of containers: a sorted array of 16 bits integers for sparse
+    chunks, a bitmap of 8 KiB for dense chunks, or a sequence of runs of
+    consecutive members.
+
+    Set operations between two instances are done chunk by chunk, and slices
+    (or ranges) are added as runs without iterating over their members.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("_items", "_count", "_keys")
+
+    def __init__(self, *others):
+        """Initialize self.
+
+        :param others: Any number of integer or collection of integers that
+               will be the set members.
+
+        In this case `_items` is a dictionary with keys containing the chunk
+        seeds (the members shifted 16 bits to the right) and values the
+        containers with the lower 16 bits of the members.
+
+        """
+        self._items = {}
+        self._count = 0
+        self._keys = None  # sorted seeds, calculated when needed
+        self.update(*others)
+
+    def __str__(self):
+        if self:
+            return str(PascalSet(self))
+        else:
+            cname = type(self).__name__
+            return str("%s([])") % cname
+
+    def __repr__(self):
+        cname = type(self).__name__
+        res = str(", ").join(str(i) for i in self)
+        return str("%s([%s])") % (cname, res)
+
+    def __iter__(self):
+        sm = self._items
+        keys = self._keys
+        if keys is None:
+            keys = self._keys = sorted(sm)
+        for k in keys:
+            c = sm.get(k)
+            if c is not None:
+                base = k << _roaring.CHUNK_BITS
+                for low in c:
+                    yield base + low
+
+    def __len__(self):
+        return self._count
+
+    def __nonzero__(self):
+        return bool(self._items)
+
+    __bool__ = __nonzero__
+
+    def __contains__(self, other):
+        """True if this bit-set has the element ``other``, else False."""
+        res = self._search(other)
+        if res:
+            k, low, c = res
+            return c is not None and low in c
+        else:
+            return False
+
+    def __sizeof__(self):
+        sm = self._items
+        res = object.__sizeof__(self) + sm.__sizeof__()
+        return res + sum(c.__sizeof__() for c in sm.values())
+
+    def __hash__(self):
+        """Compute the hash value of a set."""
+        return Set._hash(self)
+
+    def __eq__(self, other):
+        if isinstance(other, Set):
+            if isinstance(other, RoaringPascalSet):
+                return self._items == other._items
+            else:
+                ls, lo = len(self), len(other)
+                return ls == lo == self.count(other)
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __gt__(self, other):
+        if isinstance(other, Set):
+            if other:
+                return self.issuperset(other) and len(self) > len(other)
+            else:
+                return bool(self._items)
+        else:
+            return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Set):
+            return self.issuperset(other) if other else bool(self._items)
+        else:
+            return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Set):
+            if other:
+                return self.issubset(other) and len(self) < len(other)
+            else:
+                return not self._items
+        else:
+            return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Set):
+            return self.issubset(other) if other else not self._items
+        else:
+            return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Set):
+            return self.difference(other)
+        else:
+            return NotImplemented
+
+    def __isub__(self, other):
+        if isinstance(other, Set):
+            self.difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, Set):
+            return other - type(other)(self)
+        else:
+            return NotImplemented
+
+    def __and__(self, other):
+        if isinstance(other, Set):
+            return self.intersection(other)
+        else:
+            return NotImplemented
+
+    def __iand__(self, other):
+        if isinstance(other, Set):
+            self.intersection_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __rand__(self, other):
+        if isinstance(other, Set):
+            return other & type(other)(self)
+        else:
+            return NotImplemented
+
+    def __or__(self, other):
+        if isinstance(other, Set):
+            return self.union(other)
+        else:
+            return NotImplemented
+
+    def __ior__(self, other):
+        if isinstance(other, Set):
+            self.update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __ror__(self, other):
+        if isinstance(other, Set):
+            return other | type(other)(self)
+        else:
+            return NotImplemented
+
+    def __xor__(self, other):
+        if isinstance(other, Set):
+            return self.symmetric_difference(other)
+        else:
+            return NotImplemented
+
+    def __ixor__(self, other):
+        if isinstance(other, Set):
+            self.symmetric_difference_update(other)
+            return self
+        else:
+            return NotImplemented
+
+    def __rxor__(self, other):
+        if isinstance(other, Set):
+            return other ^ type(other)(self)
+        else:
+            return NotImplemented
+
+    def count(self, other):
+        """Number of occurrences of any member of other in this set.
+
+        If other is an integer, return 1 if present, 0 if not.
+
+        """
+        if isinstance(other, int):
+            return 1 if other in self else 0
+        else:
+            return sum((i in self for i in other), 0)
+
+    def add(self, other):
+        """Add an element to a bit-set.
+
+        This has no effect if the element is already present.
+
+        """
+        self._insert(other)
+
+    def union(self, *others):
+        """Return the union of bit-sets as a new set.
+
+        (i.e. all elements that are in either set.)
+
+        """
+        res = self.copy()
+        res.update(*others)
+        return res
+
+    def update(self, *others):
+        """Update a bit-set with the union of itself and others."""
+        for other in others:
+            if isinstance(other, RoaringPascalSet):
+                sm = self._items
+                for k, c in safe_dict_iter(other._items).items():
+                    mine = sm.get(k)
+                    self._set_container(k, c.copy() if mine is None else mine | c)
+            elif isinstance(other, int):
+                self._insert(other)
+            elif isinstance(other, range) and other.step == 1:
+                if other:
+                    self._insert_range(other.start, other.stop - 1)
+            elif isinstance(other, PascalSet):
+                l = other._items
+                for i in range(0, len(l), 2):
+                    self._insert_range(l[i], l[i + 1])
+            elif isinstance(other, Iterable):
+                self._insert_many(other)
+            elif isinstance(other, slice):
+                start, stop, step = other.start, other.stop, other.step
+                if step is None:
+                    step = 1
+                if step == 1:
+                    if start < stop:
+                        self._insert_range(start, stop - 1)
+                else:
+                    self._insert_many(range(start, stop, step))
+            else:
+                raise self._invalid_value(other)
+
+    def intersection(self, *others):
+        """Return the intersection of two or more bit-sets as a new set.
+
+        (i.e. elements that are common to all of the sets.)
+
+        """
+        res = self.copy()
+        res.intersection_update(*others)
+        return res
+
+    def intersection_update(self, *others):
+        """Update a bit-set with the intersection of itself and another."""
+        sm = self._items
+        oi, count = 0, len(others)
+        while sm and oi < count:
+            other = others[oi]
+            if not isinstance(other, RoaringPascalSet):
+                # safe mode for intersection
+                other = RoaringPascalSet(i for i in other if isinstance(i, int))
+            om = other._items
+            for k, c in safe_dict_iter(sm).items():
+                oc = om.get(k)
+                self._set_container(k, None if oc is None else c & oc)
+            oi += 1
+
+    def difference(self, *others):
+        """Return the difference of two or more bit-sets as a new set.
+
+        (i.e. all elements that are in this set but not the others.)
+
+        """
+        res = self.copy()
+        res.difference_update(*others)
+        return res
+
+    def difference_update(self, *others):
+        """Remove all elements of another bit-set from this set."""
+        for other in others:
+            if isinstance(other, RoaringPascalSet):
+                sm = self._items
+                for k, c in safe_dict_iter(other._items).items():
+                    mine = sm.get(k)
+                    if mine is not None:
+                        self._set_container(k, mine - c)
+            else:
+                for i in other:
+                    if isinstance(i, int):
+                        self._remove(i)
+
+    def symmetric_difference(self, other):
+        """Return the symmetric difference of two bit-sets as a new set.
+
+        (i.e. all elements that are in exactly one of the sets.)
+
+        """
+        res = self.copy()
+        res.symmetric_difference_update(other)
+        return res
+
+    def symmetric_difference_update(self, other):
+        "Update a bit-set with the symmetric difference of itself and another."
+        if not isinstance(other, RoaringPascalSet):
+            other = RoaringPascalSet(other)
+        sm = self._items
+        for k, c in safe_dict_iter(other._items).items():
+            mine = sm.get(k)
+            self._set_container(k, c.copy() if mine is None else mine ^ c)
+
+    def discard(self, other):
+        """Remove an element from a bit-set if it is a member.
+
+        If the element is not a member, do nothing.
+
+        """
+        self._remove(other)
+
+    def remove(self, other):
+        """Remove an element from a bit-set; it must be a member.
+
+        If the element is not a member, raise a KeyError.
+
+        """
+        self._remove(other, fail=True)
+
+    def pop(self):
+        """Remove and return an arbitrary bit-set element.
+
+        Raises KeyError if the set is empty.
+
+        """
+        sm = self._items
+        if sm:
+            k, c = next(iter(sm.items()))
+            low = next(iter(c))
+            self._set_container(k, c.discard(low), -1)
+            return (k << _roaring.CHUNK_BITS) + low
+        else:
+            raise KeyError("pop from an empty set!")
+
+    def clear(self):
+        """Remove all elements from this bit-set."""
+        self._items = {}
+        self._count = 0
+        self._keys = None
+
+    def copy(self):
+        """Return a shallow copy of a set."""
+        return type(self)(self)
+
+    def optimize(self):
+        """Convert every chunk to its most compact kind of container.
+
+        Containers changed by adding or removing single members keep their
+        kind until they are too big for it.  Call this method after many of
+        those changes to compress the set again.
+
+        """
+        sm = self._items
+        for k, c in sm.items():
+            sm[k] = _roaring.from_bits(c.bits())
+
+    def isdisjoint(self, other):
+        """Return True if two bit-sets have a null intersection."""
+        if isinstance(other, RoaringPascalSet):
+            sm, om = self._items, other._items
+            return all(c.isdisjoint(sm[k]) for k, c in om.items() if k in sm)
+        else:
+            return not any(i in self for i in other)
+
+    def issubset(self, other):
+        """Report whether another set contains this bit-set."""
+        if isinstance(other, RoaringPascalSet):
+            sm, om = self._items, other._items
+            if len(self) > len(other):
+                return False
+            else:
+                return all(k in om and c.issubset(om[k]) for k, c in sm.items())
+        elif isinstance(other, Container):
+            return not any(i not in other for i in self)
+        else:
+            # Generator cases
+            return sum((i in self for i in other), 0) == len(self)
+
+    def issuperset(self, other):
+        """Report whether this bit set contains another set."""
+        if isinstance(other, RoaringPascalSet):
+            return other.issubset(self)
+        else:
+            return not any(i not in self for i in other)
+
+    def _search(self, other):
+        """Search the container where ``other`` could be placed.
+
+        Return a triple :``(seed, lower bits, container or None)``.
+
+        """
+        if isinstance(other, int):
+            k = other >> _roaring.CHUNK_BITS
+            return k, other & _roaring.CHUNK_MASK, self._items.get(k)
+        else:
+            return None
+
+    def _insert(self, other):
+        """Add a member in this bit-set."""
+        aux = self._search(other)
+        if aux:
+            k, low, c = aux
+            if c is None:
+                self._set_container(k, _roaring.from_values([low]), 1)
+            elif low not in c:
+                self._set_container(k, c.add(low), 1)
+        else:
+            raise self._invalid_value(other)
+
+    def _insert_range(self, start, end):
+        """Add all integers from `start` to `end` (included)."""
+        sm = self._items
+        first, last = start >> _roaring.CHUNK_BITS, end >> _roaring.CHUNK_BITS
+        for k in range(first, last + 1):
+            lo = start & _roaring.CHUNK_MASK if k == first else 0
+            hi = end & _roaring.CHUNK_MASK if k == last else _roaring.CHUNK_MASK
+            c = _roaring.from_range(lo, hi)
+            mine = sm.get(k)
+            self._set_container(k, c if mine is None else mine | c)
+
+    def _insert_many(self, values):
+        """Add many members grouping them by chunk."""
+        chunks = {}
+        for value in values:
+            if isinstance(value, int):
+                k = value >> _roaring.CHUNK_BITS
+                chunk = chunks.get(k)
+                if chunk is None:
+                    chunks[k] = chunk = set()
+                chunk.add(value & _roaring.CHUNK_MASK)
+            else:
+                raise self._invalid_value(value)
+        sm = self._items
+        for k, chunk in chunks.items():
+            c = _roaring.from_values(sorted(chunk))
+            mine = sm.get(k)
+            self._set_container(k, c if mine is None else mine | c)
+
+    def _remove(self, other, fail=False):
+        """Remove a member from this bit-set."""
+        aux = self._search(other)
+        if aux and aux[2] is not None and aux[1] in aux[2]:
+            k, low, c = aux
+            self._set_container(k, c.discard(low), -1)
+        elif fail:
+            raise KeyError('"%s" is not a member!' % other)
+
+    def _set_container(self, k, c, delta=None):
+        """Set the container `c` for seed `k` keeping the cardinality.
+
+        If `delta` is not given, it's calculated from the sizes of the old
+        and the new containers.
+
+        """
+        sm = self._items
+        old = sm.get(k)
+        if delta is None:
+            delta = (len(c) if c is not None else 0) - (
+                len(old) if old is not None else 0
+            )
+        self._count += delta
+        if c is not None:
+            if old is None:
+                self._keys = None
+            sm[k] = c
+        elif old is not None:
+            del sm[k]
+            self._keys = None
+
+    def _invalid_value(self, value):
+        cls_name = type(self).__name__
+        vname = type(value).__name__
+        msg = (
+            'Unsupported type for  value "%s" of type "%s" for a "%s", '
+            "must be an integer!"
+        )
+        return TypeError(msg % (value, vname, cls_name))
+
+
+MutableSet.register(RoaringPascalSet)
+
+
 # Smart Tools
 
 
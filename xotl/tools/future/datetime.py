@@ -374,6 +374,60 @@ def daterange(*args):
     return _generator()
 
 
+def _to_date(value, nullable=True):
+    """Coerce `value` to a date (or None if `nullable`).
+
+    Datetimes are truncated, other values are parsed.
+
+    """
+    cls = type(value)
+    if cls is date:
+        return value
+    elif cls is datetime:
+        return value.date()
+    elif value in (None, False):
+        # We regard False as None, so that working with Odoo is easier:
+        # missing values in Odoo, often come as False instead of None.
+        if not nullable:
+            raise ValueError("Setting None to a required field")
+        return None
+    elif isinstance(value, datetime):
+        return value.date()
+    elif isinstance(value, date):
+        return value
+    else:
+        return parse_date(value)
+
+
+def _to_datetime(value, nullable=True, prefer_last_minute=False):
+    """Coerce `value` to a datetime (or None if `nullable`).
+
+    Dates are converted to the datetime at '00:00:00' or, if
+    `prefer_last_minute` is True, at '23:59:59'.  Other values are parsed.
+
+    """
+    if type(value) is datetime:
+        return value
+    elif value in (None, False):
+        if not nullable:
+            raise ValueError("Setting None to a required field")
+        return None
+    elif isinstance(value, datetime):
+        # needed because datetime is subclass of date, and the next
+        # condition would match.
+        return value
+    elif isinstance(value, date):
+        if not prefer_last_minute:
+            return datetime(value.year, value.month, value.day)
+        else:
+            return datetime(value.year, value.month, value.day, 23, 59, 59)
+    else:
+        try:
+            return parse_datetime(value)
+        except ValueError:
+            return _to_datetime(parse_date(value), nullable, prefer_last_minute)
+
+
 class DateField:
     """A simple descriptor for dates.
 
@@ -393,18 +447,7 @@ class DateField:
             return self
 
     def __set__(self, instance, value):
-        if value in (None, False):
-            # We regard False as None, so that working with Odoo is easier:
-            # missing values in Odoo, often come as False instead of None.
-            if not self.nullable:
-                raise ValueError("Setting None to a required field")
-            else:
-                value = None
-        elif isinstance(value, datetime):
-            value = value.date()
-        elif not isinstance(value, date):
-            value = parse_date(value)
-        instance.__dict__[self.name] = value
+        instance.__dict__[self.name] = _to_date(value, self.nullable)
 
 
 class DateTimeField(object):
@@ -434,29 +477,7 @@ class DateTimeField(object):
             return self
 
     def __set__(self, instance, value):
-        if value in (None, False):
-            # We regard False as None, so that working with Odoo is easier:
-            # missing values in Odoo, often come as False instead of None.
-            if not self.nullable:
-                raise ValueError("Setting None to a required field")
-            else:
-                value = None
-        elif isinstance(value, datetime):
-            # needed because datetime is subclass of date, and the next
-            # condition would match.
-            pass
-        elif isinstance(value, date):
-            if not self.prefer_last_minute:
-                value = datetime(value.year, value.month, value.day)
-            else:
-                value = datetime(value.year, value.month, value.day, 23, 59, 59)
-        else:
-            try:
-                value = parse_datetime(value)
-            except ValueError:
-                value = parse_date(value)
-                self.__set__(instance, value)  # lazy me
-                return
+        value = _to_datetime(value, self.nullable, self.prefer_last_minute)
         instance.__dict__[self.name] = value
 
 
@@ -506,20 +527,63 @@ class TimeSpan:
        expected in sets because the difference/union of two span is not
        necessarily *continuous*.
 
+    .. versionchanged:: 2.1.11 The bounds are kept in slots instead of the
+       instance dictionary, and values that are already dates are not
+       checked further.  Use `from_trusted`:meth: to skip all the checks.
+
     """
 
-    start_date = DateField("start_date", nullable=True)
-    end_date = DateField("end_date", nullable=True)
+    __slots__ = ("_start", "_end")
 
     def __init__(self, start_date=None, end_date=None):
-        self.start_date = start_date
-        self.end_date = end_date
+        self._start = _to_date(start_date)
+        self._end = _to_date(end_date)
+
+    @classmethod
+    def from_trusted(cls, start_date, end_date):
+        """Return a new time span without checking nor parsing the bounds.
+
+        Both `start_date` and `end_date` must be instances of
+        `~datetime.date`:class: (not datetimes) or None.
+
+        .. versionadded:: 2.1.11
+
+        """
+        res = object.__new__(cls)
+        res._start = start_date
+        res._end = end_date
+        return res
 
     @classmethod
     def from_date(self, date: date) -> "TimeSpan":
         """Return a new time span that covers a single `date`."""
         return self(start_date=date, end_date=date)
 
+    @property
+    def start_date(self):
+        return self._start
+
+    @start_date.setter
+    def start_date(self, value):
+        self._start = _to_date(value)
+
+    @property
+    def end_date(self):
+        return self._end
+
+    @end_date.setter
+    def end_date(self, value):
+        self._end = _to_date(value)
+
+    def __reduce__(self):
+        return type(self), tuple(self)
+
+    def __setstate__(self, state):
+        # Time spans pickled before 2.1.11 have the bounds in the instance
+        # dictionary.
+        self._start = state.get("start_date")
+        self._end = state.get("end_date")
+
     @property
     def past_unbound(self) -> bool:
         "True if the time span is not bound into the past."
@@ -560,12 +624,13 @@ class TimeSpan:
         if isinstance(other, date):
             if isinstance(other, datetime):
                 other = other.date()
-            if self.start_date and self.end_date:
-                return self.start_date <= other <= self.end_date
-            elif self.start_date:
-                return self.start_date <= other
-            elif self.end_date:
-                return other <= self.end_date
+            start, end = self._start, self._end
+            if start and end:
+                return start <= other <= end
+            elif start:
+                return start <= other
+            elif end:
+                return other <= end
             else:
                 return True
         else:
@@ -580,32 +645,44 @@ class TimeSpan:
 
     def __le__(self, other):
         "True if `other` is a superset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return (self & other) == self
 
-    issubset = __le__
+    def issubset(self, other):
+        "True if `other` is a superset."
+        return self <= other
 
     def __lt__(self, other):
         "True if `other` is a proper superset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return self != other and self <= other
 
     def __gt__(self, other):
         "True if `other` is a proper subset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return self != other and self >= other
 
     def __ge__(self, other):
         "True if `other` is a subset."
         # Notice that ge is not the opposite of lt.
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return (self & other) == other
 
-    issuperset = covers = __ge__
+    def issuperset(self, other):
+        "True if `other` is a subset."
+        return self >= other
+
+    covers = issuperset
 
     def __iter__(self):
-        yield self.start_date
-        yield self.end_date
+        return iter((self._start, self._end))
 
     def __getitem__(self, index):
-        this = tuple(self)
-        return this[index]
+        return (self._start, self._end)[index]
 
     def __eq__(self, other):
         if isinstance(other, date):
@@ -614,10 +691,10 @@ class TimeSpan:
             return other == self
         if not isinstance(other, TimeSpan):
             return NotImplemented
-        return self.start_date == other.start_date and self.end_date == other.end_date
+        return self._start == other._start and self._end == other._end
 
     def __hash__(self):
-        return hash((TimeSpan, self.start_date, self.end_date))
+        return hash((TimeSpan, self._start, self._end))
 
     def __and__(self, other):
         """Get the time span that is the intersection with another time span.
@@ -641,16 +718,18 @@ class TimeSpan:
             other = TimeSpan.from_date(other)
         elif isinstance(other, DateTimeSpan):
             return other & self
+        elif isinstance(other, TimeSpanSet):
+            return NotImplemented
         elif not isinstance(other, TimeSpan):
             raise TypeError("Invalid type '%s'" % type(other).__name__)
-        start = max(self.start_date or -Infinity, other.start_date or -Infinity)
-        end = min(self.end_date or Infinity, other.end_date or Infinity)
+        start = max(self._start or -Infinity, other._start or -Infinity)
+        end = min(self._end or Infinity, other._end or Infinity)
         if start <= end:
             if start is -Infinity:
                 start = None
             if end is Infinity:
                 end = None
-            return type(self)(start, end)
+            return type(self).from_trusted(start, end)
         else:
             return EmptyTimeSpan
 
@@ -696,9 +775,9 @@ class TimeSpan:
 
         if isinstance(delta, numbers.Integral):
             delta = timedelta(days=delta)  # noqa
-        start = self.start_date - delta if self.start_date else None
-        end = self.end_date - delta if self.end_date else None
-        return type(self)(start, end)
+        start = self._start - delta if self._start else None
+        end = self._end - delta if self._end else None
+        return type(self).from_trusted(start, end)
 
     def __rshift__(self, delta):
         """Return the time span displaced to the future in `delta`.
@@ -935,25 +1014,59 @@ class DateTimeSpan(TimeSpan):
 
     .. versionadded:: 1.9.7
 
+    .. versionchanged:: 2.1.11 The dates are computed from the datetimes
+       instead of being stored.  `~TimeSpan.from_trusted`:meth: takes
+       datetimes.
+
     .. warning:: DateTimeSpan is provided on a provisional basis.  Future
        releases can change its API or remove it completely.
 
     """
 
-    start_datetime = SynchronizedField(
-        DateTimeField("start_datetime", nullable=True), TimeSpan.start_date
-    )
-    end_datetime = SynchronizedField(
-        DateTimeField("end_datetime", nullable=True, prefer_last_minute=True),
-        TimeSpan.end_date,
-    )
-    start_date = SynchronizedField(TimeSpan.start_date, start_datetime.descriptor)
-    end_date = SynchronizedField(TimeSpan.end_date, end_datetime.descriptor)
+    __slots__ = ()
 
     def __init__(self, start_datetime=None, end_datetime=None):
-        # Don't call super because our fields are synchronized.
-        self.start_datetime = start_datetime
-        self.end_datetime = end_datetime
+        # The bounds are kept as datetimes in the same slots of TimeSpan.
+        self._start = _to_datetime(start_datetime)
+        self._end = _to_datetime(end_datetime, prefer_last_minute=True)
+
+    @property
+    def start_datetime(self):
+        return self._start
+
+    @start_datetime.setter
+    def start_datetime(self, value):
+        self._start = _to_datetime(value)
+
+    @property
+    def end_datetime(self):
+        return self._end
+
+    @end_datetime.setter
+    def end_datetime(self, value):
+        self._end = _to_datetime(value, prefer_last_minute=True)
+
+    def __setstate__(self, state):
+        self._start = state.get("start_datetime")
+        self._end = state.get("end_datetime")
+
+    @property
+    def start_date(self):
+        start = self._start
+        return start.date() if start is not None else None
+
+    @start_date.setter
+    def start_date(self, value):
+        self._start = _to_datetime(_to_date(value))
+
+    @property
+    def end_date(self):
+        end = self._end
+        return end.date() if end is not None else None
+
+    @end_date.setter
+    def end_date(self, value):
+        self._end = _to_datetime(_to_date(value), prefer_last_minute=True)
 
     @classmethod
     def from_datetime(self, dt):
@@ -1056,35 +1169,37 @@ class DateTimeSpan(TimeSpan):
     def __le__(self, other):
         # type: (TimeSpan) -> bool
         "True if `other` is a superset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return (self & other) == self
 
-    issubset = __le__
-
     def __lt__(self, other):
         # type: (TimeSpan) -> bool
         "True if `other` is a proper superset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return self != other and self <= other
 
     def __gt__(self, other):
         # type: (TimeSpan) -> bool
         "True if `other` is a proper subset."
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return self != other and self >= other
 
     def __ge__(self, other):
         # type: (TimeSpan) -> bool
         "True if `other` is a subset."
         # Notice that ge is not the opposite of lt.
+        if isinstance(other, TimeSpanSet):
+            return NotImplemented
         return (self & other) == other
 
-    issuperset = covers = __ge__
-
     def __iter__(self) -> Iterator[datetime]:  # type: ignore
-        yield self.start_datetime
-        yield self.end_datetime
+        return iter((self._start, self._end))
 
     def __getitem__(self, index) -> datetime:  # type: ignore
-        this = tuple(self)
-        return this[index]
+        return (self._start, self._end)[index]
 
     def __eq__(self, other):
         if isinstance(other, date):
@@ -1122,18 +1237,20 @@ class DateTimeSpan(TimeSpan):
             return other
         elif isinstance(other, date):
             other = DateTimeSpan.from_datetime(other)
+        elif isinstance(other, TimeSpanSet):
+            return NotImplemented
         elif isinstance(other, TimeSpan):
             other = DateTimeSpan.from_timespan(other)
         elif not isinstance(other, TimeSpan):
             raise TypeError("Invalid type '%s'" % type(other).__name__)
-        start = max(self.start_datetime or -Infinity, other.start_datetime or -Infinity)
-        end = min(self.end_datetime or Infinity, other.end_datetime or Infinity)
+        start = max(self._start or -Infinity, other._start or -Infinity)
+        end = min(self._end or Infinity, other._end or Infinity)
         if start <= end:
             if start is -Infinity:
                 start = None
             if end is Infinity:
                 end = None
-            return type(self)(start, end)
+            return type(self).from_trusted(start, end)
         else:
             return EmptyTimeSpan
 
@@ -1161,9 +1278,9 @@ class DateTimeSpan(TimeSpan):
 
         if isinstance(delta, numbers.Integral):
             delta = timedelta(days=delta)
-        start = self.start_datetime - delta if self.start_datetime else None
-        end = self.end_datetime - delta if self.end_datetime else None
-        return type(self)(start, end)
+        start = self._start - delta if self._start else None
+        end = self._end - delta if self._end else None
+        return type(self).from_trusted(start, end)
 
     def __rshift__(self, delta):
         # type: (Union[int, timedelta]) -> DateTimeSpan
@@ -1248,4 +1365,447 @@ class DateTimeSpan(TimeSpan):
     __str__ = __repr__
 
 
+class TimeSpanSet:
+    """A set of dates made of disjoint `time spans <TimeSpan>`:class:.
+
+    Unlike time spans, sets are closed under union, intersection, difference
+    and complement::
+
+       >>> spans = TimeSpanSet([
+       ...     TimeSpan('2017-08-01', '2017-08-10'),
+       ...     TimeSpan('2017-08-05', '2017-08-20'),
+       ...     TimeSpan('2017-09-01', '2017-09-30'),
+       ... ])
+       >>> list(spans)
+       [TimeSpan('2017-08-01', '2017-08-20'), TimeSpan('2017-09-01', '2017-09-30')]
+
+       >>> list(spans - TimeSpan('2017-08-10', '2017-09-10'))
+       [TimeSpan('2017-08-01', '2017-08-09'), TimeSpan('2017-09-11', '2017-09-30')]
+
+    The spans are kept sorted, and overlapping or adjacent spans are merged;
+    so two sets are equal if they contain the same dates.  Iterating yields
+    the spans in order.
+
+    Items given to the constructor can be time spans (date time spans are
+    truncated to their dates), dates, or pairs of values accepted by
+    `TimeSpan`:class:.  Invalid spans (which end before they start) and
+    `EmptyTimeSpan`:data: are ignored.  Spans that start at the first date
+    (or end at the last one) are taken as unbound into the past (or the
+    future).
+
+    Operations (``|``, ``&``, ``-``, ``^``, ``~``, comparison of sets with
+    ``<=``, ``>=``, etc.) take time proportional to the number of spans of
+    both operands.  Operands can be sets, time spans or dates.  Testing if a
+    date (or a span) is in the set takes logarithmic time.
+
+    Sets are immutable and hashable.  A set is only equal to a set of the
+    same type with the same spans, not to a time span or a set of date time
+    spans with the same dates.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    #: The type of the spans of the set.
+    _span_type = TimeSpan
+
+    #: The distance between two adjacent values.
+    _unit = timedelta(days=1)
+
+    #: The first and last values, taken as unbound.
+    _min, _max = date.min, date.max
+
+    def __init__(self, spans=()):
+        bounds = [self._set_bounds(span) for span in spans]
+        bounds = [pair for pair in bounds if pair is not None]
+        bounds.sort(key=lambda pair: pair[0])
+        starts, ends = self._coalesce(bounds)
+        self._starts, self._ends = tuple(starts), tuple(ends)
+
+    @classmethod
+    def _from_bounds(cls, starts, ends):
+        """Return a new set from the sorted and coalesced bounds."""
+        res = object.__new__(cls)
+        res._starts = tuple(starts)
+        res._ends = tuple(ends)
+        return res
+
+    @classmethod
+    def _bounds(cls, span):
+        """Return the bounds of the time span `span` (coerced to the
+        `_span_type`), or the pair ``(1, 0)`` for an empty span."""
+        if isinstance(span, _EmptyTimeSpan):
+            return 1, 0
+        elif isinstance(span, DateTimeSpan):
+            return span.start_date, span.end_date
+        elif isinstance(span, TimeSpan):
+            return span._start, span._end
+        elif isinstance(span, date):
+            span = _to_date(span)
+            return span, span
+        else:
+            span = TimeSpan(*span)
+            return span._start, span._end
+
+    @classmethod
+    def _set_bounds(cls, span):
+        """Return the bounds of `span` as kept in the set.
+
+        Unbound (or first and last) bounds are replaced by infinities.
+        Return None if the span is empty.
+
+        """
+        from xotl.tools.infinity import Infinity
+
+        start, end = cls._bounds(span)
+        if start is None or end is None or start <= end:
+            if start is None or start == cls._min:
+                start = -Infinity
+            if end is None or end == cls._max:
+                end = Infinity
+            return start, end
+        else:
+            return None
+
+    @classmethod
+    def _point(cls, value):
+        """Return the date (or datetime) `value` as a bound of the set."""
+        return _to_date(value)
+
+    @classmethod
+    def _succ(cls, value):
+        """Return the value after `value`, or None if there's none."""
+        try:
+            return value + cls._unit
+        except (TypeError, OverflowError):  # Infinity or the last date
+            return None
+
+    @classmethod
+    def _pred(cls, value):
+        """Return the value before `value`, or None if there's none."""
+        try:
+            return value - cls._unit
+        except (TypeError, OverflowError):
+            return None
+
+    @classmethod
+    def _coalesce(cls, bounds):
+        """Merge the overlapping or adjacent pairs in the sorted `bounds`.
+
+        Return the lists of starts and ends.
+
+        """
+        succ = cls._succ
+        starts, ends = [], []
+        for start, end in bounds:
+            if ends:
+                after = succ(ends[-1])
+                if after is None or start <= after:
+                    if end > ends[-1]:
+                        ends[-1] = end
+                    continue
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
+
+    def _span(self, start, end):
+        from xotl.tools.infinity import Infinity
+
+        return self._span_type.from_trusted(
+            None if start is -Infinity else start, None if end is Infinity else end
+        )
+
+    def _coerce(self, other):
+        """Return `self` and `other` as sets of the same type.
+
+        A set of date spans is converted to a set of date time spans if the
+        other is.  Return None if `other` is not a set, a time span, or a date.
+
+        """
+        if isinstance(other, TimeSpanSet):
+            pass
+        elif isinstance(other, DateTimeSpan):
+            other = DateTimeSpanSet((other,))
+        elif isinstance(other, (TimeSpan, date, _EmptyTimeSpan)):
+            other = type(self)((other,))
+        else:
+            return None
+        this = self
+        if this._span_type is not other._span_type:
+            if issubclass(other._span_type, DateTimeSpan):
+                this = type(other)(this)
+            else:
+                other = type(this)(other)
+        return this, other
+
+    def __iter__(self):
+        span = self._span
+        return (span(start, end) for start, end in zip(self._starts, self._ends))
+
+    def __getitem__(self, index):
+        "Return the span at `index` (in order)."
+        return self._span(self._starts[index], self._ends[index])
+
+    def __len__(self):
+        "The number of (disjoint) spans."
+        return len(self._starts)
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, list(self))
+
+    __str__ = __repr__
+
+    def __eq__(self, other):
+        # Unlike other operations, don't coerce: equal objects must have the
+        # same hash.
+        if isinstance(other, TimeSpanSet) and self._span_type is other._span_type:
+            return self._starts == other._starts and self._ends == other._ends
+        else:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash((self._span_type, self._starts, self._ends))
+
+    def __contains__(self, other):
+        """Test if the date (or time span) `other` is in the set."""
+        from bisect import bisect_right
+
+        # Convert only `other` (not the whole set) to the type of the set.
+        if isinstance(other, date):
+            start = end = self._point(other)
+        elif isinstance(other, (TimeSpan, _EmptyTimeSpan)):
+            bounds = self._set_bounds(other)
+            if bounds is None:
+                return True
+            start, end = bounds
+        else:
+            return False
+        starts = self._starts
+        index = bisect_right(starts, start) - 1
+        if index < 0 and starts and starts[0] == start:
+            index = 0  # -Infinity is not found by bisect_right
+        return index >= 0 and end <= self._ends[index]
+
+    def _bounds_pairs(self):
+        return list(zip(self._starts, self._ends))
+
+    def span_at(self, value):
+        """Return the span that contains the date `value`.
+
+        Return `EmptyTimeSpan`:data: if no span contains it.
+
+        """
+        from bisect import bisect_right
+
+        value = self._point(value)
+        index = bisect_right(self._starts, value) - 1
+        if index >= 0 and value <= self._ends[index]:
+            return self._span(self._starts[index], self._ends[index])
+        else:
+            return EmptyTimeSpan
+
+    def __or__(self, other):
+        "Return the union of the set and `other`."
+        from heapq import merge
+
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        bounds = merge(this._bounds_pairs(), other._bounds_pairs())
+        return this._from_bounds(*this._coalesce(bounds))
+
+    __ror__ = __add__ = __radd__ = __or__
+
+    def __and__(self, other):
+        "Return the intersection of the set and `other`."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        astarts, aends = this._starts, this._ends
+        bstarts, bends = other._starts, other._ends
+        starts, ends = [], []
+        i = j = 0
+        while i < len(astarts) and j < len(bstarts):
+            start = max(astarts[i], bstarts[j])
+            end = min(aends[i], bends[j])
+            if start <= end:
+                starts.append(start)
+                ends.append(end)
+            if aends[i] < bends[j]:
+                i += 1
+            else:
+                j += 1
+        return this._from_bounds(starts, ends)
+
+    __rand__ = __mul__ = __rmul__ = __and__
+
+    def __invert__(self):
+        "Return the complement of the set: the dates not in the set."
+        from xotl.tools.infinity import Infinity
+
+        starts, ends = [], []
+        current = -Infinity
+        for start, end in zip(self._starts, self._ends):
+            if start is not -Infinity:
+                before = self._pred(start)
+                if before is not None and current <= before:
+                    starts.append(current)
+                    ends.append(before)
+            current = self._succ(end)
+            if current is None:
+                break
+        else:
+            starts.append(current)
+            ends.append(Infinity)
+        return self._from_bounds(starts, ends)
+
+    complement = __invert__
+
+    def __sub__(self, other):
+        "Return the dates in the set which are not in `other`."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return this & ~other
+
+    def __rsub__(self, other):
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return other & ~this
+
+    def __xor__(self, other):
+        "Return the dates in either the set or `other`, but not in both."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return (this - other) | (other - this)
+
+    __rxor__ = __xor__
+
+    def __le__(self, other):
+        "True if `other` is a superset."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return not (this - other)
+
+    def __ge__(self, other):
+        "True if `other` is a subset."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return not (other - this)
+
+    def __lt__(self, other):
+        "True if `other` is a proper superset."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return this <= other and not (other <= this)
+
+    def __gt__(self, other):
+        "True if `other` is a proper subset."
+        operands = self._coerce(other)
+        if operands is None:
+            return NotImplemented
+        this, other = operands
+        return this >= other and not (other >= this)
+
+    def isdisjoint(self, other):
+        "True if the set has no date in common with `other`."
+        return not (self & other)
+
+    def overlaps(self, other):
+        "True if the set has some date in common with `other`."
+        return bool(self & other)
+
+    def union(self, *others):
+        "Return ``self [| other1 | ...]``."
+        from functools import reduce
+        import operator
+
+        return reduce(operator.or_, others, self)
+
+    def intersection(self, *others):
+        "Return ``self [& other1 & ...]``."
+        from functools import reduce
+        import operator
+
+        return reduce(operator.and_, others, self)
+
+    def difference(self, *others):
+        "Return ``self [- other1 - ...]``."
+        from functools import reduce
+        import operator
+
+        return reduce(operator.sub, others, self)
+
+    issubset = __le__
+    issuperset = covers = __ge__
+
+
+class DateTimeSpanSet(TimeSpanSet):
+    """A set of datetimes made of disjoint `date time spans
+    <DateTimeSpan>`:class:.
+
+    The API is the same of `TimeSpanSet`:class:, with datetimes instead of
+    dates.  Bounds (and datetimes tested for membership) are truncated to
+    the second, so two spans are adjacent if one ends a second before the
+    other starts.  Time spans and dates are converted like `DateTimeSpan`
+    does.
+
+    Operations mixing a set of date time spans and a set of time spans
+    convert the latter.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ()
+
+    _span_type = DateTimeSpan
+    _unit = timedelta(seconds=1)
+    _min, _max = datetime.min, datetime.max.replace(microsecond=0)
+
+    @classmethod
+    def _bounds(cls, span):
+        if isinstance(span, _EmptyTimeSpan):
+            return 1, 0
+        elif isinstance(span, DateTimeSpan):
+            pass
+        elif isinstance(span, date):
+            span = DateTimeSpan.from_datetime(span)
+        elif isinstance(span, TimeSpan):
+            span = DateTimeSpan.from_timespan(span)
+        else:
+            span = DateTimeSpan(*span)
+        start, end = span._start, span._end
+        if start is not None:
+            start = start.replace(microsecond=0)
+        if end is not None:
+            end = end.replace(microsecond=0)
+        return start, end
+
+    @classmethod
+    def _point(cls, value):
+        return _to_datetime(value).replace(microsecond=0)
+
+
 del IntEnum
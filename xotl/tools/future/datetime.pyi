@@ -24,6 +24,10 @@ class TimeSpan:
     ) -> None: ...
     @classmethod
     def from_date(self, date: date) -> "TimeSpan": ...
+    @classmethod
+    def from_trusted(
+        cls, start_date: Optional[date], end_date: Optional[date]
+    ) -> "TimeSpan": ...
     @property
     def past_unbound(self) -> bool: ...
     @property
@@ -67,6 +71,10 @@ class DateTimeSpan(TimeSpan):
     def from_datetime(self, dt: datetime) -> "DateTimeSpan": ...
     @classmethod
     def from_timespan(self, ts: TimeSpan) -> "DateTimeSpan": ...
+    @classmethod
+    def from_trusted(
+        cls, start_date: Optional[date], end_date: Optional[date]
+    ) -> "DateTimeSpan": ...
     def __iter__(self) -> Iterator[datetime]: ...
     def __getitem__(self, index: int) -> datetime: ...
     def __and__(self, other: TimeSpan) -> "DateTimeSpan": ...
@@ -76,3 +84,47 @@ class DateTimeSpan(TimeSpan):
     def diff(self, other: TimeSpan) -> Tuple["DateTimeSpan", "DateTimeSpan"]: ...
 
 EmptyTimeSpan: DateTimeSpan
+
+_SpanSetOperand = Union["TimeSpanSet", TimeSpan, date]
+
+class TimeSpanSet:
+    def __init__(self, spans: Iterable[Any] = ...) -> None: ...
+    def __iter__(self) -> Iterator[TimeSpan]: ...
+    def __getitem__(self, index: int) -> TimeSpan: ...
+    def __len__(self) -> int: ...
+    def __bool__(self) -> bool: ...
+    def __eq__(self, other) -> bool: ...
+    def __hash__(self) -> int: ...
+    def __contains__(self, other: object) -> bool: ...
+    def span_at(self, value: date) -> TimeSpan: ...
+    def __or__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __ror__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __add__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __radd__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __and__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __rand__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __mul__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __rmul__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __invert__(self) -> "TimeSpanSet": ...
+    def complement(self) -> "TimeSpanSet": ...
+    def __sub__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __rsub__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __xor__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __rxor__(self, other: _SpanSetOperand) -> "TimeSpanSet": ...
+    def __le__(self, other: _SpanSetOperand) -> bool: ...
+    def __ge__(self, other: _SpanSetOperand) -> bool: ...
+    def __lt__(self, other: _SpanSetOperand) -> bool: ...
+    def __gt__(self, other: _SpanSetOperand) -> bool: ...
+    def isdisjoint(self, other: _SpanSetOperand) -> bool: ...
+    def overlaps(self, other: _SpanSetOperand) -> bool: ...
+    def union(self, *others: _SpanSetOperand) -> "TimeSpanSet": ...
+    def intersection(self, *others: _SpanSetOperand) -> "TimeSpanSet": ...
+    def difference(self, *others: _SpanSetOperand) -> "TimeSpanSet": ...
+    def issubset(self, other: _SpanSetOperand) -> bool: ...
+    def issuperset(self, other: _SpanSetOperand) -> bool: ...
+    def covers(self, other: _SpanSetOperand) -> bool: ...
+
+class DateTimeSpanSet(TimeSpanSet):
+    def __iter__(self) -> Iterator[DateTimeSpan]: ...
+    def __getitem__(self, index: int) -> DateTimeSpan: ...
+    def span_at(self, value: date) -> DateTimeSpan: ...
@@ -17,10 +17,150 @@ document all items here.  Refer to `threading`:mod: documentation.
 from threading import *  # noqa
 import threading as _stdlib  # noqa
 
-from threading import Event, Thread, RLock, Timer
+from concurrent.futures import Executor as _Executor
+from concurrent.futures import Future as _Future
 
 
-def async_call(func, args=None, kwargs=None, callback=None, onerror=None):
+_executor = None
+_executor_lock = _stdlib.Lock()
+
+# ``_worker.active`` is True in the threads of the shared pool while they run
+# a call.
+_worker = _stdlib.local()
+
+
+def _get_executor():
+    """Return the thread pool shared by `async_call`:func: and others."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = _DaemonThreadPool(thread_name_prefix="async_call")
+    return _executor
+
+
+def _forget_executor():
+    # The workers of the pool don't exist in a forked child.
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = _stdlib.Lock()
+
+
+try:
+    from os import register_at_fork
+except ImportError:  # Python < 3.7 or Windows
+    pass
+else:
+    register_at_fork(after_in_child=_forget_executor)
+    del register_at_fork
+
+
+class _DaemonThreadPool(_Executor):
+    """A thread pool whose workers are daemon threads.
+
+    Unlike with `concurrent.futures.ThreadPoolExecutor`:class:, the
+    interpreter doesn't wait for the running calls at exit, as it didn't for
+    the threads `async_call`:func: used to start.
+
+    """
+
+    def __init__(self, max_workers=None, thread_name_prefix="pool"):
+        import os
+        from collections import deque
+
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._items = deque()
+        self._idle = 0  # The number of workers waiting for items.
+        self._threads = []
+        self._lock = _stdlib.Condition()
+        self._shutdown = False
+
+    def submit(self, fn, *args, **kwargs):
+        return self._submit(fn, args, kwargs, True)
+
+    def submit_nowait(self, fn, *args, **kwargs):
+        """Like `submit` but return None if no worker is free to call `fn`."""
+        return self._submit(fn, args, kwargs, False)
+
+    def _submit(self, fn, args, kwargs, enqueue):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            threads = self._threads
+            if self._idle > len(self._items):
+                start = False
+            elif len(threads) < self._max_workers:
+                start = True
+            elif enqueue:
+                start = False
+            else:
+                return None
+            future = _Future()
+            self._items.append((future, fn, args, kwargs))
+            if start:
+                name = "%s_%d" % (self._thread_name_prefix, len(threads))
+                thread = Thread(target=self._work, name=name, daemon=True)
+                thread.start()
+                threads.append(thread)
+            else:
+                self._lock.notify()
+        return future
+
+    def _work(self):
+        lock, items = self._lock, self._items
+        while True:
+            with lock:
+                while not items:
+                    if self._shutdown:
+                        return
+                    self._idle += 1
+                    lock.wait()
+                    self._idle -= 1
+                future, fn, args, kwargs = items.popleft()
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            del future, fn, args, kwargs
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class _CallFuture(_Future):
+    """The future of an `async_call`:func:.
+
+    It's also a read-only `Event`:class:, as `async_call`:func: used to
+    return.
+
+    """
+
+    def is_set(self):
+        return self.done()
+
+    isSet = is_set
+
+    def wait(self, timeout=None):
+        from concurrent.futures import wait
+
+        wait((self,), timeout)
+        return self.done()
+
+
+def async_call(
+    func, args=None, kwargs=None, callback=None, onerror=None, *, executor=None
+):
     """Executes a function asynchronously.
 
     The function receives the given positional and keyword arguments
@@ -31,99 +171,135 @@ def async_call(func, args=None, kwargs=None, callback=None, onerror=None):
     If the called function ends with an exception and `onerror` is provided, it
     is called with the exception object.
 
-    :returns: An event object that gets signalled when the function ends its
-              execution whether normally or with an error.
+    Functions are called in a thread pool shared by all calls, unless another
+    `concurrent.futures.Executor`:class: is given in `executor`.  The
+    threads of the shared pool are daemon threads: the interpreter doesn't
+    wait for the calls still running at exit.  Calls made by a function
+    already running in the shared pool are run in the calling thread if no
+    worker of the pool is free, so a function can wait for the calls it
+    makes without the risk of a deadlock when the pool is full.  Executors
+    given in `executor` don't get this treatment: they must have enough
+    workers for nested calls.
+
+    :returns: A future with the result of the function.  It's done when the
+              function ends its execution (after calling `callback` or
+              `onerror`), whether normally or with an error.  A call that
+              hasn't started can be cancelled.  It also has the methods
+              ``wait()`` and ``is_set()`` of an `Event`:class:.
+
+    :rtype: `concurrent.futures.Future`:class:
 
-    :rtype: `Event`:class:
+    .. versionchanged:: 2.1.11 Functions are called in a thread pool instead
+       of a new thread per call, and a future is returned instead of an
+       event.
 
     """
-    event = Event()
-    event.clear()
+    future = _CallFuture()
     if not args:
         args = ()
     if not kwargs:
         kwargs = {}
 
     def async_():
+        if not future.set_running_or_notify_cancel():
+            return
         try:
             result = func(*args, **kwargs)
-            if callback:
-                callback(result)
-        except Exception as error:
-            if onerror:
-                onerror(error)
-        finally:
-            event.set()
+        except BaseException as error:
+            # The future is completed even if `onerror` fails.
+            try:
+                if onerror and isinstance(error, Exception):
+                    onerror(error)
+            finally:
+                future.set_exception(error)
+        else:
+            try:
+                if callback:
+                    callback(result)
+            except Exception as error:
+                if onerror:
+                    onerror(error)
+            finally:
+                future.set_result(result)
 
-    thread = Thread(target=async_)
-    thread.setDaemon(True)  # XXX: Why?
-    thread.start()
-    return event
+    if executor is not None:
+        executor.submit(async_)
+    elif getattr(_worker, "active", False):
+        # The pool may be full of calls waiting for this one.
+        if _get_executor().submit_nowait(_run_in_pool, async_) is None:
+            async_()
+    else:
+        _get_executor().submit(_run_in_pool, async_)
+    return future
 
 
-class _SyncronizedCaller:
-    """Protected to be used in `sync_call`:func:"""
+def _run_in_pool(fn):
+    _worker.active = True
+    try:
+        fn()
+    finally:
+        _worker.active = False
 
-    def __init__(self, pooling=0.005):
-        self.lock = RLock()
-        self._not_bailed = True
-        self.pooling = pooling
 
-    def __call__(self, funcs, callback, timeout=None):
-        def _syncronized_callback(result):
-            with self.lock:
-                if self._not_bailed:
-                    callback(result)
+def completed_calls(funcs, timeout=None, *, executor=None):
+    """Calls several functions asynchronously, yield their futures as they
+    complete.
+
+    Like `concurrent.futures.as_completed`:func: but calls `funcs` (callables
+    that receive no arguments) with `async_call`:func:.
+
+    If `timeout` is not None and the functions are not done after `timeout`
+    seconds from the original call, the calls that haven't started are
+    cancelled and `concurrent.futures.TimeoutError`:class: is raised.  Calls
+    are also cancelled if the iterator is closed before the end.
 
-        events, threads = [], []
-        for which in funcs:
-            event, thread = async_call(which, callback=_syncronized_callback)
-            events.append(event)
-            threads.append(thread)
-        if timeout:
-
-            def set_all_events():
-                with self.lock:
-                    self._not_bailed = False
-                for e in events:
-                    e.set()
-
-            timer = Timer(timeout, set_all_events)
-            timer.start()
-        while events:
-            terminated = []
-            for event in events:
-                flag = event.wait(self.pooling)
-                if flag:
-                    terminated.append(event)
-            for e in terminated:
-                events.remove(e)
-        if timeout:
-            timer.cancel()
-
-
-def sync_call(funcs, callback, timeout=None):
-    """Calls several functions, each one in it's own thread.
-
-    Waits for all to end.
-
-    Each time a function ends the `callback` is called (wrapped in a lock to
-    avoid race conditions) with the result of the as a single positional
-    argument.
+    .. versionadded:: 2.1.11
+
+    """
+    from concurrent.futures import as_completed
+
+    def completed(futures):
+        try:
+            yield from as_completed(futures, timeout)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    return completed([async_call(func, executor=executor) for func in funcs])
+
+
+def sync_call(funcs, callback, timeout=None, *, executor=None):
+    """Calls several functions asynchronously and waits for all to end.
+
+    Each time a function ends the `callback` is called in the calling thread
+    with the result of the function as a single positional argument.
+    Functions ending with an exception are ignored.
 
     If `timeout` is not None it sould be a float number indicading the seconds
     to wait before aborting. Functions that terminated before the timeout will
-    have called `callback`, but those that are still working will be ignored.
+    have called `callback`, those that are still working will be ignored and
+    those that didn't start are cancelled.
 
-    .. todo:: Abort the execution of a thread.
+    Functions are called as in `async_call`:func:, see
+    `completed_calls`:func:.
 
     :param funcs: A sequences of callables that receive no arguments.
 
+    .. versionchanged:: 2.1.11 Functions are called in a thread pool and
+       waited for without polling.  Calls that didn't start are cancelled
+       after the timeout.
+
     """
-    sync_caller = _SyncronizedCaller()
-    sync_caller(funcs, callback, timeout)
+    from concurrent.futures import TimeoutError
+
+    try:
+        for future in completed_calls(funcs, timeout, executor=executor):
+            if future.exception() is None:
+                callback(future.result())
+    except TimeoutError:
+        pass
 
 
 from threading import __all__  # noqa
 
-__all__ = list(__all__) + ["async_call", "sync_call"]
+__all__ = list(__all__) + ["async_call", "sync_call", "completed_calls"]
@@ -221,9 +221,13 @@ class SafeDataItem:
 
     def __get__(self, obj, owner):
         if obj is not None:
-            from xotl.tools.future.inspect import get_attr_value
-
-            res = get_attr_value(obj, self.inner_name, Unset)
+            # The generic `object.__getattribute__` never calls the
+            # `__getattr__` or `__getattribute__` of the type of `obj`, so
+            # it's as safe as `get_attr_value` and much faster.
+            try:
+                res = object.__getattribute__(obj, self.inner_name)
+            except AttributeError:
+                res = Unset
             if res is not Unset:
                 return res
             elif self.init is not Unset:
@@ -19,15 +19,31 @@ import sys
 from xotl.tools.deprecation import deprecated_alias
 
 
+try:
+    from ._context_local import local as ContextLocal  # noqa
+except ImportError:  # Python < 3.7
+    ContextLocal = None  # type: ignore
+    _HAS_CONTEXT_LOCAL = False
+else:
+    _HAS_CONTEXT_LOCAL = True
+
+
 # TODO: Must be implemented using `xotl.tools.api` mechanisms for correct
 # driver determination, in this case "thread-local data".
 if "greenlet" in sys.modules:
-    from ._greenlet_local import local  # noqa
+    # Greenlets switch the context since greenlet 0.4.17, so there's no need
+    # for the slower locking implementation.
+    if _HAS_CONTEXT_LOCAL and getattr(
+        sys.modules["greenlet"], "GREENLET_USE_CONTEXT_VARS", False
+    ):
+        local = ContextLocal
+    else:
+        from ._greenlet_local import local  # type: ignore  # noqa
 else:
     try:
-        from threading import local  # noqa
+        from threading import local  # type: ignore  # noqa
     except ImportError:
-        from dummy_threading import local  # noqa
+        from dummy_threading import local  # type: ignore  # noqa
 
 del sys
 
@@ -109,22 +125,64 @@ class BackoffWait:
     Instances are callables that comply with the need of the `wait` argument
     for `retrier`:class:.
 
-    At each call the wait is increased by doubling `backoff` (given in
-    milliseconds).
+    At each retry the wait is increased by doubling `backoff` (given in
+    milliseconds).  The wait is computed from the number of the retry, which
+    `retrier`:class: gives, so an instance can be shared by concurrent calls.
+
+    Many clients retrying at the same time keep doing it in sync.  To spread
+    them, `jitter` can be:
+
+    - ``'full'`` -- wait a random time between `MIN_WAIT_INTERVAL`:data: and
+      the backoff wait.
+
+    - ``'decorrelated'`` -- wait a random time between `wait` and three times
+      the previous wait; the backoff is not used.
+
+    If `max_wait` is given, we never wait more than that.
 
     We never wait less than `MIN_WAIT_INTERVAL`:data:.
 
     .. versionadded:: 1.8.2
 
+    .. versionchanged:: 2.1.11 Added arguments `jitter` and `max_wait`, and
+       the `attempt` argument of the call.
+
     """
 
-    def __init__(self, wait=DEFAULT_WAIT_INTERVAL, backoff=1):
+    def __init__(
+        self, wait=DEFAULT_WAIT_INTERVAL, backoff=1, *, jitter=None, max_wait=None
+    ):
+        if jitter not in (None, "full", "decorrelated"):
+            raise ValueError("Invalid jitter %r" % (jitter,))
         self.wait = max(MIN_WAIT_INTERVAL, wait)
         self.backoff = min(max(0.1, backoff), 1)
+        self.jitter = jitter
+        self.max_wait = max_wait
+        self._calls = 0
 
-    def __call__(self, prev=None):
-        res = self.wait + (self.backoff / 1000)
-        self.backoff = self.backoff * 2
+    def __call__(self, prev=None, *, attempt=None):
+        """Return the time to wait before the retry number `attempt`.
+
+        Retries are numbered from 1.  If `attempt` is not given, each call is
+        the next retry.
+
+        """
+        from random import uniform
+
+        if attempt is None:
+            self._calls += 1
+            attempt = self._calls
+        jitter = self.jitter
+        if jitter == "decorrelated":
+            res = uniform(self.wait, max(self.wait, 3 * (prev or 0)))
+        else:
+            # Big enough to reach any sensible `max_wait`, without overflow.
+            exponent = min(attempt - 1, 1000)
+            res = self.wait + self.backoff * 2.0 ** exponent / 1000
+            if jitter == "full":
+                res = uniform(MIN_WAIT_INTERVAL, res)
+        if self.max_wait is not None:
+            res = max(MIN_WAIT_INTERVAL, min(res, self.max_wait))
         return res
 
 
@@ -138,11 +196,178 @@ def get_backoff_wait(n, *, wait=DEFAULT_WAIT_INTERVAL, backoff=1):
     """
     res = 0
     fn = BackoffWait(wait=wait, backoff=backoff)
-    for _ in range(n):
-        res = fn(prev=res)
+    for attempt in range(1, n + 1):
+        res = fn(prev=res, attempt=attempt)
     return res
 
 
+class RetryBudget:
+    """A retry budget that can be shared by several `retrier`:class: objects.
+
+    Without a budget, when a service fails every client retries `max_tries`
+    times; multiplying the load exactly when the service is weakest.  A
+    budget limits the retries to a `ratio` of the calls, plus `min_retries`
+    every `window` seconds to allow retrying when there are few calls.  If the
+    budget is exhausted, failures are not retried.
+
+    The budget is a bucket of up to `min_retries` tokens: each call deposits
+    `ratio` tokens, each retry withdraws one token, and `min_retries` tokens
+    are added each `window` seconds.
+
+    Budgets are thread-safe.  The attributes `calls`, `retries` (retries
+    spent) and `rejected` (retries not allowed) can be used as metrics.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, window=10, *, clock=None):
+        from threading import Lock
+        from time import monotonic
+
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock or monotonic
+        self._lock = Lock()
+        self._balance = min_retries
+        self._last = self._clock()
+        self.calls = self.retries = self.rejected = 0
+
+    @property
+    def balance(self):
+        """The number of retries available now."""
+        with self._lock:
+            self._refill()
+            return int(self._balance)
+
+    def deposit(self):
+        """Account a new call."""
+        with self._lock:
+            self._refill()
+            self._balance = min(self.min_retries, self._balance + self.ratio)
+            self.calls += 1
+
+    def withdraw(self):
+        """Try to spend a retry; return True if it's allowed."""
+        with self._lock:
+            self._refill()
+            if self._balance >= 1:
+                self._balance -= 1
+                self.retries += 1
+                return True
+            else:
+                self.rejected += 1
+                return False
+
+    def _refill(self):
+        now = self._clock()
+        if self.window:
+            earned = (now - self._last) * self.min_retries / self.window
+            self._balance = min(self.min_retries, self._balance + earned)
+        self._last = now
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is not tried because its `CircuitBreaker`:class: is
+    open.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+
+class CircuitBreaker:
+    """A circuit breaker that can be shared by several `retrier`:class: objects.
+
+    The breaker starts ``'closed'``: calls are tried.  After
+    `failure_threshold` consecutive failures it becomes ``'open'``: calls are
+    not tried, `CircuitOpenError`:class: is raised instead.  After
+    `recovery_timeout` seconds it becomes ``'half-open'``: up to
+    `half_open_calls` calls are tried; if one of them succeeds the breaker is
+    closed again, if one fails it's opened again.
+
+    When used by a `retrier`:class:, exceptions not in its `retry_only` are
+    regarded as successful calls: the service responded.  If the breaker is
+    opened while retrying, the last failure is raised.
+
+    Breakers are thread-safe.  The attributes `state`, `failures` and
+    `short_circuited` (calls not tried) can be used as metrics.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self, failure_threshold=5, recovery_timeout=30, half_open_calls=1, *, clock=None
+    ):
+        from threading import Lock
+        from time import monotonic
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock or monotonic
+        self._lock = Lock()
+        self._state = self.CLOSED
+        self._consecutive = 0  # consecutive failures
+        self._opened_at = None
+        self._trials = 0  # calls tried while half-open
+        self.failures = self.short_circuited = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def check(self):
+        """Raise `CircuitOpenError`:class: if a call can't be tried now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN and self._trials < self.half_open_calls:
+                self._trials += 1
+            elif state != self.CLOSED:
+                self.short_circuited += 1
+                raise CircuitOpenError("The circuit breaker is %s" % state)
+
+    def record_success(self):
+        """Account a successful call."""
+        with self._lock:
+            self._consecutive = 0
+            self._state = self.CLOSED
+
+    def release(self):
+        """Account a call that was tried but neither succeeded nor failed.
+
+        For example, a call cancelled before it finished.
+
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def record_failure(self):
+        """Account a failed call."""
+        with self._lock:
+            self.failures += 1
+            self._consecutive += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or self._consecutive >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+    def _current_state(self):
+        if self._state == self.OPEN:
+            if self._clock() - self._opened_at >= self.recovery_timeout:
+                self._state = self.HALF_OPEN
+                self._trials = 0
+        return self._state
+
+
 def retry(
     fn,
     args=None,
@@ -151,24 +376,34 @@ def retry(
     max_tries=None,
     max_time=None,
     wait=DEFAULT_WAIT_INTERVAL,
-    retry_only=None
+    retry_only=None,
+    budget=None,
+    breaker=None
 ):
     """Run `fn` with args and kwargs in an auto-retrying loop.
 
     See `retrier`:class:.  This is just::
 
        >>> retrier(max_tries=max_tries, max_time=max_time, wait=wait,
-       ...         retry_only=retry_only)(fn, *args, **kwargs)
+       ...         retry_only=retry_only, budget=budget,
+       ...         breaker=breaker)(fn, *args, **kwargs)
 
     .. versionadded:: 1.8.2
 
+    .. versionchanged:: 2.1.11 Added arguments `budget` and `breaker`.
+
     """
     if args is None:
         args = ()
     if kwargs is None:
         kwargs = {}
     return retrier(
-        max_tries=max_tries, max_time=max_time, wait=wait, retry_only=retry_only
+        max_tries=max_tries,
+        max_time=max_time,
+        wait=wait,
+        retry_only=retry_only,
+        budget=budget,
+        breaker=breaker,
     )(fn, *args, **kwargs)
 
 
@@ -199,17 +434,35 @@ class retrier:
     Waiting is done with `time.sleep`:func:.  Time tracking is done with
     `time.monotonic`:func:.
 
+    If `func` is a coroutine function the result is a coroutine, see
+    `decorate`:meth:.
+
+    Several retriers can share a `budget` (a `RetryBudget`:class:) to limit
+    the number of retries, and a `breaker` (a `CircuitBreaker`:class:) to stop
+    calling a failing service for a while.  Only exceptions in `retry_only`
+    are regarded as failures by the breaker.
+
     .. versionadded:: 1.8.2
 
+    .. versionchanged:: 2.1.11 Added arguments `budget` and `breaker`.
+
     """
 
     def __init__(
-        self, max_tries=None, max_time=None, wait=DEFAULT_WAIT_INTERVAL, retry_only=None
+        self,
+        max_tries=None,
+        max_time=None,
+        wait=DEFAULT_WAIT_INTERVAL,
+        retry_only=None,
+        budget=None,
+        breaker=None,
     ):
         if not max_tries and not max_time:
             raise TypeError("One of tries or times must be set")
         self.max_tries = max_tries
         self.max_time = max_time
+        self.budget = budget
+        self.breaker = breaker
         if not callable(wait):
             self.wait = ConstantWait(wait)
         else:
@@ -232,34 +485,137 @@ class retrier:
            ... def read_from_url(url):
            ...     pass
 
+        If `fn` is a coroutine function, the result is also a coroutine
+        function that waits with `asyncio.sleep`:func:, so the event loop is
+        not blocked.  In this case `max_time` is a deadline: a running try is
+        cancelled when it's reached (raising `asyncio.TimeoutError`), and we
+        don't retry if waiting would reach it.  Use a `BackoffWait`:class:
+        with `jitter` to avoid many tasks retrying in sync.
+
+        .. versionchanged:: 2.1.11 Support coroutine functions.
+
         """
+        from asyncio import iscoroutinefunction
         from time import monotonic as clock, sleep
         from xotl.tools.future.functools import wraps
 
+        if iscoroutinefunction(fn):
+            return self._decorate_coroutine(fn)
+
         max_time = self.max_time
         max_tries = self.max_tries
 
+        budget = self.budget
+        breaker = self.breaker
+
         @wraps(fn)
         def inner(*args, **kwargs):
             t = 0
             done = False
             start = clock()
             waited = None
+            if budget is not None:
+                budget.deposit()
             while not done:
+                if breaker is not None:
+                    breaker.check()
                 try:
-                    return fn(*args, **kwargs)
+                    res = fn(*args, **kwargs)
                 except self.retry_only:
+                    if breaker is not None:
+                        breaker.record_failure()
                     t += 1
                     reached_max_tries = max_tries and t >= max_tries
                     max_time_elapsed = max_time and clock() - start >= max_time
                     retry = not reached_max_tries and not max_time_elapsed
-                    if retry:
-                        waited = self.wait(waited)
+                    if breaker is not None and breaker.state == breaker.OPEN:
+                        raise
+                    elif retry and (budget is None or budget.withdraw()):
+                        waited = self._next_wait(waited, t)
                         sleep(waited)
                     else:
                         raise
+                except Exception:
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return res
+
+        return inner
+
+    def _decorate_coroutine(self, fn):
+        import asyncio
+        from time import monotonic as clock
+        from xotl.tools.future.functools import wraps
+
+        max_time = self.max_time
+        max_tries = self.max_tries
+
+        budget = self.budget
+        breaker = self.breaker
+
+        @wraps(fn)
+        async def inner(*args, **kwargs):
+            t = 0
+            start = clock()
+            waited = None
+            if budget is not None:
+                budget.deposit()
+            while True:
+                if breaker is not None:
+                    breaker.check()
+                if max_time:
+                    remaining = max_time - (clock() - start)
+                    attempt = asyncio.wait_for(fn(*args, **kwargs), remaining)
+                else:
+                    attempt = fn(*args, **kwargs)
+                try:
+                    res = await attempt
+                except self.retry_only:
+                    if breaker is not None:
+                        breaker.record_failure()
+                    t += 1
+                    if breaker is not None and breaker.state == breaker.OPEN:
+                        raise
+                    elif max_tries and t >= max_tries:
+                        raise
+                    wait = self._next_wait(waited, t)
+                    if max_time and clock() - start + wait >= max_time:
+                        raise
+                    elif budget is None or budget.withdraw():
+                        waited = wait
+                        await asyncio.sleep(waited)
+                    else:
+                        raise
+                except Exception:
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                else:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return res
 
         return inner
 
+    def _next_wait(self, prev, attempt):
+        """Return the time to wait before the retry number `attempt`."""
+        wait = self.wait
+        if isinstance(wait, BackoffWait):
+            return wait(prev, attempt=attempt)
+        else:
+            return wait(prev)
+
 
 del deprecated_alias
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+# Local data based on `contextvars`.  A single ContextVar keeps a mapping
+# from a weak reference of each instance to the dictionary of its attributes.
+# Threads and greenlets (greenlet 1.0+) start with an empty context, asyncio
+# tasks run in a copy of the context of their creator.  ContextVars are never
+# freed from the contexts, that's why there's not one per instance.
+#
+# Neither the mapping nor the dictionaries are modified once set, setting an
+# attribute sets a new mapping with a new dictionary.  Otherwise a task would
+# modify the data shared with the task that created it.  So reading is a
+# couple of look-ups without locks, writing is proportional to the number of
+# attributes and instances in the context.
+#
+# When an instance is collected its dictionaries are cleared, so the data is
+# freed even if contexts keep the (empty) dictionaries.  Those are dropped
+# the next time the mapping is copied: the number of collected instances when
+# a mapping was pruned is kept in the mapping under the key None.
+
+from contextvars import ContextVar
+from functools import lru_cache
+from weakref import ref
+
+
+__all__ = ["local"]
+
+
+# The mapping from weak references of instances to their attributes.  The
+# default is never modified.
+_storage = ContextVar("xotl.tools.tasking.local", default={None: 0})
+
+_collected = [0]  # number of instances collected
+
+
+class _Attrs(dict):
+    """The attributes of an instance, weakly referenced by the instance.
+
+    Hashed and compared by identity, so they can be in a set of weak
+    references.
+
+    """
+
+    __slots__ = ("__weakref__",)
+    __hash__ = object.__hash__  # type: ignore
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+
+
+def _clear_attrs(refs, _ref):
+    _collected[0] += 1
+    for attrs_ref in list(refs):
+        attrs = attrs_ref()
+        if attrs is not None:
+            attrs.clear()
+
+
+def _set_attrs(self, attrs):
+    """Set `attrs` as the attributes of `self` in the current context."""
+    key = object.__getattribute__(self, "_local__ref")
+    refs = object.__getattribute__(self, "_local__attrs")
+    refs.add(ref(attrs, refs.discard))
+    mapping = _storage.get()
+    collected = _collected[0]
+    if mapping[None] == collected:
+        mapping = dict(mapping)
+    else:
+        mapping = {k: v for k, v in mapping.items() if k is None or k() is not None}
+        mapping[None] = collected
+    mapping[key] = attrs
+    _storage.set(mapping)
+
+
+def _local_dict(self):
+    """Return the attributes of `self` in the current context."""
+    key = object.__getattribute__(self, "_local__ref")
+    res = _storage.get().get(key)
+    if res is None:
+        res = _Attrs()
+        _set_attrs(self, res)
+        cls = type(self)
+        if cls.__init__ is not object.__init__:
+            args, kwargs = object.__getattribute__(self, "_local__args")
+            cls.__init__(self, *args, **kwargs)
+            res = _storage.get()[key]
+    return res
+
+
+@lru_cache(maxsize=1024)
+def _is_data_descriptor(cls, name):
+    for base in cls.__mro__:
+        attr = base.__dict__.get(name)
+        if attr is not None:
+            return hasattr(type(attr), "__set__")
+    return False
+
+
+class local:
+    """Local data isolated in threads, greenlets and asyncio tasks.
+
+    Like `threading.local`:class:, `__init__` (with the arguments given to
+    the constructor) is called the first time an instance is used in a
+    thread or greenlet.  Asyncio tasks see the attributes of the task that
+    created them, but attributes they set are not seen outside.
+
+    Requires Python 3.7+.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("_local__ref", "_local__attrs", "_local__args", "__weakref__")
+
+    def __new__(cls, *args, **kwargs):
+        from functools import partial
+
+        if (args or kwargs) and cls.__init__ is object.__init__:
+            raise TypeError("Initialization arguments are not supported")
+        self = object.__new__(cls)
+        refs = set()  # weak references to every _Attrs of the instance
+        key = ref(self, partial(_clear_attrs, refs))
+        object.__setattr__(self, "_local__ref", key)
+        object.__setattr__(self, "_local__attrs", refs)
+        object.__setattr__(self, "_local__args", (args, kwargs))
+        # The creator doesn't need to call __init__ again.
+        _set_attrs(self, _Attrs())
+        return self
+
+    def __getattribute__(self, name):
+        key = object.__getattribute__(self, "_local__ref")
+        attrs = _storage.get().get(key)
+        if attrs is None:
+            attrs = _local_dict(self)
+        if name in attrs:
+            return attrs[name]
+        else:
+            return object.__getattribute__(self, name)
+
+    def __setattr__(self, name, value):
+        if name == "__dict__":
+            msg = "%r object attribute '__dict__' is read-only"
+            raise AttributeError(msg % type(self).__name__)
+        if _is_data_descriptor(type(self), name):
+            return object.__setattr__(self, name, value)
+        attrs = _Attrs(_local_dict(self))
+        attrs[name] = value
+        _set_attrs(self, attrs)
+
+    def __delattr__(self, name):
+        if _is_data_descriptor(type(self), name):
+            return object.__delattr__(self, name)
+        attrs = _Attrs(_local_dict(self))
+        try:
+            del attrs[name]
+        except KeyError:
+            msg = "%r object has no attribute %r"
+            raise AttributeError(msg % (type(self).__name__, name)) from None
+        _set_attrs(self, attrs)
+
+    def __dir__(self):
+        return sorted(set(object.__dir__(self)) | set(_local_dict(self)))
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""Executors that propagate execution contexts to their workers.
+
+Code submitted to a standard `concurrent.futures`:mod: executor runs without
+the `~xotl.tools.context.context`:class: (and
+`~xotl.tools.context.task_context`:class:) active in the caller.  The
+executors in this module capture them (see
+`~xotl.tools.context.capture_contexts`:func:) and enter them again in the
+workers::
+
+  >>> from xotl.tools.context import context
+  >>> def flag():
+  ...     return bool(context['FLAG'])
+
+  >>> with ThreadPoolExecutor() as executor:
+  ...     with context('FLAG'):
+  ...         future = executor.submit(flag)
+  ...     future.result()
+  True
+
+For `multiprocessing.Pool`:class: pass the restore method of a snapshot as
+the initializer::
+
+  from multiprocessing import Pool
+  from xotl.tools.context import capture_contexts
+
+  with Pool(initializer=capture_contexts().restore) as pool:
+      ...
+
+.. versionadded:: 2.1.11
+
+"""
+
+from typing import Dict
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+
+from xotl.tools.context import ContextSnapshot, capture_contexts
+
+
+__all__ = ("ThreadPoolExecutor", "ProcessPoolExecutor")
+
+
+class ThreadPoolExecutor(_ThreadPoolExecutor):
+    """A thread pool executor that runs callables in the caller contexts.
+
+    The contexts active when a callable is submitted are entered in the
+    worker thread before calling it, and exited after that.  Data is copied
+    when submitting but it's not pickled.
+
+    """
+
+    def submit(*args, **kwargs):
+        if len(args) < 2:
+            raise TypeError("submit() missing the callable argument")
+        self, fn, *args = args
+        snapshot = capture_contexts()
+        if snapshot:
+            return _ThreadPoolExecutor.submit(self, snapshot.run, fn, *args, **kwargs)
+        else:
+            return _ThreadPoolExecutor.submit(self, fn, *args, **kwargs)
+
+    submit.__doc__ = _ThreadPoolExecutor.submit.__doc__
+
+
+class ProcessPoolExecutor(_ProcessPoolExecutor):
+    """A process pool executor that runs callables in the caller contexts.
+
+    The contexts active when a callable is submitted are sent with it to the
+    worker process, entered before calling it, and exited after that.
+    Contexts whose name can't be pickled and data that can't be pickled are
+    ignored (levels of `~xotl.tools.context.task_context`:class: are either
+    sent or ignored as a whole).  Names must be equal after being pickled,
+    so objects compared by identity (like a plain `object`:class:) don't
+    work.
+
+    The contexts are pickled when a callable is submitted, but each distinct
+    pickle is stored once (in a private temporary directory removed at
+    shutdown) and only its key is sent with the call.  Workers load each
+    stored pickle once and keep the last ones they loaded.
+
+    Workers don't keep the contexts they may inherit when they are forked.
+    Requires Python 3.7+, which allows an `initializer`.
+
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        mp_context=None,
+        initializer=None,
+        initargs=(),
+        **kwargs
+    ):
+        from threading import Lock
+
+        super().__init__(
+            max_workers,
+            mp_context,
+            initializer=_init_worker,
+            initargs=(initializer, initargs),
+            **kwargs
+        )
+        self._store_lock = Lock()
+        self._store_path = None
+        self._stored = set()
+        self._remove_store = None
+
+    def submit(*args, **kwargs):
+        if len(args) < 2:
+            raise TypeError("submit() missing the callable argument")
+        self, fn, *args = args
+        snapshot = capture_contexts()
+        data = _dumps(snapshot) if snapshot else None
+        if data is not None:
+            path = self._store(data)
+            return _ProcessPoolExecutor.submit(self, _run, path, fn, *args, **kwargs)
+        else:
+            return _ProcessPoolExecutor.submit(self, fn, *args, **kwargs)
+
+    submit.__doc__ = _ProcessPoolExecutor.submit.__doc__
+
+    def _store(self, data):
+        """Store the pickled contexts in `data` (once), return its path."""
+        import os
+        from hashlib import sha1
+
+        key = sha1(data).hexdigest()
+        with self._store_lock:
+            if self._store_path is None:
+                from shutil import rmtree
+                from tempfile import mkdtemp
+                from weakref import finalize
+
+                self._store_path = mkdtemp(prefix="xotl-contexts-")
+                self._remove_store = finalize(self, rmtree, self._store_path, True)
+            path = os.path.join(self._store_path, key)
+            if key not in self._stored:
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+                self._stored.add(key)
+        return path
+
+    def shutdown(self, wait=True, **kwargs):
+        super().shutdown(wait, **kwargs)
+        # Calls still pending need the stored contexts.
+        if wait and self._remove_store is not None:
+            self._remove_store()
+
+    shutdown.__doc__ = _ProcessPoolExecutor.shutdown.__doc__
+
+
+# The snapshots loaded in a worker, by the path of their pickled data.
+_snapshots: Dict[str, ContextSnapshot] = {}
+
+
+def _picklable(obj):
+    """Return True if `obj` can be pickled."""
+    from pickle import dumps
+
+    try:
+        dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
+def _dumps(snapshot):
+    """Return `snapshot` pickled, without what can't be pickled.
+
+    Return None if nothing remains.
+
+    """
+    from pickle import dumps
+
+    try:
+        return dumps(snapshot)
+    except Exception:
+        pass
+
+    def data(level):
+        if _picklable(level):
+            return level
+        return {key: value for key, value in level.items() if _picklable((key, value))}
+
+    contexts = tuple(
+        (name, tuple(data(level) for level in levels))
+        for name, levels in snapshot.contexts
+        if _picklable(name)
+    )
+    task_contexts = {
+        name: level
+        for name, level in snapshot.task_contexts.items()
+        if _picklable((name, level))
+    }
+    snapshot = ContextSnapshot(contexts, task_contexts)
+    return dumps(snapshot) if snapshot else None
+
+
+def _run(*args, **kwargs):
+    # Run `fn` in a worker with the contexts pickled in the file `path`.
+    from pickle import load
+
+    path, fn, *args = args
+    snapshot = _snapshots.get(path)
+    if snapshot is None:
+        if len(_snapshots) >= 8:
+            _snapshots.clear()
+        with open(path, "rb") as f:
+            snapshot = _snapshots[path] = load(f)
+    return snapshot.run(fn, *args, **kwargs)
+
+
+def _init_worker(initializer, initargs):
+    # Forked workers inherit the contexts active in the thread that started
+    # them, but only the contexts sent with each call must be active.
+    from xotl.tools import context
+
+    context._data.contexts = {}
+    context._task_contexts.set({})
+    _snapshots.clear()
+    if initializer is not None:
+        initializer(*initargs)
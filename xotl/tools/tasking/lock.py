@@ -41,8 +41,25 @@ The function `context_lock`:func: implement a module property to create a
 class that use an execution context, see `xotl.tools.context`:mod: module for
 more information.
 
-If other lock mechanisms are going to be implementing, for example using
-threading, this is the place.
+A context lock only marks that code runs inside the lock, it doesn't exclude
+other threads or processes.  For mutual exclusion use the locks with real
+backends (with the same API): `thread_lock`:func: (or
+`ThreadLock`:class:), `process_lock`:func: (or `ProcessLock`:class:), and
+`FileLock`:class: to coordinate processes in the same host::
+
+  >>> from xotl.tools.tasking.lock import thread_lock as lock
+  >>> with lock.enter():
+  ...     lock.locked
+  True
+  >>> lock.locked
+  False
+
+Their `locked` property is True only in the thread holding the lock.
+Entering the lock again from the same thread doesn't block.  Like
+`threading.RLock`:class:, the owner is the thread, not the execution context:
+contexts propagated to other threads (see
+`xotl.tools.tasking.executors`:mod:) don't make them owners, and asyncio tasks
+running in the same thread are not excluded from each other.
 
 """
 
@@ -81,4 +98,266 @@ def context_lock(self):
     return ContextLock
 
 
+class _BaseLock:
+    """Base of locks with a real synchronization primitive.
+
+    Subclasses implement `_acquire` and `_release`, and call `__init__`.
+    Ownership and reentrancy are tracked here: `_owner` is the identifier of
+    the thread holding the lock and `_count` how many times it entered.
+
+    """
+
+    __slots__ = ("_owner", "_count")
+
+    def __init__(self):
+        self._owner = None
+        self._count = 0
+
+    def enter(self, timeout=None, **kwargs):
+        """Return a context that holds the lock.
+
+        When entered, wait at most `timeout` seconds (forever if None) to
+        acquire the lock, or raise `TimeoutError`:exc:.  Keyword arguments are
+        data of the inner execution context (see
+        `xotl.tools.context`:mod:).
+
+        """
+        return _LockContext(self, timeout, kwargs)
+
+    @property
+    def locked(self):
+        """True if the lock is held by this thread."""
+        return self._owner == self._ident()
+
+    @staticmethod
+    def _ident():
+        """Return the identifier of the current owner."""
+        from threading import get_ident
+
+        return get_ident()
+
+    def _enter(self, timeout):
+        """Acquire the lock for this thread, unless it holds it already."""
+        ident = self._ident()
+        if self._owner == ident:
+            self._count += 1
+        elif self._acquire(timeout):
+            self._owner, self._count = ident, 1
+        else:
+            raise TimeoutError("Timed out waiting for %r" % self)
+
+    def _exit(self):
+        self._count -= 1
+        if not self._count:
+            self._owner = None
+            self._release()
+
+    def _acquire(self, timeout):
+        raise NotImplementedError
+
+    def _release(self):
+        raise NotImplementedError
+
+
+class _LockContext:
+    __slots__ = ("lock", "timeout", "data", "context")
+
+    def __init__(self, lock, timeout, data):
+        self.lock = lock
+        self.timeout = timeout
+        self.data = data
+        self.context = None
+
+    def __enter__(self):
+        from xotl.tools.context import context
+
+        lock = self.lock
+        lock._enter(self.timeout)
+        try:
+            self.context = context(lock, **self.data)
+            return self.context.__enter__()
+        except BaseException:
+            lock._exit()
+            raise
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            return self.context.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.lock._exit()
+
+
+def _process_ident():
+    # A forked process may have a thread with the same identifier as the
+    # owner in its parent.
+    from os import getpid
+    from threading import get_ident
+
+    return getpid(), get_ident()
+
+
+class ThreadLock(_BaseLock):
+    """A lock excluding other threads, based on `threading.Lock`:class:.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(self):
+        from threading import Lock
+
+        super().__init__()
+        self._lock = Lock()
+
+    def _acquire(self, timeout):
+        return self._lock.acquire(timeout=-1 if timeout is None else timeout)
+
+    def _release(self):
+        self._lock.release()
+
+
+class ProcessLock(ThreadLock):
+    """A lock excluding other processes, based on `multiprocessing.Lock`:func:.
+
+    The lock must be created before starting the processes and passed to them
+    (or inherited when forking).  Use `mp_context` to create the lock with a
+    given `multiprocessing context <multiprocessing.get_context>`:func:.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ()
+
+    _ident = staticmethod(_process_ident)
+
+    def __init__(self, mp_context=None):
+        import multiprocessing
+
+        _BaseLock.__init__(self)
+        self._lock = (mp_context or multiprocessing).Lock()
+
+    def _acquire(self, timeout):
+        return self._lock.acquire(True, timeout)
+
+    def __getstate__(self):
+        return self._lock
+
+    def __setstate__(self, state):
+        _BaseLock.__init__(self)
+        self._lock = state
+
+
+class FileLock(_BaseLock):
+    """A lock excluding other processes in the same host, using an exclusive
+    `fcntl.flock`:func: over the file in `path`.
+
+    Unrelated processes (e.g. pre-forked workers) can use the same lock by
+    using the same path.  The file is created if needed, and it's not removed.
+    Only available where `fcntl`:mod: is (Unix).
+
+    Threads of the same process are also excluded.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ("path", "_lock", "_fd")
+
+    #: Seconds between attempts to acquire the lock when there's a timeout.
+    poll_interval = 0.01
+
+    _ident = staticmethod(_process_ident)
+
+    def __init__(self, path):
+        import fcntl  # noqa: fail early where not available
+        from threading import Lock
+
+        super().__init__()
+        self.path = path
+        self._lock = Lock()
+        self._fd = None
+
+    def __repr__(self):
+        return "<FileLock %r>" % (self.path,)
+
+    def __getstate__(self):
+        return self.path
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def _acquire(self, timeout):
+        import os
+        import fcntl
+        from time import monotonic, sleep
+
+        if timeout is None:
+            deadline = None
+            if not self._lock.acquire():
+                return False
+        else:
+            deadline = monotonic() + timeout
+            if not self._lock.acquire(timeout=timeout):
+                return False
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if deadline is None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    while True:
+                        try:
+                            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                            break
+                        except BlockingIOError:
+                            remaining = deadline - monotonic()
+                            if remaining <= 0:
+                                os.close(fd)
+                                self._lock.release()
+                                return False
+                            sleep(min(self.poll_interval, remaining))
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self._lock.release()
+            raise
+        self._fd = fd
+        return True
+
+    def _release(self):
+        import os
+        import fcntl
+
+        fd, self._fd = self._fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+            self._lock.release()
+
+
+@moduleproperty
+def thread_lock(self):
+    """Allocate a `ThreadLock`:class:.
+
+    .. versionadded:: 2.1.11
+
+    """
+    return ThreadLock()
+
+
+@moduleproperty
+def process_lock(self):
+    """Allocate a `ProcessLock`:class:.
+
+    .. versionadded:: 2.1.11
+
+    """
+    return ProcessLock()
+
+
 del moduleproperty
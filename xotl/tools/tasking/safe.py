@@ -7,10 +7,12 @@
 # This is free software; you can do what the LICENCE file allows you to.
 #
 
-"""Python context with thread-safe queued data.
+"""Python contexts with thread-safe data.
 
 """
 
+from collections import namedtuple
+
 
 # TODO: Optimize this by using standard threading locks
 class SafeData:
@@ -38,3 +40,186 @@ class SafeData:
         self.queue.task_done()
         self.queue.put(data, True, self.timeout)
         return False
+
+
+_SectionStats = namedtuple(
+    "_SectionStats", "count contended wait max_wait hold max_hold"
+)
+
+
+class SectionStats(_SectionStats):
+    """Statistics of the read or write sections of `RWSafeData`:class:.
+
+    `count` is the number of sections entered, `contended` how many of them
+    had to wait.  `wait` and `hold` are the total seconds waited to enter and
+    spent inside sections; `max_wait` and `max_hold` the maximum for one
+    section.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = ()
+
+
+class RWSafeData:
+    """Python context with data shared by readers and exclusive for writers.
+
+    Unlike `SafeData`:class:, several threads can be reading at the same
+    time::
+
+        >>> config = RWSafeData({'debug': False})
+        >>> with config.read() as data:
+        ...     debug = data['debug']
+        >>> with config.write() as data:
+        ...     data['debug'] = True
+
+    Using the object itself as a context is the same as `write`:meth:.
+
+    If `prefer_writers` is True, new readers wait while a writer is waiting;
+    so writers are not starved by a continuous flow of readers.
+
+    If a section can't be entered in `timeout` seconds, `TimeoutError`:exc:
+    is raised.
+
+    Sections are not reentrant: a thread inside a section must not enter
+    another one of the same object.
+
+    Wait and hold times are measured, see `metrics`:meth:.
+
+    .. versionadded:: 2.1.11
+
+    """
+
+    __slots__ = (
+        "data",
+        "timeout",
+        "prefer_writers",
+        "_cond",
+        "_readers",
+        "_writer",
+        "_waiting_writers",
+        "_entered",
+        "_stats",
+    )
+
+    def __init__(self, data, timeout=None, *, prefer_writers=False):
+        from threading import Condition
+
+        self.data = data
+        self.timeout = timeout
+        self.prefer_writers = prefer_writers
+        self._cond = Condition()
+        self._readers = 0  # number of active readers
+        self._writer = False
+        self._waiting_writers = 0
+        self._entered = None  # when the writer using `with self` entered
+        # [count, contended, wait, max_wait, hold, max_hold] for each mode
+        self._stats = {mode: [0, 0, 0.0, 0.0, 0.0, 0.0] for mode in ("read", "write")}
+
+    def read(self):
+        """Return a context to read the data, shared with other readers."""
+        return _Section(self, False)
+
+    def write(self):
+        """Return a context to modify the data, exclusively."""
+        return _Section(self, True)
+
+    def __enter__(self):
+        # Writers are exclusive, so there's a single entry time to keep.
+        self._entered = self._acquire(True)
+        return self.data
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        entered, self._entered = self._entered, None
+        self._release(True, entered)
+        return False
+
+    def metrics(self):
+        """Return a dictionary with the `SectionStats`:class: of the read and
+        write sections."""
+        with self._cond:
+            return {mode: SectionStats(*stats) for mode, stats in self._stats.items()}
+
+    def _acquire(self, write):
+        """Enter a section; return the time it was entered."""
+        from time import perf_counter as clock
+
+        cond = self._cond
+        ready = self._can_write if write else self._can_read
+        with cond:
+            stats = self._stats[self._mode(write)]
+            if ready():
+                waited = 0.0
+            else:
+                start = clock()
+                if write:
+                    self._waiting_writers += 1
+                try:
+                    ok = cond.wait_for(ready, self.timeout)
+                finally:
+                    if write:
+                        self._waiting_writers -= 1
+                if not ok:
+                    if write:
+                        # Readers held by a waiting writer may proceed now.
+                        cond.notify_all()
+                    msg = "Timed out waiting to %s data" % self._mode(write)
+                    raise TimeoutError(msg)
+                waited = clock() - start
+                stats[1] += 1
+                stats[2] += waited
+                stats[3] = max(stats[3], waited)
+            if write:
+                self._writer = True
+            else:
+                self._readers += 1
+            stats[0] += 1
+            return clock()
+
+    def _release(self, write, entered):
+        from time import perf_counter as clock
+
+        cond = self._cond
+        with cond:
+            if write:
+                self._writer = False
+                cond.notify_all()
+            else:
+                self._readers -= 1
+                if not self._readers:
+                    cond.notify_all()
+            if entered is not None:
+                held = clock() - entered
+                stats = self._stats[self._mode(write)]
+                stats[4] += held
+                stats[5] = max(stats[5], held)
+
+    def _can_read(self):
+        return not self._writer and not (self.prefer_writers and self._waiting_writers)
+
+    def _can_write(self):
+        return not self._writer and not self._readers
+
+    @staticmethod
+    def _mode(write):
+        return "write" if write else "read"
+
+
+class _Section:
+    """A read or write section of a `RWSafeData`:class:."""
+
+    __slots__ = ("owner", "write", "entered")
+
+    def __init__(self, owner, write):
+        self.owner = owner
+        self.write = write
+        self.entered = None
+
+    def __enter__(self):
+        self.entered = self.owner._acquire(self.write)
+        return self.owner.data
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.owner._release(self.write, self.entered)
+        return False
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ---------------------------------------------------------------------
+# Copyright (c) Merchise Autrement [~º/~] and Contributors
+# All rights reserved.
+#
+# This is free software; you can do what the LICENCE file allows you to.
+#
+
+"""A bounded producer/consumer work queue.
+
+Producers put items in a `WorkQueue`:class: and a fixed number of worker
+threads call a handler with each of them.  The queue is bounded, so fast
+producers are blocked (or rejected) instead of accumulating work without
+limit::
+
+  >>> with WorkQueue(str.upper, workers=2, maxsize=10) as queue:
+  ...     futures = [queue.put(word) for word in ('spam', 'eggs')]
+  >>> [future.result() for future in futures]
+  ['SPAM', 'EGGS']
+
+.. versionadded:: 2.1.11
+
+"""
+
+from collections import deque
+from queue import Full
+
+
+__all__ = ("WorkQueue", "QueueClosedError", "Full")
+
+
+class QueueClosedError(RuntimeError):
+    """Raised when putting items in a closed `WorkQueue`:class:."""
+
+
+class WorkQueue:
+    """Process items with a `handler` in `workers` threads.
+
+    At most `maxsize` items wait to be processed (if `maxsize` is less than
+    or equal to zero, the queue is unbounded).  When the queue is full,
+    `put`:meth: blocks the producer (waiting at most `timeout` seconds) if
+    `block` is True, otherwise it raises `queue.Full`:class: right away.
+
+    If `retrier` is given (an instance of `~xotl.tools.tasking.retrier`:class:)
+    the handler is called through it, so each item is retried independently.
+
+    If `onerror` is given it's called with the item and the exception when
+    the handler fails (after the retries).  Errors raised by `onerror` are
+    logged and ignored.
+
+    The queue can be used as a context: on exit it's shut down, waiting for
+    every item to be processed.
+
+    """
+
+    def __init__(
+        self,
+        handler,
+        workers=1,
+        maxsize=0,
+        *,
+        block=True,
+        timeout=None,
+        retrier=None,
+        onerror=None,
+        name=None
+    ):
+        from threading import Condition, Lock, Thread
+
+        if workers < 1:
+            raise ValueError("At least one worker is needed, got %r" % workers)
+        self.handler = handler
+        self.block = block
+        self.timeout = timeout
+        self.retrier = retrier
+        self.onerror = onerror
+        self.maxsize = maxsize
+        self._items = deque()
+        lock = Lock()
+        self._not_empty = Condition(lock)
+        self._not_full = Condition(lock)
+        self._closed = False
+        name = name or "WorkQueue-%x" % id(self)
+        self._workers = [
+            Thread(target=self._work, name="%s-%d" % (name, i), daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def closed(self):
+        """True if the queue doesn't accept more items."""
+        return self._closed
+
+    def qsize(self):
+        """Return the number of items waiting to be processed."""
+        return len(self._items)
+
+    def full(self):
+        """Return True if `put`:meth: would block (or reject) now."""
+        return 0 < self.maxsize <= len(self._items)
+
+    def put(self, item, block=None, timeout=None):
+        """Put an item in the queue.
+
+        Return a `concurrent.futures.Future`:class: with the result of the
+        handler.  The item can be cancelled while it's waiting in the queue.
+
+        `block` and `timeout` override the values given to the constructor.
+
+        Raise `QueueClosedError`:class: if the queue is closed (even while
+        waiting).
+
+        """
+        from concurrent.futures import Future
+
+        if block is None:
+            block = self.block
+        if timeout is None:
+            timeout = self.timeout
+        future = Future()
+        with self._not_full:
+            if self.full() and not self._closed:
+                if not block:
+                    raise Full
+                ready = self._not_full.wait_for(
+                    lambda: self._closed or not self.full(), timeout
+                )
+                if not ready:
+                    raise Full
+            if self._closed:
+                raise QueueClosedError("Can't put items in a closed queue")
+            self._items.append((item, future))
+            self._not_empty.notify()
+        return future
+
+    def close(self):
+        """Stop accepting items; the ones in the queue are still processed."""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def join(self, timeout=None):
+        """Wait for the workers to end; the queue must be closed before."""
+        from time import monotonic
+
+        if not self._closed:
+            raise RuntimeError("Can't join an open queue, close it first")
+        deadline = None if timeout is None else monotonic() + timeout
+        for worker in self._workers:
+            worker.join(None if deadline is None else max(0, deadline - monotonic()))
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Close the queue.
+
+        If `cancel_pending` is True, items waiting in the queue are cancelled.
+        If `wait` is True, wait until the workers end.
+
+        """
+        self.close()
+        if cancel_pending:
+            self._cancel_pending()
+        if wait:
+            self.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown(wait=True)
+        return False
+
+    def _cancel_pending(self):
+        with self._not_full:
+            while self._items:
+                _item, future = self._items.popleft()
+                future.cancel()
+            self._not_full.notify_all()
+
+    def _work(self):
+        items = self._items
+        while True:
+            with self._not_empty:
+                self._not_empty.wait_for(lambda: items or self._closed)
+                if not items:
+                    return  # closed and empty
+                item, future = items.popleft()
+                self._not_full.notify()
+            if future.set_running_or_notify_cancel():
+                self._process(item, future)
+
+    def _process(self, item, future):
+        try:
+            if self.retrier is not None:
+                result = self.retrier(self.handler, item)
+            else:
+                result = self.handler(item)
+        except BaseException as error:
+            future.set_exception(error)
+            if self.onerror is not None and isinstance(error, Exception):
+                try:
+                    self.onerror(item, error)
+                except Exception:
+                    # Don't let the worker die, the queue would shrink.
+                    import logging
+
+                    logger = logging.getLogger(__name__)
+                    logger.exception("Error handler failed for item %r", item)
+        else:
+            future.set_result(result)